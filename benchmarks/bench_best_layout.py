@@ -0,0 +1,76 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Benchmark of best_layout, the best of N seeded layout attempts. The attempts
+are made once in this process and once across a pool of processes, and the
+grid area of the best attempt is compared with that of a single layout.
+
+Usage
+
+    python -m benchmarks.bench_best_layout --book Genesis -n 8
+    python -m benchmarks.bench_best_layout --words words.txt -n 16
+'''
+
+import sys
+import time
+from argparse import ArgumentParser
+
+from puzzles.wordsearch import wordsearch
+from puzzles.wordsearch.wordsearch import WordSearch, best_layout
+
+def load_words(args):
+    if args.words:
+        with open(args.words, encoding='utf-8') as f:
+            return [l.strip() for l in f if l.strip()]
+    from puzzles.core.etcbc import Corpus, get_words
+    work = Corpus.GREEK if args.corpus == 'ETCBCG' else Corpus.HEBREW
+    return get_words((args.book,), work=work)
+
+def timed(words, direction, args, processes):
+    wordsearch._layouts.clear()
+    start = time.perf_counter()
+    ws = best_layout(words, None, None, direction, seed=args.seed,
+                     attempts=args.attempts, processes=processes)
+    return ws, time.perf_counter() - start
+
+def main(argv=None):
+    parser = ArgumentParser(description='best of N layout benchmark')
+    parser.add_argument('--corpus', choices=['ETCBCH', 'ETCBCG'],
+                        default='ETCBCH')
+    parser.add_argument('--book', default='Genesis')
+    parser.add_argument('--words', help='file of words, one per line')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('-n', '--attempts', type=int, default=8)
+    parser.add_argument('-p', '--processes', type=int)
+    args = parser.parse_args(argv)
+
+    words = set(load_words(args))
+    direction = WordSearch.LTR if args.corpus == 'ETCBCG' else WordSearch.RTL
+
+    single = WordSearch(words, None, None, direction, seed=args.seed)
+    serial, serial_t = timed(words, direction, args, 1)
+    parallel, parallel_t = timed(words, direction, args, args.processes)
+    start = time.perf_counter()
+    best_layout(words, None, None, direction, seed=args.seed,
+                attempts=args.attempts, processes=args.processes)
+    cached_t = time.perf_counter() - start
+
+    def size(ws):
+        return f'{ws.get_rows()} x {ws.get_cols()} = ' \
+               f'{ws.get_rows() * ws.get_cols()}'
+    print(f'words             {len(words)}')
+    print(f'one attempt       {size(single)}')
+    print(f'best of {args.attempts:<9} {size(parallel)}')
+    print(f'serial            {serial_t:.3f}s')
+    print(f'parallel          {parallel_t:.3f}s '
+          f'({serial_t / parallel_t:.1f}x)')
+    print(f'cached            {cached_t * 1000:.1f}ms')
+    if serial.get_grid('json') != parallel.get_grid('json'):
+        print('serial and parallel layouts differ', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
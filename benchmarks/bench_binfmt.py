@@ -0,0 +1,110 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Benchmark of the binary wordsearch format against the JSON outputs. One
+large wordsearch is written as json, compact and binary, and the size of
+each, the time to write it and the time to load it again are compared. A
+JSON load parses every square into objects, a binary load maps the file and
+decodes only the grapheme table, and the placed words, which only the binary
+form records, when they are asked for.
+
+Usage
+
+    python -m benchmarks.bench_binfmt
+    python -m benchmarks.bench_binfmt --words words.txt --corpus ETCBCG
+    python -m benchmarks.bench_binfmt --book Genesis
+'''
+
+import json
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from random import Random
+
+from puzzles.wordsearch import binfmt
+from puzzles.wordsearch.wordsearch import WordSearch
+
+ALPHABET = 'αβγδεζηθικλμνξοπρστυφχψωάέήίόύώ'
+
+def load_words(args):
+    if args.words:
+        with open(args.words, encoding='utf-8') as f:
+            return [l.strip() for l in f if l.strip()]
+    if args.book:
+        from puzzles.core.etcbc import Corpus, get_words
+        work = Corpus.GREEK if args.corpus == 'ETCBCG' else Corpus.HEBREW
+        return get_words((args.book,), work=work)
+    rng = Random(args.seed)
+    return [''.join(rng.choice(ALPHABET) for _ in range(rng.randint(2, 9)))
+            for _ in range(args.count)]
+
+def timed(f, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = f()
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    return result, best
+
+def main(argv=None):
+    parser = ArgumentParser(description='binary wordsearch format benchmark')
+    parser.add_argument('--corpus', choices=['ETCBCH', 'ETCBCG'],
+                        default='ETCBCG')
+    parser.add_argument('--book')
+    parser.add_argument('--words', help='file of words, one per line')
+    parser.add_argument('--count', type=int, default=1000,
+                        help='number of random words if no others are given')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    direction = WordSearch.LTR if args.corpus == 'ETCBCG' else WordSearch.RTL
+    ws = WordSearch(set(load_words(args)), None, None, direction,
+                    seed=args.seed)
+    print(f'grid {ws.get_rows()} x {ws.get_cols()}, '
+          f'{len(ws.get_word_list())} words')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = []
+        for output_format in ('json', 'compact'):
+            text, write_t = timed(lambda: ws.get_grid(output_format),
+                                  args.repeat)
+            path = os.path.join(tmp, f'puzzle.{output_format}')
+            with open(path, mode='w', encoding='utf-8') as f:
+                f.write(text)
+
+            def load():
+                with open(path, encoding='utf-8') as f:
+                    return json.load(f)
+            _, load_t = timed(load, args.repeat)
+            results.append((output_format, os.path.getsize(path), write_t,
+                            load_t))
+
+        data, write_t = timed(lambda: binfmt.dumps(ws), args.repeat)
+        path = os.path.join(tmp, 'puzzle.wsb')
+        with open(path, mode='wb') as f:
+            f.write(data)
+
+        def load(words=False):
+            puzzle = binfmt.load(path)
+            if words:
+                puzzle.get_word_list()
+            puzzle.close()
+        _, load_t = timed(load, args.repeat)
+        results.append(('binary', os.path.getsize(path), write_t, load_t))
+        _, load_t = timed(lambda: load(True), args.repeat)
+        results.append(('+ words', os.path.getsize(path), write_t, load_t))
+
+    print(f'{"format":<8} {"size":>10} {"write":>9} {"load":>9}')
+    for output_format, size, write_t, load_t in results:
+        print(f'{output_format:<8} {size:>10} {write_t * 1000:>7.1f}ms '
+              f'{load_t * 1000:>7.2f}ms')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
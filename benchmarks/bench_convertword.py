@@ -0,0 +1,103 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Benchmark of the ConvertWord neighbour graph. The graph of a vocabulary,
+random words by default or a whole book, is built from wildcard buckets and,
+for the smaller vocabularies, by comparing every pair of words of the same
+length, and then shortest ladders are found between random pairs of words.
+
+Usage
+
+    python -m benchmarks.bench_convertword
+    python -m benchmarks.bench_convertword --book Genesis --corpus ETCBCH
+    python -m benchmarks.bench_convertword --count 50000
+'''
+
+import sys
+import time
+from argparse import ArgumentParser
+from random import Random
+
+from puzzles.convertword.convertword import NeighbourGraph
+from puzzles.core.graphemes import graphemes
+
+ALPHABET = 'αβγδεζηθικλμνοπρστ'
+
+# The most words for which pairwise comparison is timed
+PAIRWISE_LIMIT = 5000
+
+def load_words(args):
+    if args.book:
+        from puzzles.core.etcbc import Corpus, get_words
+        work = Corpus.GREEK if args.corpus == 'ETCBCG' else Corpus.HEBREW
+        return get_words((args.book,), work=work)
+    rng = Random(args.seed)
+    return [''.join(rng.choice(ALPHABET) for _ in range(rng.randint(3, 6)))
+            for _ in range(args.count)]
+
+def pairwise_edges(words):
+    '''Count the edges by comparing every pair of words of a length.'''
+    by_length = dict()
+    for w in words:
+        g_s = graphemes(w)
+        by_length.setdefault(len(g_s), []).append(g_s)
+    edges = 0
+    for same_length in by_length.values():
+        for i, a in enumerate(same_length):
+            for b in same_length[i + 1:]:
+                if sum(x != y for x, y in zip(a, b)) == 1:
+                    edges += 1
+    return edges
+
+def main(argv=None):
+    parser = ArgumentParser(description='ConvertWord graph benchmark')
+    parser.add_argument('--corpus', choices=['ETCBCH', 'ETCBCG'],
+                        default='ETCBCH')
+    parser.add_argument('--book')
+    parser.add_argument('--count', type=int, default=20000,
+                        help='number of random words if no book is given')
+    parser.add_argument('--pairs', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    words = sorted(set(load_words(args)))
+    start = time.perf_counter()
+    graph = NeighbourGraph(words)
+    build_t = time.perf_counter() - start
+    print(f'{len(graph)} words, {graph.bucket_count()} buckets, '
+          f'{graph.edge_count()} edges')
+    print(f'bucket build      {build_t * 1000:8.1f}ms')
+
+    sample = words[:PAIRWISE_LIMIT]
+    start = time.perf_counter()
+    edges = pairwise_edges(sample)
+    pairwise_t = time.perf_counter() - start
+    sample_graph = NeighbourGraph(sample)
+    assert edges == sample_graph.edge_count()
+    print(f'pairwise build    {pairwise_t * 1000:8.1f}ms '
+          f'(first {len(sample)} words)')
+
+    rng = Random(args.seed)
+    by_length = dict()
+    for w in words:
+        by_length.setdefault(len(graphemes(w)), []).append(w)
+    lengths = [n for n, ws in by_length.items() if len(ws) > 1]
+    found = 0
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(args.pairs):
+        a, b = rng.sample(by_length[rng.choice(lengths)], 2)
+        ladder = graph.shortest_ladder(a, b)
+        if ladder is not None:
+            found += 1
+            steps += len(ladder) - 1
+    search_t = time.perf_counter() - start
+    print(f'shortest ladders  {search_t / args.pairs * 1000:8.2f}ms each, '
+          f'{found} of {args.pairs} found, '
+          f'{steps / found if found else 0:.1f} steps on average')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Benchmark of crossword generation. A chapter sized vocabulary, random words
+by default, is laid out on a 15 x 15 grid from a number of seeds and the time
+taken, the attempts made in the time budget and the words and squares filled
+are reported. The candidate index is also compared with scanning the whole
+vocabulary for the words matching a pattern, which is what every slot of
+every attempt would otherwise cost.
+
+Usage
+
+    python -m benchmarks.bench_crossword
+    python -m benchmarks.bench_crossword --book Genesis --chapter 1 --corpus ETCBCH
+    python -m benchmarks.bench_crossword --words words.txt --budget 0.2
+'''
+
+import sys
+import time
+from argparse import ArgumentParser
+from random import Random
+
+from puzzles.core.graphemes import graphemes
+from puzzles.crossword.crossword import Crossword
+from puzzles.crossword.index import CandidateIndex
+
+ALPHABET = 'αβγδεζηθικλμνξοπρστυφχψω'
+
+def load_words(args):
+    if args.words:
+        with open(args.words, encoding='utf-8') as f:
+            return [l.strip() for l in f if l.strip()]
+    if args.book:
+        from puzzles.core.etcbc import Corpus, get_words
+        work = Corpus.GREEK if args.corpus == 'ETCBCG' else Corpus.HEBREW
+        ref = (args.book,) if args.chapter is None else (args.book,
+                                                         args.chapter)
+        return get_words(ref, work=work)
+    rng = Random(args.seed)
+    return [''.join(rng.choice(ALPHABET) for _ in range(rng.randint(2, 9)))
+            for _ in range(args.count)]
+
+def bench_lookup(words, repeat, rng):
+    '''Time matching random patterns with the index and by a scan.'''
+    word_graphemes = [graphemes(w) for w in words]
+    index = CandidateIndex(word_graphemes)
+    patterns = []
+    for _ in range(1000):
+        g_s = rng.choice(word_graphemes)
+        positions = rng.sample(range(len(g_s)), min(2, len(g_s)))
+        patterns.append((len(g_s), [(k, g_s[k]) for k in positions]))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        indexed = [index.words(length, index.candidates(length, fixed))
+                   for length, fixed in patterns]
+    index_t = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scanned = [[n for n, g_s in enumerate(word_graphemes)
+                    if len(g_s) == length and
+                    all(g_s[k] == g for k, g in fixed)]
+                   for length, fixed in patterns]
+    scan_t = (time.perf_counter() - start) / repeat
+    assert indexed == scanned
+    return len(patterns), index_t, scan_t
+
+def main(argv=None):
+    parser = ArgumentParser(description='crossword generation benchmark')
+    parser.add_argument('--corpus', choices=['ETCBCH', 'ETCBCG'],
+                        default='ETCBCG')
+    parser.add_argument('--book')
+    parser.add_argument('--chapter', type=int)
+    parser.add_argument('--words', help='file of words, one per line')
+    parser.add_argument('--count', type=int, default=400,
+                        help='number of random words if no others are given')
+    parser.add_argument('--size', type=int, default=15)
+    parser.add_argument('--budget', type=float,
+                        default=Crossword.DEFAULT_TIME_BUDGET)
+    parser.add_argument('--seeds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    words = sorted(set(load_words(args)))
+    direction = Crossword.RTL if args.corpus == 'ETCBCH' else Crossword.LTR
+    print(f'{len(words)} words, {args.size} x {args.size} grid, '
+          f'{args.budget}s budget')
+
+    n, index_t, scan_t = bench_lookup(words, args.repeat, Random(args.seed))
+    print(f'{n} pattern lookups: index {index_t * 1000:.2f}ms, '
+          f'scan {scan_t * 1000:.2f}ms ({scan_t / index_t:.0f}x)')
+
+    print(f'{"seed":>6} {"time":>8} {"attempts":>9} {"words":>6} '
+          f'{"filled":>7}')
+    for seed in range(args.seed, args.seed + args.seeds):
+        start = time.perf_counter()
+        cw = Crossword(words, args.size, args.size, direction, seed=seed,
+                       time_budget=args.budget)
+        elapsed = time.perf_counter() - start
+        filled = sum(cw.get(r, c) is not None for r in range(args.size)
+                     for c in range(args.size))
+        print(f'{seed:>6} {elapsed * 1000:>6.0f}ms {cw.get_attempts():>9} '
+              f'{len(cw.get_word_list()):>6} '
+              f'{filled / args.size ** 2:>6.0%}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Micro-benchmark of puzzles.core.graphemes against calling uniseg directly,
+on pointed Hebrew. The words of a book are used if the Text-Fabric data is
+available, otherwise a sample from Genesis 1 repeated.
+
+Usage
+
+    python -m benchmarks.bench_graphemes
+    python -m benchmarks.bench_graphemes --book Exodus --threads 8
+'''
+
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+
+from uniseg.graphemecluster import grapheme_clusters
+
+from puzzles.core import graphemes as segmentation
+
+SAMPLE = ['בְּ', 'רֵאשִׁ֖ית', 'בָּרָ֣א', 'אֱלֹהִ֑ים', 'אֵ֥ת', 'הַ', 'שָּׁמַ֖יִם',
+          'וְ', 'אֵ֥ת', 'הָ', 'אָֽרֶץ', 'וְ', 'הָ', 'אָ֗רֶץ', 'הָיְתָ֥ה',
+          'תֹ֨הוּ֙', 'וָ', 'בֹ֔הוּ', 'וְ', 'חֹ֖שֶׁךְ', 'עַל', 'פְּנֵ֣י', 'תְהֹ֑ום',
+          'וְ', 'ר֣וּחַ', 'אֱלֹהִ֔ים', 'מְרַחֶ֖פֶת', 'עַל', 'פְּנֵ֥י', 'הַ', 'מָּֽיִם']
+
+def load_words(book):
+    try:
+        from puzzles.core.etcbc import get_words
+        return get_words((book,))
+    except Exception as e:
+        print(f'using sample words ({e!r})', file=sys.stderr)
+        return SAMPLE * 1000
+
+def timed(f, words):
+    start = time.perf_counter()
+    for w in words:
+        f(w)
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = ArgumentParser(description='grapheme segmentation benchmark')
+    parser.add_argument('--book', default='Genesis')
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    words = load_words(args.book)
+    distinct = set(words)
+
+    uniseg_t = timed(lambda w: tuple(grapheme_clusters(w)), words)
+    segmentation.cache_clear()
+    cold_t = timed(segmentation.graphemes, words)
+    warm_t = timed(segmentation.graphemes, words)
+
+    # Segment from several threads at once with an empty cache and check
+    # every thread sees the same clusters as uniseg.
+    segmentation.cache_clear()
+    expected = {w: tuple(grapheme_clusters(w)) for w in distinct}
+    def check(chunk):
+        return all(segmentation.graphemes(w) == expected[w] for w in chunk)
+    chunks = [words[i::args.threads] for i in range(args.threads)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as pool:
+        consistent = all(pool.map(check, chunks))
+    threaded_t = time.perf_counter() - start
+
+    n = len(words)
+    print(f'words             {n} ({len(distinct)} distinct)')
+    print(f'uniseg            {uniseg_t / n * 1e6:.2f}us/word')
+    print(f'graphemes cold    {cold_t / n * 1e6:.2f}us/word '
+          f'({uniseg_t / cold_t:.0f}x)')
+    print(f'graphemes warm    {warm_t / n * 1e6:.2f}us/word '
+          f'({uniseg_t / warm_t:.0f}x)')
+    print(f'{args.threads} threads         {threaded_t / n * 1e6:.2f}us/word, '
+          f'{"consistent" if consistent else "INCONSISTENT"} with uniseg')
+    return 0 if consistent else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Benchmark of editing a wordsearch in place. A few words are added to and
+removed from a large layout with add_words() and remove_words(), and the
+time is compared with building the edited wordsearch again from scratch.
+
+Usage
+
+    python -m benchmarks.bench_incremental --book Genesis -k 5
+    python -m benchmarks.bench_incremental --words words.txt -k 20
+'''
+
+import sys
+import time
+from argparse import ArgumentParser
+
+from puzzles.wordsearch.wordsearch import WordSearch
+
+def load_words(args):
+    if args.words:
+        with open(args.words, encoding='utf-8') as f:
+            return [l.strip() for l in f if l.strip()]
+    from puzzles.core.etcbc import Corpus, get_words
+    work = Corpus.GREEK if args.corpus == 'ETCBCG' else Corpus.HEBREW
+    return get_words((args.book,), work=work)
+
+def main(argv=None):
+    parser = ArgumentParser(description='incremental wordsearch edit '
+                                        'benchmark')
+    parser.add_argument('--corpus', choices=['ETCBCH', 'ETCBCG'],
+                        default='ETCBCH')
+    parser.add_argument('--book', default='Genesis')
+    parser.add_argument('--words', help='file of words, one per line')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('-k', '--edit', type=int, default=5,
+                        help='number of words added and removed')
+    args = parser.parse_args(argv)
+
+    words = sorted(set(load_words(args)))
+    direction = WordSearch.LTR if args.corpus == 'ETCBCG' else WordSearch.RTL
+    # edit with words from across the length range, not just the shortest
+    extra = words[::max(1, len(words) // args.edit)][:args.edit]
+    base = [w for w in words if w not in set(extra)]
+
+    start = time.perf_counter()
+    ws = WordSearch(base, None, None, direction, seed=args.seed)
+    build_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ws.add_words(extra)
+    add_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ws.remove_words(extra)
+    remove_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    WordSearch(base + extra, None, None, direction, seed=args.seed)
+    rebuild_t = time.perf_counter() - start
+
+    print(f'words             {len(base)} + {len(extra)}')
+    print(f'grid              {ws.get_rows()} x {ws.get_cols()}')
+    print(f'build             {build_t * 1000:.1f}ms')
+    print(f'add_words         {add_t * 1000:.1f}ms '
+          f'({rebuild_t / add_t:.0f}x faster than a rebuild)')
+    print(f'remove_words      {remove_t * 1000:.1f}ms '
+          f'({rebuild_t / remove_t:.0f}x faster than a rebuild)')
+    print(f'rebuild           {rebuild_t * 1000:.1f}ms')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
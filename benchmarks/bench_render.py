@@ -0,0 +1,103 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Benchmark of the row streaming wordsearch renderer against the original
+get_grid, which built HTML by concatenating a string per square and JSON from
+a list of one dictionary per square. The original is reproduced below. Time,
+peak memory allocated while rendering and output size are reported for each
+format.
+
+Usage
+
+    python -m benchmarks.bench_render --book Genesis
+    python -m benchmarks.bench_render --words words.txt
+'''
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+from puzzles.wordsearch.render import write_grid
+from puzzles.wordsearch.wordsearch import WordSearch
+
+def legacy_html(ws):
+    rv = '<html><body><div id="main"><div id="wordsearch"><table border="1">'
+    for i in range(ws._top, ws._bottom+1):
+        rv += '<tr>'
+        for j in range(ws._left, ws._right+1):
+            g = ws._grid.get(i, j)
+            if g is not None:
+                rv += f'<td align="center">{g}</td>'
+            else:
+                rv += '<td>.</td>'
+        rv += '</tr>'
+    rv += '</table></div>'
+    for w in sorted(ws._words):
+        rv += f'<li>{w}</li>'
+    return rv + '</div></body></html>'
+
+def legacy_json(ws):
+    rv = []
+    for i in range(ws._top, ws._bottom+1):
+        for j in range(ws._left, ws._right+1):
+            g = ws._grid.get(i, j)
+            if g is not None:
+                rv.append({'loc': [i, j], 'grf': g})
+    return json.dumps(rv, ensure_ascii=False)
+
+def measure(f):
+    '''Return the time, peak traced memory and result of f().'''
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = f()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def streamed(ws, output_format):
+    with open(os.devnull, mode='w', encoding='utf-8') as f:
+        write_grid(ws, f, output_format)
+
+def load_words(args):
+    if args.words:
+        with open(args.words, encoding='utf-8') as f:
+            return [l.strip() for l in f if l.strip()]
+    from puzzles.core.etcbc import Corpus, get_words
+    work = Corpus.GREEK if args.corpus == 'ETCBCG' else Corpus.HEBREW
+    return get_words((args.book,), work=work)
+
+def main(argv=None):
+    parser = ArgumentParser(description='wordsearch renderer benchmark')
+    parser.add_argument('--corpus', choices=['ETCBCH', 'ETCBCG'],
+                        default='ETCBCH')
+    parser.add_argument('--book', default='Genesis')
+    parser.add_argument('--words', help='file of words, one per line')
+    args = parser.parse_args(argv)
+
+    direction = WordSearch.LTR if args.corpus == 'ETCBCG' else WordSearch.RTL
+    ws = WordSearch(set(load_words(args)), None, None, direction, seed=1)
+    print(f'grid              {ws.get_rows()} x {ws.get_cols()}')
+
+    sizes = dict()
+    for name, legacy in (('html', legacy_html), ('json', legacy_json),
+                         ('compact', None)):
+        sizes[name] = len(ws.get_grid(name).encode('utf-8'))
+        t_new, m_new, _ = measure(lambda: streamed(ws, name))
+        line = (f'{name:<17} {t_new:.3f}s {m_new / 1e6:.2f}MB peak streamed, '
+                f'{sizes[name] / 1e6:.2f}MB output')
+        if legacy is not None:
+            t_old, m_old, _ = measure(lambda: legacy(ws))
+            line += f' (original {t_old:.3f}s {m_old / 1e6:.2f}MB peak)'
+        print(line)
+    print(f'compact is {sizes["json"] / sizes["compact"]:.1f}x smaller '
+          'than json')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
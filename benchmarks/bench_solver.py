@@ -0,0 +1,105 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Benchmark of the wordsearch solver. Square grids of random graphemes are
+solved for a list of words taken from the grid lines, with the automaton of
+puzzles.wordsearch.solver and with a naive search which tries every word at
+every square in every direction. The naive search is timed on a sample of
+the words and scaled up, as running it in full takes minutes on the larger
+grids.
+
+Usage
+
+    python -m benchmarks.bench_solver
+    python -m benchmarks.bench_solver --sizes 100 200 400 -w 2000
+'''
+
+import sys
+import time
+from argparse import ArgumentParser
+from random import Random
+
+from puzzles.wordsearch.solver import DIRECTIONS, Solver
+
+ALPHABET = 'αβγδεζηθικλμνξοπρστυφχψωάέήίόύώ'
+
+def make_grid(size, rng):
+    return [[rng.choice(ALPHABET) for _ in range(size)] for _ in range(size)]
+
+def make_words(grid, count, rng):
+    '''Take words of 3 to 9 graphemes from random places in the grid.'''
+    size = len(grid)
+    steps = list(DIRECTIONS.values())
+    words = set()
+    while len(words) < count:
+        n = rng.randint(3, 9)
+        d_row, d_col = rng.choice(steps)
+        r, c = rng.randrange(size), rng.randrange(size)
+        if not (0 <= r + d_row * (n - 1) < size and
+                0 <= c + d_col * (n - 1) < size):
+            continue
+        words.add(''.join(grid[r + d_row * k][c + d_col * k]
+                          for k in range(n)))
+    return sorted(words)
+
+def naive(grid, words):
+    size = len(grid)
+    found = dict()
+    for w in words:
+        for r in range(size):
+            for c in range(size):
+                for name, (d_row, d_col) in DIRECTIONS.items():
+                    k = 0
+                    rr, cc = r, c
+                    while (k < len(w) and 0 <= rr < size and 0 <= cc < size
+                           and grid[rr][cc] == w[k]):
+                        k += 1
+                        rr += d_row
+                        cc += d_col
+                    if k == len(w):
+                        found.setdefault(w, []).append(((r, c), name))
+    return found
+
+def main(argv=None):
+    parser = ArgumentParser(description='wordsearch solver benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 200, 400])
+    parser.add_argument('-w', '--words', type=int, default=1000)
+    parser.add_argument('--sample', type=int, default=20,
+                        help='words to time the naive search on')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = Random(args.seed)
+    print(f'{"grid":>9} {"words":>6} {"build":>9} {"solve":>9} '
+          f'{"naive (est.)":>13} {"speedup":>8}')
+    for size in args.sizes:
+        grid = make_grid(size, rng)
+        words = make_words(grid, args.words, rng)
+
+        start = time.perf_counter()
+        solver = Solver(words)
+        build_t = time.perf_counter() - start
+        start = time.perf_counter()
+        found = solver.find_rows(grid)
+        solve_t = time.perf_counter() - start
+
+        sample = words[:args.sample]
+        start = time.perf_counter()
+        expected = naive(grid, sample)
+        naive_t = (time.perf_counter() - start) * len(words) / len(sample)
+        for w in sample:
+            if sorted(found.get(w, [])) != sorted(expected.get(w, [])):
+                raise Exception(f'solver and naive search differ on {w}')
+        if len(found) != len(words):
+            raise Exception('solver missed words')
+
+        print(f'{size:>4}x{size:<4} {len(words):>6} {build_t * 1000:>7.1f}ms '
+              f'{solve_t * 1000:>7.1f}ms {naive_t:>12.1f}s '
+              f'{naive_t / solve_t:>7.0f}x')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
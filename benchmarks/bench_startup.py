@@ -0,0 +1,86 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Startup benchmark of the wordsearch command line. Each measurement runs
+python -X importtime in a new process, importing the wordsearch module or
+running the command with --help, and reads the total import time of the run
+from its report, less that of an interpreter which imports nothing, so what
+the interpreter imports at startup does not count. The best of a number of
+runs is compared with a threshold and the modules which the command must not
+import before it needs a corpus are checked for.
+
+The exit status is 1 if any measurement is over the threshold or any of
+those modules is imported, so the benchmark can be run as a regression
+check.
+
+Usage
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --threshold 80 --repeat 10
+'''
+
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+# What is measured, each a list of arguments to python -X importtime
+COMMANDS = {'import': ['-c', 'import puzzles.wordsearch.wordsearch'],
+            '--help': ['-m', 'puzzles.wordsearch.wordsearch', '--help'],
+            'generate --help': ['-m', 'puzzles.wordsearch.wordsearch',
+                                'generate', '--help']}
+
+# Modules only the paths which use a corpus or a process pool may import
+HEAVY = ('tf', 'bibleutils', 'uniseg', 'multiprocessing',
+         'concurrent.futures', 'puzzles.core.etcbc')
+
+def importtime(args):
+    '''Run python -X importtime with args and return the total import time
+    in seconds and the names of the modules imported.
+    '''
+    err = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                         check=True, capture_output=True, text=True).stderr
+    total = 0
+    modules = set()
+    for line in err.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # only top level imports count towards the total, the rest are in
+        # their cumulative times
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+        modules.add(name.strip())
+    return total / 1e6, modules
+
+def main(argv=None):
+    parser = ArgumentParser(description='wordsearch startup benchmark')
+    parser.add_argument('--threshold', type=float, default=50.0,
+                        help='most milliseconds of imports allowed')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    def best_of(command):
+        best = None
+        for _ in range(args.repeat):
+            t, modules = importtime(command)
+            best = t if best is None else min(best, t)
+        return best, modules
+
+    baseline, _ = best_of(['-c', 'pass'])
+    failed = False
+    print(f'interpreter startup imports {baseline * 1000:.1f}ms')
+    print(f'{"command":<16} {"imports":>9} {"modules":>8}  heavy')
+    for name, command in COMMANDS.items():
+        best, modules = best_of(command)
+        best -= baseline
+        heavy = [m for m in HEAVY if m in modules]
+        over = best * 1000 > args.threshold
+        failed = failed or over or bool(heavy)
+        print(f'{name:<16} {best * 1000:>7.1f}ms {len(modules):>8}  '
+              f'{" ".join(heavy) or "-"}{"  OVER THRESHOLD" if over else ""}')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Cold-start benchmark of get_words. Each measurement runs in a new process
+and times fetching the words of one verse, first through the word cache and
+then by loading Text-Fabric directly as get_words used to.
+
+Usage
+
+    python -m benchmarks.bench_word_cache
+    python -m benchmarks.bench_word_cache --corpus ETCBCG --ref Matthew 1 1
+'''
+
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+CACHED = '''
+import sys, time
+start = time.perf_counter()
+from puzzles.core.etcbc import Corpus, get_words
+words = get_words({ref!r}, work=Corpus.{corpus})
+print(time.perf_counter() - start, len(words), 'tf' in sys.modules)
+'''
+
+DIRECT = '''
+import sys, time
+start = time.perf_counter()
+from puzzles.core.etcbc import Corpus, _corpus_config, _get_api
+_, word_feature, lang = _corpus_config(Corpus.{corpus})
+api = _get_api(Corpus.{corpus})
+words = [api.Fs(word_feature).v(s)
+         for s in api.L.d(api.T.nodeFromSection({ref!r}, lang=lang), 'word')]
+print(time.perf_counter() - start, len(words), 'tf' in sys.modules)
+'''
+
+def run(template, corpus, ref):
+    out = subprocess.run([sys.executable, '-c',
+                          template.format(corpus=corpus, ref=ref)],
+                         check=True, capture_output=True, text=True).stdout
+    elapsed, n_words, tf_loaded = out.split()
+    return float(elapsed), int(n_words), tf_loaded == 'True'
+
+def main(argv=None):
+    parser = ArgumentParser(description='get_words cold-start benchmark')
+    parser.add_argument('--corpus', choices=['HEBREW', 'GREEK'],
+                        default='HEBREW')
+    parser.add_argument('--ref', nargs=3, default=['Genesis', '1', '1'])
+    args = parser.parse_args(argv)
+    ref = (args.ref[0], int(args.ref[1]), int(args.ref[2]))
+
+    # The first run builds the cache if need be
+    run(CACHED, args.corpus, ref)
+    cached = run(CACHED, args.corpus, ref)
+    direct = run(DIRECT, args.corpus, ref)
+
+    print(f'words             {cached[1]}')
+    print(f'cached            {cached[0] * 1000:.1f}ms (tf imported: {cached[2]})')
+    print(f'Text-Fabric       {direct[0] * 1000:.1f}ms')
+    print(f'speedup           {direct[0] / cached[0]:.0f}x')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
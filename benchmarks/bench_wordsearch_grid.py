@@ -0,0 +1,119 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Benchmark of wordsearch layout generation on the array-backed Grid against
+the original dict-of-tuples layout loop, which is reproduced below as the
+reference. Both are run from the same random seed and the resulting layouts
+are compared square by square.
+
+Usage
+
+    python -m benchmarks.bench_wordsearch_grid --book Genesis
+    python -m benchmarks.bench_wordsearch_grid --corpus ETCBCG --book Matthew
+    python -m benchmarks.bench_wordsearch_grid --words words.txt
+
+The --words form takes one word per line and needs no Text-Fabric data.
+'''
+
+import sys
+import time
+from argparse import ArgumentParser
+
+from puzzles.core.graphemes import graphemes
+from puzzles.wordsearch.wordsearch import WordSearch
+
+class LegacyWordSearch(WordSearch):
+    '''The original layout loop on a dict keyed by (row, col) tuples.'''
+
+    def _generate(self, lang_direction):
+        self._dict_grid = dict()
+        graphemes = self._get_sorted_words_list()
+        randrange = self._random.randrange
+        steps = self._STEPS
+        for word, g_s in graphemes:
+            if word == '':
+                continue
+            for starting_square in self._starting_squares(lang_direction):
+                dirs_left = list(self._dirs)
+                cur_square = starting_square
+                placed = False
+                while dirs_left:
+                    cur_dir = dirs_left.pop(randrange(len(dirs_left)))
+                    d_row, d_col = steps[cur_dir]
+                    g_cntr = 0
+                    for g in g_s:
+                        g_cntr += 1
+                        existing = self._dict_grid.get(cur_square)
+                        if existing is not None and existing != g:
+                            break
+                        if g_cntr == len(g_s):
+                            placed = True
+                            break
+                        cur_square = (cur_square[0] + d_row,
+                                      cur_square[1] + d_col)
+                    if placed:
+                        break
+                if placed:
+                    sq = cur_square
+                    for g in reversed(g_s):
+                        self._dict_grid[sq] = g
+                        sq = (sq[0] - d_row, sq[1] - d_col)
+                    start = (sq[0] + d_row, sq[1] + d_col)
+                    self._place_word_on_grid(self._grid.intern_all(g_s),
+                                             start, cur_dir)
+                    self._placed_words.append(word)
+                    break
+
+def load_words(args):
+    if args.words:
+        with open(args.words, encoding='utf-8') as f:
+            return [l.strip() for l in f if l.strip()]
+    from puzzles.core.etcbc import Corpus, get_words
+    work = Corpus.GREEK if args.corpus == 'ETCBCG' else Corpus.HEBREW
+    return get_words((args.book,), work=work)
+
+def timed(cls, words, direction, seed):
+    start = time.perf_counter()
+    ws = cls(words, None, None, direction, seed=seed)
+    return ws, time.perf_counter() - start
+
+def layout(ws):
+    return [[ws._grid.get_id(i, j) and ws._grid.get(i, j)
+             for j in range(ws._left, ws._right + 1)]
+            for i in range(ws._top, ws._bottom + 1)]
+
+def main(argv=None):
+    parser = ArgumentParser(description='wordsearch grid benchmark')
+    parser.add_argument('--corpus', choices=['ETCBCH', 'ETCBCG'],
+                        default='ETCBCH')
+    parser.add_argument('--book', default='Genesis')
+    parser.add_argument('--words', help='file of words, one per line')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    # Deduplicate preserving order so that both runs see the same word order
+    words = list(dict.fromkeys(load_words(args)))
+    direction = WordSearch.LTR if args.corpus == 'ETCBCG' else WordSearch.RTL
+
+    # Segment once up front so that only the layout itself is timed
+    for w in words:
+        graphemes(w)
+
+    legacy, legacy_t = timed(LegacyWordSearch, words, direction, args.seed)
+    dense, dense_t = timed(WordSearch, words, direction, args.seed)
+
+    print(f'words             {len(words)}')
+    print(f'grid              {dense.get_rows()} x {dense.get_cols()}')
+    print(f'dict grid         {legacy_t:.3f}s')
+    print(f'array grid        {dense_t:.3f}s')
+    print(f'speedup           {legacy_t / dense_t:.2f}x')
+    if layout(legacy) != layout(dense):
+        print('layouts differ', file=sys.stderr)
+        return 1
+    print('layouts identical')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
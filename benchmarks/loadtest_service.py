@@ -0,0 +1,148 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Load test of the wordsearch HTTP service. A number of concurrent clients,
+each on its own keep-alive connection, send wordsearch requests until the
+total is reached, and the latency percentiles and throughput are reported.
+
+Usage
+
+    python -m benchmarks.loadtest_service --spawn
+    python -m benchmarks.loadtest_service --port 8080 -c 32 -n 1000
+    python -m benchmarks.loadtest_service --spawn --text ETCBCG \
+        --verses "Mat 1:1-6" --verses "Luke 1:1-4" --rows 15 --cols 15
+
+--spawn starts a service for the run on a free port and stops it after,
+otherwise one must already be listening on --host and --port.
+'''
+
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from urllib.parse import urlencode
+
+def percentile(ordered, p):
+    '''Return the p-th percentile of a sorted list by the nearest rank.'''
+    if not ordered:
+        return float('nan')
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+async def request(reader, writer, host, target):
+    '''Send one GET on an open connection and return the response status.'''
+    writer.write(f'GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n'
+                 .encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def client(host, port, targets, counter, total, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            n = counter[0]
+            counter[0] += 1
+            start = time.perf_counter()
+            status = await request(reader, writer, host,
+                                   targets[n % len(targets)])
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+async def run(host, port, targets, concurrency, total):
+    latencies = []
+    statuses = Counter()
+    counter = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*[client(host, port, targets, counter, total,
+                                  latencies, statuses)
+                           for _ in range(concurrency)])
+    return time.perf_counter() - start, sorted(latencies), statuses
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_for_service(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise Exception(f'service did not start on {host}:{port}')
+
+def main(argv=None):
+    parser = ArgumentParser(description='wordsearch service load test')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--spawn', action='store_true',
+                        help='start a service for the duration of the test')
+    parser.add_argument('-p', '--processes', type=int,
+                        help='worker processes for a spawned service')
+    parser.add_argument('-c', '--concurrency', type=int, default=16)
+    parser.add_argument('-n', '--requests', type=int, default=500)
+    parser.add_argument('--text', choices=['ETCBCH', 'ETCBCG'],
+                        default='ETCBCH')
+    parser.add_argument('--verses', action='append',
+                        help='passage to request, may be repeated')
+    parser.add_argument('--rows', type=int)
+    parser.add_argument('--cols', type=int)
+    args = parser.parse_args(argv)
+
+    targets = []
+    for verses in args.verses or ['Genesis 1:1-5']:
+        params = {'text': args.text, 'verses': verses}
+        if args.rows is not None:
+            params.update(rows=args.rows, cols=args.cols)
+        targets.append('/wordsearch?' + urlencode(params))
+
+    service = None
+    if args.spawn:
+        args.port = free_port()
+        command = [sys.executable, '-m', 'puzzles.wordsearch.wordsearch',
+                   'serve', '--host', args.host, '--port', str(args.port)]
+        if args.processes:
+            command += ['-p', str(args.processes)]
+        service = subprocess.Popen(command)
+    try:
+        wait_for_service(args.host, args.port, 300)
+        # one request to make sure every worker is up before timing
+        asyncio.run(run(args.host, args.port, targets, 1, 1))
+        elapsed, latencies, statuses = asyncio.run(
+            run(args.host, args.port, targets, args.concurrency,
+                args.requests))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+    print(f'requests          {len(latencies)} '
+          f'({", ".join(f"{s}: {n}" for s, n in sorted(statuses.items()))})')
+    print(f'concurrency       {args.concurrency}')
+    print(f'throughput        {len(latencies) / elapsed:.1f} requests/sec')
+    for p in (50, 90, 99):
+        print(f'p{p:<16} {percentile(latencies, p) * 1000:.1f}ms')
+    print(f'max               {latencies[-1] * 1000:.1f}ms')
+    return 0 if set(statuses) == {200} else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,292 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Alphabets puzzles. A grid of letters of an alphabet is scrambled and the
+player puts them in alphabetical order.
+
+An Alphabet has the canonical order of its letters, its text direction and a
+collation table, worked out once when the alphabet is defined, of every
+letter and form of a letter it knows to an integer sort key,
+
+    key = rank << 8 | variant
+
+where rank is the place of the base letter in the alphabet and variant
+tells apart the forms of a letter, the base letter being 0 and the final
+forms 1. The Hebrew table has the final forms and the letters with dagesh
+or a shin or sin dot of the presentation forms, the Greek table final sigma,
+the capitals and every letter with accents, breathings or iota subscript.
+Graphemes not in the table, a letter with its vowel points for example, are
+keyed by their bare letter and added to the table when first seen.
+
+A board keeps its letters as an array of keys, so the solution is a counting
+sort by rank and checking an answer is one pass comparing neighbouring
+ranks. Letters are graphemes as for the other puzzles, so a board may be
+made from the letters of any text.
+
+Output
+
+    json - an object with the direction, the scrambled graphemes in rows of
+           the grid and the solution
+    html - a page with the grid of scrambled letters
+'''
+
+import json
+import unicodedata
+from array import array
+from collections import Counter
+from random import Random, getrandbits
+
+from puzzles.core.graphemes import graphemes
+from puzzles.core.normalize import consonantal
+
+LTR = 1
+RTL = 2
+
+# The bits of a key below the rank
+_VARIANT_BITS = 8
+
+# The default of Alphabet.key() for which an exception is raised
+_RAISE = object()
+
+class Alphabet():
+    '''
+    The letters of an alphabet in order with their collation table.
+
+    Parameters
+
+    name - the name of the alphabet
+    letters - the base letters, lower case where the alphabet has case, in
+              alphabetical order
+    direction - LTR or RTL
+    finals - a dictionary of each final form to its base letter
+    blocks - ranges of the codepoints from which the other forms of the
+             letters are taken for the table
+    '''
+
+    def __init__(self, name, letters, direction, finals=None, blocks=()):
+        self.name = name
+        self.letters = tuple(letters)
+        self.direction = direction
+        self._ranks = {g: r for r, g in enumerate(self.letters)}
+        self._variants = [1] * len(self.letters)
+        self._table = {g: r << _VARIANT_BITS for g, r in self._ranks.items()}
+        for final, base in (finals or {}).items():
+            self._add(final, self._ranks[base])
+        for block in blocks:
+            for c in map(chr, block):
+                if unicodedata.category(c)[0] != 'L':
+                    continue
+                # as the letter is written in a text, the Hebrew presentation
+                # forms being decomposed
+                g = unicodedata.normalize('NFC', c)
+                if g not in self._table:
+                    rank = self._base_rank(g)
+                    if rank is not None:
+                        self._add(g, rank)
+        self._forms = tuple(sorted(self._table, key=self._table.get))
+
+    def _add(self, g, rank):
+        self._table[g] = rank << _VARIANT_BITS | self._variants[rank]
+        self._variants[rank] = min(self._variants[rank] + 1,
+                                   (1 << _VARIANT_BITS) - 1)
+        return self._table[g]
+
+    def _base_rank(self, g):
+        base = consonantal(g).lower()
+        rank = self._ranks.get(base)
+        if rank is None:
+            base = self._table.get(base)
+            if base is not None:
+                rank = base >> _VARIANT_BITS
+        return rank
+
+    def __len__(self):
+        return len(self.letters)
+
+    def __contains__(self, g):
+        return self.key(g, None) is not None
+
+    def forms(self):
+        '''Return every grapheme of the precomputed collation table in key
+        order.
+        '''
+        return list(self._forms)
+
+    def key(self, g, default=_RAISE):
+        '''
+        Return the sort key of a grapheme.
+
+        Parameters
+
+        g - the grapheme
+        default - the value for a grapheme which is not a letter of the
+                  alphabet. If not given an exception is raised.
+        '''
+        key = self._table.get(g)
+        if key is None:
+            rank = self._base_rank(g)
+            if rank is not None:
+                key = self._add(g, rank)
+            elif default is _RAISE:
+                raise Exception(f'{g} is not a letter of {self.name}')
+            else:
+                return default
+        return key
+
+    def keys(self, letters):
+        '''Return an array of the sort keys of a sequence of graphemes.'''
+        return array('H', (self.key(g) for g in letters))
+
+    def rank(self, g):
+        '''Return the place of a grapheme's letter in the alphabet.'''
+        return self.key(g) >> _VARIANT_BITS
+
+    def sort(self, letters):
+        '''Return a list of graphemes in alphabetical order, forms of the
+        same letter keeping their order.
+        '''
+        buckets = [[] for _ in self.letters]
+        for g, k in zip(letters, self.keys(letters)):
+            buckets[k >> _VARIANT_BITS].append(g)
+        return [g for bucket in buckets for g in bucket]
+
+    def is_sorted(self, letters):
+        '''True if a sequence of graphemes is in alphabetical order.'''
+        return _in_order(self.keys(letters))
+
+def _in_order(keys):
+    ranks = [k >> _VARIANT_BITS for k in keys]
+    return all(a <= b for a, b in zip(ranks, ranks[1:]))
+
+HEBREW = Alphabet('hebrew', 'אבגדהוזחטיכלמנסעפצקרשת', RTL,
+                  finals={'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'},
+                  blocks=(range(0x05D0, 0x05EB), range(0xFB1D, 0xFB50)))
+
+GREEK = Alphabet('greek', 'αβγδεζηθικλμνξοπρστυφχψω', LTR,
+                 finals={'ς': 'σ'},
+                 blocks=(range(0x0370, 0x0400), range(0x1F00, 0x2000)))
+
+ALPHABETS = {HEBREW.name: HEBREW, GREEK.name: GREEK}
+
+def get_alphabet(name):
+    '''Return the Alphabet of a name, hebrew or greek.'''
+    alphabet = ALPHABETS.get(name)
+    if alphabet is None:
+        raise Exception(f'unknown alphabet {name}')
+    return alphabet
+
+class Board():
+    '''
+    A scrambled grid of letters to put in alphabetical order.
+
+    Parameters
+
+    alphabet - the Alphabet of the letters
+    letters - the letters, a sequence of graphemes or a string whose
+              graphemes are used. Anything which is not a letter of the
+              alphabet is left out.
+    cols - the number of letters in each row of the grid, all of them in one
+           row if not given
+    seed - the seed for the shuffle, chosen at random if not given and
+           available from get_seed()
+    '''
+
+    def __init__(self, alphabet, letters, cols=None, seed=None):
+        if isinstance(letters, str):
+            letters = graphemes(letters)
+        self._alphabet = alphabet
+        if seed is None:
+            seed = getrandbits(64)
+        self._seed = seed
+        self._letters = [g for g in letters
+                         if alphabet.key(g, None) is not None]
+        Random(seed).shuffle(self._letters)
+        self._keys = alphabet.keys(self._letters)
+        self._cols = cols or max(len(self._letters), 1)
+
+    def get_letters(self):
+        '''Return the scrambled letters in grid order.'''
+        return list(self._letters)
+
+    def get_keys(self):
+        '''Return the array of the sort keys of the scrambled letters.'''
+        return self._keys
+
+    def get_solution(self):
+        '''Return the letters in alphabetical order.'''
+        return self._alphabet.sort(self._letters)
+
+    def check(self, answer):
+        '''True if an answer, a sequence of graphemes, is the letters of the
+        board in alphabetical order.
+        '''
+        answer = list(answer)
+        if len(answer) != len(self._letters) or \
+                Counter(answer) != Counter(self._letters):
+            return False
+        return _in_order(self._alphabet.keys(answer))
+
+    def get_rows(self):
+        '''Return the scrambled letters as the rows of the grid.'''
+        return [self._letters[i:i + self._cols]
+                for i in range(0, len(self._letters), self._cols)]
+
+    def get_seed(self):
+        return self._seed
+
+    def get_grid(self, output_format='json'):
+        '''Get a string representation of the board, json or html as
+        described above.
+        '''
+        if output_format == 'json':
+            return json.dumps({'alphabet': self._alphabet.name,
+                               'dir': 'rtl' if self._alphabet.direction == RTL
+                               else 'ltr',
+                               'rows': self.get_rows(),
+                               'solution': self.get_solution()},
+                              ensure_ascii=False)
+        elif output_format == 'html':
+            direction = 'rtl' if self._alphabet.direction == RTL else 'ltr'
+            rows = ''.join('<tr>' + ''.join(f'<td>{g}</td>' for g in row) +
+                           '</tr>' for row in self.get_rows())
+            return ('<html>\n <head>\n  <meta charset="UTF-8">\n </head>\n'
+                    f'<body>\n<h3>Alphabets</h3>\n<table border="1" '
+                    f'dir="{direction}">{rows}</table>\n</body>\n</html>\n')
+        raise Exception(f'unsupported output format {output_format}')
+
+def make_boards(alphabet, count, size=None, cols=None, forms=False,
+                seed=None):
+    '''
+    Return a list of boards, each of letters drawn at random from an
+    alphabet.
+
+    Parameters
+
+    alphabet - the Alphabet, or its name
+    count - the number of boards
+    size - the number of letters on each board, by default the whole
+           alphabet. Letters are drawn without repeats where there are
+           enough of them.
+    cols - the number of letters in each row of the grids
+    forms - if True the letters are drawn from every form in the collation
+            table, final forms, capitals and accented letters included,
+            otherwise from the base letters only
+    seed - the seed from which the seed of each board is drawn, so the same
+           seed gives the same boards
+    '''
+    if isinstance(alphabet, str):
+        alphabet = get_alphabet(alphabet)
+    pool = alphabet.forms() if forms else list(alphabet.letters)
+    size = size or len(alphabet)
+    rng = Random(getrandbits(64) if seed is None else seed)
+    boards = []
+    for _ in range(count):
+        if size <= len(pool):
+            letters = rng.sample(pool, size)
+        else:
+            letters = rng.choices(pool, k=size)
+        boards.append(Board(alphabet, letters, cols=cols,
+                            seed=rng.getrandbits(64)))
+    return boards
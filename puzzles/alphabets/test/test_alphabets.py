@@ -0,0 +1,60 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import json
+import unittest
+from puzzles.alphabets.alphabets import GREEK, HEBREW, RTL, Board, \
+    make_boards
+
+class Test(unittest.TestCase):
+
+    def testCollation(self):
+        # final forms, capitals and accented letters sort with their letter
+        self.assertEqual(GREEK.rank('ς'), GREEK.rank('σ'))
+        self.assertEqual(GREEK.rank('Ὠ'), GREEK.rank('ω'))
+        self.assertEqual(GREEK.rank('ᾷ'), GREEK.rank('α'))
+        self.assertEqual(HEBREW.rank('ץ'), HEBREW.rank('צ'))
+        self.assertLess(HEBREW.key('צ'), HEBREW.key('ץ'))
+        self.assertIn('שׁ', HEBREW.forms())
+        self.assertIn('ᾷ', GREEK.forms())
+        self.assertEqual(GREEK.sort(['ω', 'ς', 'Ἀ', 'β', 'σ']),
+                         ['Ἀ', 'β', 'ς', 'σ', 'ω'])
+        # pointed letters are keyed by their bare letter
+        self.assertEqual(HEBREW.sort(['תּ', 'בְּ', 'אֱ']), ['אֱ', 'בְּ', 'תּ'])
+        self.assertNotIn('λ', HEBREW)
+        self.assertRaises(Exception, HEBREW.key, 'λ')
+
+    def testBoard(self):
+        board = Board(HEBREW, 'בְּרֵאשִׁית בָּרָא', cols=3, seed=2)
+        self.assertEqual(len(board.get_letters()), 9)
+        solution = board.get_solution()
+        self.assertEqual([HEBREW.letters[HEBREW.rank(g)] for g in solution],
+                         ['א', 'א', 'ב', 'ב', 'י', 'ר', 'ר', 'ש', 'ת'])
+        self.assertEqual(sorted(solution), sorted(board.get_letters()))
+        self.assertTrue(HEBREW.is_sorted(solution))
+        self.assertTrue(board.check(solution))
+        self.assertFalse(board.check(list(reversed(solution))))
+        self.assertFalse(board.check(solution[:-1] + ['ש']))
+        grid = json.loads(board.get_grid('json'))
+        self.assertEqual(grid['dir'], 'rtl')
+        self.assertEqual([len(r) for r in grid['rows']], [3, 3, 3])
+        self.assertEqual(board.get_grid('html').count('<td>'), 9)
+        self.assertEqual(HEBREW.direction, RTL)
+
+    def testMakeBoards(self):
+        boards = make_boards('greek', 20, size=12, seed=3)
+        self.assertEqual([b.get_letters() for b in boards],
+                         [b.get_letters() for b in make_boards(
+                             'greek', 20, size=12, seed=3)])
+        for b in boards:
+            self.assertEqual(len(set(b.get_letters())), 12)
+            self.assertTrue(b.check(b.get_solution()))
+        boards = make_boards(HEBREW, 5, size=40, forms=True, seed=1)
+        self.assertTrue(all(len(b.get_letters()) == 40 for b in boards))
+        self.assertRaises(Exception, make_boards, 'latin', 1)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
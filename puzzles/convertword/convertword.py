@@ -0,0 +1,226 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+ConvertWord, or word ladders. Given a word, change one letter at a time,
+each step giving another word, to reach a final word in the required number
+of steps.
+
+The words of a passage are the nodes of a graph with an edge between two
+words of the same number of graphemes which differ in exactly one of them.
+Rather than comparing every pair of words the graph is built from wildcard
+buckets, one per word and position, holding the words which are the same
+apart from the grapheme at that position,
+
+    λύω -> (0, ('ύ', 'ω')), (1, ('λ', 'ω')), (2, ('λ', 'ύ'))
+
+so the neighbours of a word are the other words in its buckets, found in
+time proportional to the length of the word and the number of neighbours,
+and the graph of a whole book is built in one pass over its words. Two
+different words share at most one bucket, so no neighbour is found twice.
+
+Ladders are found by breadth first search from both ends at once, and every
+ladder of a given number of steps by a depth first search which only steps
+to words close enough to the final word to still reach it in time. The
+graphs of the most recently used passages are kept in a
+providers.SourceCache, built from the words the passage's provider returns.
+'''
+
+from puzzles.core.graphemes import graphemes
+from puzzles.core.normalize import POINTED
+from puzzles.core.providers import SourceCache, corpus_provider
+
+class NeighbourGraph():
+    '''
+    The one letter change graph of a vocabulary.
+
+    Parameters
+
+    words - the words, in any order and with any repeats. Empty words are
+            ignored.
+    '''
+
+    def __init__(self, words):
+        self._words = sorted({w for w in words if w})
+        self._numbers = {w: n for n, w in enumerate(self._words)}
+        self._graphemes = [graphemes(w) for w in self._words]
+
+        # (position, the other graphemes) -> the numbers of the words in the
+        # bucket, and for each word the buckets it is in
+        buckets = dict()
+        self._buckets = []
+        for n, g_s in enumerate(self._graphemes):
+            word_buckets = []
+            for i in range(len(g_s)):
+                bucket = buckets.setdefault((i, g_s[:i] + g_s[i + 1:]), [])
+                bucket.append(n)
+                word_buckets.append(bucket)
+            self._buckets.append(word_buckets)
+        self._bucket_count = len(buckets)
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, word):
+        return word in self._numbers
+
+    def words(self, length=None):
+        '''Return the words, or only those of a number of graphemes, in
+        order.
+        '''
+        if length is None:
+            return list(self._words)
+        return [w for w, g_s in zip(self._words, self._graphemes)
+                if len(g_s) == length]
+
+    def lengths(self):
+        '''Return a dictionary of each number of graphemes to the number of
+        words of that length.
+        '''
+        counts = dict()
+        for g_s in self._graphemes:
+            counts[len(g_s)] = counts.get(len(g_s), 0) + 1
+        return counts
+
+    def edge_count(self):
+        '''Return the number of edges of the graph.'''
+        return sum(len(b) - 1 for word_buckets in self._buckets
+                   for b in word_buckets) // 2
+
+    def bucket_count(self):
+        '''Return the number of wildcard buckets.'''
+        return self._bucket_count
+
+    def _neighbours(self, n):
+        for bucket in self._buckets[n]:
+            for m in bucket:
+                if m != n:
+                    yield m
+
+    def neighbours(self, word):
+        '''Return the words one grapheme different from a word.'''
+        return [self._words[m] for m in self._neighbours(self._number(word))]
+
+    def _number(self, word):
+        n = self._numbers.get(word)
+        if n is None:
+            raise Exception(f'{word} is not in the vocabulary')
+        return n
+
+    def shortest_ladder(self, start, end):
+        '''
+        Return a shortest ladder from start to end, the list of words from
+        start to end inclusive, or None if there is none.
+
+        The search runs from both ends, each step extending the smaller of
+        the two frontiers, so it visits roughly the square root of the words
+        a search from one end would.
+        '''
+        s, e = self._number(start), self._number(end)
+        if s == e:
+            return [start]
+        # word -> the word before it on the way from its end
+        parents = ({s: None}, {e: None})
+        frontiers = ([s], [e])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, other = parents[side], parents[1 - side]
+            frontier = []
+            for n in frontiers[side]:
+                for m in self._neighbours(n):
+                    if m in seen:
+                        continue
+                    seen[m] = n
+                    if m in other:
+                        return self._join(parents, m)
+                    frontier.append(m)
+            frontiers = (frontier, frontiers[1]) if side == 0 \
+                else (frontiers[0], frontier)
+        return None
+
+    def _join(self, parents, meet):
+        '''Return the ladder through the word where the searches met.'''
+        path = []
+        n = meet
+        while n is not None:
+            path.append(n)
+            n = parents[0][n]
+        path.reverse()
+        n = parents[1][meet]
+        while n is not None:
+            path.append(n)
+            n = parents[1][n]
+        return [self._words[n] for n in path]
+
+    def distances(self, word, limit=None):
+        '''Return a dictionary of the words reachable from a word to the
+        number of steps to them, as far as limit steps if given.
+        '''
+        n = self._number(word)
+        dist = self._distances(n, limit)
+        return {self._words[m]: d for m, d in dist.items()}
+
+    def _distances(self, n, limit=None):
+        dist = {n: 0}
+        frontier = [n]
+        d = 0
+        while frontier and (limit is None or d < limit):
+            d += 1
+            next_frontier = []
+            for m in frontier:
+                for k in self._neighbours(m):
+                    if k not in dist:
+                        dist[k] = d
+                        next_frontier.append(k)
+            frontier = next_frontier
+        return dist
+
+    def ladders(self, start, end, steps):
+        '''
+        Generate every ladder from start to end of exactly the given number of
+        steps which uses no word twice, each as a list of words, in order of
+        the words in the vocabulary.
+
+        The distances to end are found first, so the search never takes a
+        step from which end is further than the steps left.
+        '''
+        s, e = self._number(start), self._number(end)
+        to_end = self._distances(e, steps)
+        if to_end.get(s, steps + 1) > steps:
+            return
+        path = [s]
+        on_path = {s}
+        # each frame is the word's neighbours left to try
+        stack = [iter(sorted(self._neighbours(s)))]
+        while stack:
+            left = steps - len(path) + 1
+            for m in stack[-1]:
+                if m in on_path or to_end.get(m, left) >= left:
+                    continue
+                if m == e:
+                    if left == 1:
+                        yield [self._words[k] for k in path + [m]]
+                    continue
+                path.append(m)
+                on_path.add(m)
+                stack.append(iter(sorted(self._neighbours(m))))
+                break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+
+# The graphs of the passages used in this process
+_graphs = SourceCache(NeighbourGraph)
+
+def passage_graph(*ranges, work=None, form=POINTED):
+    '''
+    Return the NeighbourGraph of the words of a passage, building it the
+    first time the passage is asked for.
+
+    Parameters
+        ranges is a list of ranges as accepted by etcbc.iter_words
+        work is the corpus identifier, by default Hebrew
+        form is one of puzzles.core.normalize.FORMS
+    '''
+    return _graphs.get(corpus_provider(work), ranges, form)
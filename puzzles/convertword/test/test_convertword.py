@@ -0,0 +1,73 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import unittest
+from puzzles.convertword.convertword import NeighbourGraph
+
+class Test(unittest.TestCase):
+
+    words = ['cold', 'cord', 'card', 'ward', 'warm', 'word', 'worm', 'wore',
+             'core', 'corm', 'bold', 'bolt', 'boat', 'cold', 'bolts']
+
+    def setUp(self):
+        self.graph = NeighbourGraph(self.words)
+
+    def testGraph(self):
+        self.assertEqual(len(self.graph), 14)
+        self.assertEqual(sorted(self.graph.neighbours('cord')),
+                         ['card', 'cold', 'core', 'corm', 'word'])
+        self.assertEqual(self.graph.neighbours('bolts'), [])
+        self.assertEqual(self.graph.lengths(), {4: 13, 5: 1})
+        self.assertEqual(self.graph.words(5), ['bolts'])
+        self.assertEqual(self.graph.edge_count(), 18)
+        self.assertRaises(Exception, self.graph.neighbours, 'cart')
+
+    def testGraphemes(self):
+        # letters are graphemes, so changing a letter changes its points too
+        graph = NeighbourGraph(['בָּרָא', 'בָּרָךְ', 'בָרָא', 'בָּרֵא'])
+        self.assertEqual(sorted(graph.neighbours('בָּרָא')),
+                         sorted(['בָּרָךְ', 'בָרָא', 'בָּרֵא']))
+
+    def testShortestLadder(self):
+        ladder = self.graph.shortest_ladder('cold', 'warm')
+        self.assertEqual(len(ladder), 5)
+        self.assertEqual((ladder[0], ladder[-1]), ('cold', 'warm'))
+        for a, b in zip(ladder, ladder[1:]):
+            self.assertIn(b, self.graph.neighbours(a))
+        self.assertEqual(self.graph.shortest_ladder('bold', 'bolt'),
+                         ['bold', 'bolt'])
+        self.assertEqual(self.graph.shortest_ladder('cold', 'cold'), ['cold'])
+        self.assertIsNone(self.graph.shortest_ladder('cold', 'bolts'))
+
+    def testLadders(self):
+        self.assertEqual(list(self.graph.ladders('cold', 'warm', 4)),
+                         [['cold', 'cord', 'card', 'ward', 'warm'],
+                          ['cold', 'cord', 'corm', 'worm', 'warm'],
+                          ['cold', 'cord', 'word', 'ward', 'warm'],
+                          ['cold', 'cord', 'word', 'worm', 'warm']])
+        self.assertEqual(list(self.graph.ladders('cold', 'warm', 3)), [])
+
+        # every longer ladder is a simple path of the right length
+        ladders = list(self.graph.ladders('cold', 'warm', 6))
+        self.assertEqual(len(ladders), 5)
+        for ladder in ladders:
+            self.assertEqual(len(ladder), 7)
+            self.assertEqual(len(set(ladder)), 7)
+            self.assertEqual(ladder[-1], 'warm')
+            for a, b in zip(ladder, ladder[1:]):
+                self.assertIn(b, self.graph.neighbours(a))
+
+    def testDistances(self):
+        self.assertEqual(self.graph.distances('bold'),
+                         {'bold': 0, 'bolt': 1, 'cold': 1, 'boat': 2,
+                          'cord': 2, 'card': 3, 'core': 3, 'corm': 3,
+                          'word': 3, 'ward': 4, 'wore': 4, 'worm': 4,
+                          'warm': 5})
+        self.assertEqual(set(self.graph.distances('bold', 1)),
+                         {'bold', 'bolt', 'cold'})
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -4,10 +4,13 @@ Created on Jan 18, 2017
 @author: Daniel
 '''
 
-from tf.fabric import Fabric
 from bibleutils.versification import Identifier
-from inspect import currentframe
+from collections import OrderedDict
 import gc
+import os
+import sys
+
+from puzzles.core.wordcache import WordCache, build, fingerprint
 
 class __Corpus(Identifier):
     '''Defines the corpus identifiers. Essentially this is just Hebrew or Greek
@@ -22,45 +25,371 @@ class __Corpus(Identifier):
  
     @property
     def GREEK(self):
-        return self._map.get(currentframe().f_code.co_name)
+        return self._map.get(sys._getframe().f_code.co_name)
     
     @property
     def HEBREW(self):
-        return self._map.get(currentframe().f_code.co_name)
+        return self._map.get(sys._getframe().f_code.co_name)
 
 Corpus = __Corpus()
 
-# Package variables to hold the TF API references so they can be reused without
-# needing to reload them.
-apis = dict()
+# The location of the Text-Fabric data and of the word caches built from it,
+# /tmp/tf-data unless PUZZLES_TF_DATA is set
+DATA_LOC = os.environ.get('PUZZLES_TF_DATA', r'/tmp/tf-data')
+CACHE_LOC = os.path.join(DATA_LOC, '.puzzles-cache')
+
+def _corpus_config(work):
+    '''Return the TF module, the word feature and the language of the section
+    names for a corpus.
+    '''
+    if work == Corpus.HEBREW:
+        return ('hebrew/etcbc4c', 'g_word_utf8', 'la')
+    elif work == Corpus.GREEK:
+        return ('greek/sblgnt', 'g_word', 'en')
+    raise Exception(f'unknown corpus {work}')
+
+def _rss():
+    '''Return the resident memory of this process in bytes, or None where it
+    cannot be read.
+    '''
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # the peak rather than the current size, in kilobytes except on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+class CorpusRegistry():
+    '''
+    The TF APIs of the corpora loaded in this process. A corpus is loaded
+    with only its word feature when it is first used and further features
+    are added as they are asked for.
+
+    The memory each corpus takes is measured as the growth of the process
+    while it loads. When the loaded corpora together come to more than the
+    memory limit the least recently used are evicted, to be loaded again if
+    they are used again. Where the resident size cannot be read corpora are
+    counted as taking no memory and are never evicted.
+
+    To share loaded corpora with forked worker processes load them in the
+    parent, call share() before starting the workers and unshare() once
+    they have started. The workers then read the parent's pages rather than
+    copies of them.
+
+    Parameters
+
+    memory_limit - the number of bytes the loaded corpora may take between
+                   them, None for no limit
+    '''
+
+    def __init__(self, memory_limit=None):
+        self.memory_limit = memory_limit
+        self._fabrics = dict()
+        # least recently used first
+        self._apis = OrderedDict()
+        # the largest size measured for each corpus, kept after eviction
+        self._sizes = dict()
+
+    def __contains__(self, work):
+        return work in self._apis
+
+    def loaded(self):
+        '''Return the loaded corpora, least recently used first.'''
+        return list(self._apis)
+
+    def api(self, work):
+        '''Return the TF API for a corpus, loading it if need be.'''
+        api = self._apis.get(work)
+        if api is not None:
+            self._apis.move_to_end(work)
+            return api
+
+        # make room first if the corpus has been loaded before
+        self._make_room(work, self._sizes.get(work, 0))
+        before = _rss()
+        self._fabrics[work], api = self._load(work)
+        self._apis[work] = api
+        self._grown(work, before, 0)
+        return api
+
+    def _load(self, work):
+        '''Return the TF Fabric of a corpus and its API with the word feature
+        loaded.
+        '''
+        from tf.fabric import Fabric
+        work_home, word_feature, _ = _corpus_config(work)
+        TF = Fabric(locations=[DATA_LOC], modules=[work_home], silent=True)
+        return TF, TF.load(word_feature, silent=False)
+
+    def load_features(self, features, work):
+        '''Return the TF API for a corpus with the given features loaded in
+        addition to those already loaded.
+        '''
+        api = self.api(work)
+        missing = [f for f in features if not hasattr(api.F, f)]
+        if missing:
+            before = _rss()
+            self._fabrics[work].load(missing, add=True, silent=True)
+            self._grown(work, before, self._sizes.get(work, 0))
+        return api
+
+    def _grown(self, work, before, size):
+        '''Record the growth of the process since before as memory taken by
+        a corpus, on top of size, and evict others if that is too much.
+        '''
+        after = _rss()
+        if before is not None and after is not None:
+            # memory freed by an earlier eviction may be reused, so a reload
+            # can appear smaller than it is
+            self._sizes[work] = max(size + max(after - before, 0),
+                                    self._sizes.get(work, 0))
+        self._make_room(work, 0)
+
+    def memory_use(self):
+        '''Return a dictionary of each loaded corpus to the bytes it takes.'''
+        return {work: self._sizes.get(work, 0) for work in self._apis}
+
+    def _make_room(self, keep, needed):
+        '''Evict corpora other than keep, least recently used first, until
+        needed more bytes fit within the memory limit.
+        '''
+        if self.memory_limit is None:
+            return
+        for work in list(self._apis):
+            if sum(self.memory_use().values()) + needed <= self.memory_limit:
+                break
+            if work != keep:
+                self.evict(work)
+
+    def evict(self, work):
+        '''Drop a corpus so its memory can be reclaimed.'''
+        if self._apis.pop(work, None) is not None:
+            del self._fabrics[work]
+            gc.collect()
+
+    def share(self):
+        '''
+        Prepare the loaded corpora to be shared with processes about to be
+        forked. Objects surviving a collection are frozen, so no collection
+        in a child writes to them and copies the pages they are on. The
+        parent calls unshare() once the children are forked.
+        '''
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+    def unshare(self):
+        '''Return the objects frozen by share() to the collector of this
+        process, so the objects it goes on to make are not kept frozen.
+        '''
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+# The corpora loaded in this process
+registry = CorpusRegistry()
+
+def _get_api(work):
+    '''Return the TF API for a corpus, loading it on first use.'''
+    return registry.api(work)
+
+def load_features(features, work=Corpus.HEBREW):
+    '''
+    Return the TF API for a corpus with the given features loaded in
+    addition to those already loaded.
+    
+    Parameters
+        features is a list of TF feature names
+        work is the corpus identifier
+    '''
+    return registry.load_features(features, work)
+
+def corpus_file_name(work, suffix):
+    '''Return the path of a file derived from a corpus in the cache
+    directory, named for the corpus data and word feature.
+    '''
+    work_home, word_feature, _ = _corpus_config(work)
+    return os.path.join(CACHE_LOC,
+                        f"{work_home.replace('/', '-')}-{word_feature}{suffix}")
+
+# Package variable to hold the open word caches, one per corpus
+word_caches = dict()
+def get_word_cache(work=Corpus.HEBREW):
+    '''
+    Get the on-disk word cache for a corpus. The cache is checked against the
+    Text-Fabric data once per process and is rebuilt from Text-Fabric if it
+    is missing or the data has changed since it was built. Otherwise TF is
+    neither loaded nor imported.
+    
+    Parameters
+        work is the corpus identifier
+    '''
+    cache = word_caches.get(work)
+    if cache is None:
+        work_home, _, _ = _corpus_config(work)
+        fp = fingerprint(os.path.join(DATA_LOC, work_home))
+        path = corpus_file_name(work, '.pzwc')
+        cache = WordCache.open(path, fp)
+        if cache is None:
+            _build_word_cache(work, path, fp)
+            cache = WordCache.open(path, fp)
+        word_caches[work] = cache
+    return cache
+
+def _build_word_cache(work, path, fp):
+    '''Write the word cache for a corpus from its TF data.'''
+    api = _get_api(work)
+    _, word_feature, lang = _corpus_config(work)
+    word_values = api.Fs(word_feature)
+    def verses():
+        for v in api.F.otype.s('verse'):
+            yield (api.T.sectionFromNode(v, lang=lang),
+                   [word_values.v(s) or '' for s in api.L.d(v, 'word')])
+    build(path, fp, verses())
+
+def _open_word_cache(work):
+    '''Return the word cache for a corpus or None if it cannot be built, for
+    example because the data location is read only. Callers then fall back
+    to TF.
+    '''
+    try:
+        return get_word_cache(work)
+    except OSError:
+        return None
+
+def _range_ends(word_range):
+    '''Split a range into its start and end sections.'''
+    if word_range and isinstance(word_range[0], str):
+        return tuple(word_range), tuple(word_range)
+    start, end = word_range
+    return tuple(start), tuple(end)
+
+def iter_words(*ranges, work=Corpus.HEBREW):
+    '''
+    Generate the words of the specified work in the given ranges, in order.
+    Each range is resolved to one contiguous run of words in a single step,
+    so whole chapters and books cost no per verse lookups.
+    
+    Parameters
+        ranges is a list of ranges. A range is either a section or a pair of
+            sections, start and end, covering the text from the beginning of
+            start to the end of end inclusive. A section is a tuple of book,
+            book and chapter, or book, chapter and verse.
+            books are string names as defined in Text-Fabric for English.
+            chapter and verse are integers.
+    '''
+    cache = _open_word_cache(work)
+    if cache is not None:
+        for word_range in ranges:
+            start, end = _range_ends(word_range)
+            yield from cache.iter_words(cache.section_span(start)[0],
+                                        cache.section_span(end)[1])
+        return
+
+    _, word_feature, lang = _corpus_config(work)
+    api = _get_api(work)
+    word_values = api.Fs(word_feature)
+    for word_range in ranges:
+        start, end = _range_ends(word_range)
+        first = api.E.oslots.s(api.T.nodeFromSection(start, lang=lang))[0]
+        last = api.E.oslots.s(api.T.nodeFromSection(end, lang=lang))[-1]
+        for s in range(first, last + 1):
+            yield word_values.v(s) or ''
+
+def word_spans(*ranges, work=Corpus.HEBREW):
+    '''
+    Return the (first, end) word indexes of each range, as accepted by
+    iter_words. Word i of a corpus is TF slot i + 1.
+    '''
+    cache = _open_word_cache(work)
+    spans = []
+    if cache is not None:
+        for word_range in ranges:
+            start, end = _range_ends(word_range)
+            spans.append((cache.section_span(start)[0],
+                          cache.section_span(end)[1]))
+        return spans
+
+    _, _, lang = _corpus_config(work)
+    api = _get_api(work)
+    for word_range in ranges:
+        start, end = _range_ends(word_range)
+        first = api.E.oslots.s(api.T.nodeFromSection(start, lang=lang))[0]
+        last = api.E.oslots.s(api.T.nodeFromSection(end, lang=lang))[-1]
+        spans.append((first - 1, last))
+    return spans
+
+def words_at(indexes, work=Corpus.HEBREW):
+    '''Return the list of the words of a corpus with the given indexes.'''
+    cache = _open_word_cache(work)
+    if cache is not None:
+        return [cache.word(i) for i in indexes]
+    _, word_feature, _ = _corpus_config(work)
+    word_values = _get_api(work).Fs(word_feature)
+    return [word_values.v(i + 1) or '' for i in indexes]
+
+def iter_corpus_words(work=Corpus.HEBREW):
+    '''
+    Generate every word of a corpus in order, from the word cache when it is
+    available, otherwise from Text-Fabric directly.
+    
+    Parameters
+        work is the corpus identifier
+    '''
+    cache = _open_word_cache(work)
+    if cache is not None:
+        yield from cache.iter_words(0, cache.word_count())
+        return
+
+    _, word_feature, _ = _corpus_config(work)
+    api = _get_api(work)
+    word_values = api.Fs(word_feature)
+    for s in api.F.otype.s('word'):
+        yield word_values.v(s) or ''
+
+def preload(work=Corpus.HEBREW):
+    '''
+    Load what iter_words needs for a corpus now rather than on first use,
+    the word cache if it can be had, otherwise the TF API. Long running
+    processes call this at start up so that no request pays for loading.
+    
+    Parameters
+        work is the corpus identifier
+    '''
+    if _open_word_cache(work) is None:
+        _get_api(work)
+
+def get_books(work=Corpus.HEBREW):
+    '''
+    Return the names of the books of a corpus in order, from the word cache
+    when it is available, otherwise from Text-Fabric directly.
+    
+    Parameters
+        work is the corpus identifier
+    '''
+    cache = _open_word_cache(work)
+    if cache is not None:
+        return cache.books()
+    _, _, lang = _corpus_config(work)
+    api = _get_api(work)
+    return [api.T.sectionFromNode(b, lang=lang)[0]
+            for b in api.F.otype.s('book')]
+
 def get_words(*refs, work=Corpus.HEBREW):
     '''
     Get a list of unique words in the specified work, book, chapter and verses.
+    The words are read from the word cache when it is available, otherwise
+    from Text-Fabric directly.
     
     Parameters
         refs is a list of tuples, each tuple being book, chapter and verse. 
             books are string names as defined in Text-Fabric for English.
             chapter and verse are integers.
+            Any range accepted by iter_words may also be given.
     '''
-    if work == Corpus.HEBREW:
-        work_home = 'hebrew/etcbc4c'
-        word_feature = 'g_word_utf8'
-        lang = 'la'
-    elif work == Corpus.GREEK:
-        work_home = 'greek/sblgnt'
-        word_feature = 'g_word'
-        lang = 'en'
-    data_loc = r'/tmp/tf-data'
-    if apis.get(work) is None:
-        TF = Fabric(locations=[data_loc],
-                    modules=[work_home], silent=True)
-        apis[work] = TF.load(word_feature, silent=False)
-        
-    api = apis[work]
-    lex_list = []
-    for ref in refs:
-        verse_nodes = api.T.nodeFromSection(ref, lang=lang)
-        slots = api.L.d(verse_nodes, 'word')
-        lex_list.extend([api.Fs(word_feature).v(s) for s in slots])
-    
-    return lex_list
+    return list(iter_words(*refs, work=work))
@@ -0,0 +1,148 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Grapheme frequency tables of the corpora, for filling puzzle grids with
+graphemes in the proportions the text itself uses them.
+
+A table is counted from every word of a corpus the first time it is asked
+for and written beside the word cache, keyed by the fingerprint of the data,
+so each corpus is counted once rather than once per puzzle. Tables are kept
+in memory for the life of the process.
+
+Tables may be counted in any of the forms of puzzles.core.normalize, the
+graphemes as they are in the text, without their accents or with no marks
+at all.
+'''
+
+import json
+import os
+from itertools import accumulate
+
+from puzzles.core.etcbc import Corpus, corpus_file_name, get_word_cache, \
+    iter_corpus_words
+from puzzles.core.graphemes import graphemes
+from puzzles.core.normalize import FORMS, POINTED, normalize
+
+class FrequencyTable():
+    '''
+    The number of times each grapheme occurs in a body of text, with a
+    weighted sampler.
+
+    Parameters
+
+    counts - a dictionary of grapheme to number of occurrences
+    '''
+
+    def __init__(self, counts):
+        # most frequent first, so the sampler finds common graphemes soonest
+        self.graphemes = sorted(counts, key=lambda g: (-counts[g], g))
+        self.counts = [counts[g] for g in self.graphemes]
+        self.cum_weights = list(accumulate(self.counts))
+
+    @classmethod
+    def from_words(cls, words, form=POINTED):
+        '''Count the graphemes of an iterable of words.'''
+        counts = dict()
+        for w in words:
+            for g in graphemes(w):
+                counts[g] = counts.get(g, 0) + 1
+        if form != POINTED:
+            if form not in FORMS:
+                raise Exception(f'unknown form {form}')
+            bare = dict()
+            for g, n in counts.items():
+                g = normalize(g, form)
+                if g:
+                    bare[g] = bare.get(g, 0) + n
+            counts = bare
+        return cls(counts)
+
+    def __len__(self):
+        return len(self.graphemes)
+
+    def __deepcopy__(self, memo):
+        # never modified, so copies of wordsearches can share it
+        return self
+
+    def frequency(self, grapheme):
+        '''Return the fraction of all graphemes which are this one.'''
+        total = self.cum_weights[-1] if self.cum_weights else 0
+        try:
+            return self.counts[self.graphemes.index(grapheme)] / total
+        except ValueError:
+            return 0.0
+
+    def sample(self, rng, k):
+        '''Return a list of k graphemes drawn at random in proportion to their
+        counts, in one call.
+
+        Parameters
+
+        rng - the random.Random to draw from
+        k - the number of graphemes
+        '''
+        return rng.choices(self.graphemes, cum_weights=self.cum_weights, k=k)
+
+    def save(self, path, fingerprint):
+        '''Write the table to a JSON file, marked with the fingerprint of the
+        data it was counted from.
+        '''
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, mode='w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint,
+                       'counts': dict(zip(self.graphemes, self.counts))},
+                      f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, fingerprint):
+        '''Read a table written by save() if it exists and was counted from
+        data with the given fingerprint, otherwise return None.
+        '''
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('fingerprint') != fingerprint:
+            return None
+        return cls(data['counts'])
+
+# The tables loaded in this process, keyed by (corpus, form)
+tables = dict()
+
+def grapheme_frequencies(work=Corpus.HEBREW, form=POINTED):
+    '''
+    Return the FrequencyTable of a corpus in one of FORMS, counting it from
+    the whole corpus if it has not been counted before.
+
+    Parameters
+        work is the corpus identifier
+        form is one of FORMS
+    '''
+    if form not in FORMS:
+        raise Exception(f'unknown form {form}')
+    table = tables.get((work, form))
+    if table is not None:
+        return table
+
+    path = corpus_file_name(work, f'.{form}.freq.json')
+    try:
+        fp = get_word_cache(work).fingerprint
+    except OSError:
+        # no word cache, so nowhere to keep the table either
+        fp = None
+    if fp is not None:
+        table = FrequencyTable.load(path, fp)
+    if table is None:
+        table = FrequencyTable.from_words(iter_corpus_words(work), form)
+        if fp is not None:
+            try:
+                table.save(path, fp)
+            except OSError:
+                pass
+    tables[(work, form)] = table
+    return table
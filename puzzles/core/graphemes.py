@@ -0,0 +1,79 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Grapheme segmentation shared by all the puzzles.
+
+What a reader sees as one letter, a letter plus its vowel points, accents or
+breathing marks, is a grapheme cluster of several codepoints. Every puzzle
+works in these units, so words are segmented here once and the result cached.
+
+uniseg is the reference implementation but it is slow and not safe to call
+from several threads at once. Words made up only of Latin, Greek and Hebrew
+letters and combining marks, which is nearly all of the text used here, are
+segmented by a regular expression which gives the same clusters as uniseg for
+those characters: each cluster is a character followed by any combining marks.
+Anything else is passed to uniseg under a lock. Results are kept in an LRU
+cache keyed by word and are returned as tuples so they can be shared safely
+between threads.
+'''
+
+import re
+from functools import lru_cache
+from threading import Lock
+
+# Characters for which the simple cluster rule below agrees with the full
+# Unicode segmentation rules - printable ASCII, Latin-1 except the soft
+# hyphen, the combining diacritics, Greek and Coptic, Hebrew, Greek Extended
+# and the Hebrew presentation forms.
+_SIMPLE = re.compile('[ -~\u00a0-\u00ac\u00ae-\u00ff\u0300-\u03ff'
+                     '\u0590-\u05ff\u1f00-\u1fff\ufb1d-\ufb4f]*')
+
+# A cluster is any character followed by the combining marks which extend it
+_CLUSTER = re.compile('.[\u0300-\u036f\u0591-\u05bd\u05bf\u05c1\u05c2'
+                      '\u05c4\u05c5\u05c7\ufb1e]*', re.DOTALL)
+
+CACHE_SIZE = 65536
+
+_uniseg_lock = Lock()
+
+def _uniseg_graphemes(word):
+    from uniseg.graphemecluster import grapheme_clusters
+    with _uniseg_lock:
+        return tuple(grapheme_clusters(word))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def graphemes(word):
+    '''
+    Return the grapheme clusters of a word as a tuple of strings. This is
+    safe to call from multiple threads.
+
+    Parameters
+
+    word - the word to segment
+    '''
+    if _SIMPLE.fullmatch(word):
+        return tuple(_CLUSTER.findall(word))
+    return _uniseg_graphemes(word)
+
+def grapheme_count(word):
+    '''Return the number of grapheme clusters in a word.'''
+    return len(graphemes(word))
+
+def sorted_graphemes(words):
+    '''Return a list of (word, graphemes) for each word, the longest first
+    and words of the same length in alphabetical order, so that the order
+    does not depend on the order the words were given in.
+    '''
+    entries = [(w, graphemes(w)) for w in words]
+    entries.sort(key=lambda g_ent: (-len(g_ent[1]), g_ent[0]))
+    return entries
+
+def cache_info():
+    '''Return the hit and miss statistics of the segmentation cache.'''
+    return graphemes.cache_info()
+
+def cache_clear():
+    '''Empty the segmentation cache.'''
+    graphemes.cache_clear()
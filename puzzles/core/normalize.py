@@ -0,0 +1,133 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+The forms a word may be used in, with or without its vowel points, accents
+and breathings.
+
+Forms
+
+    pointed     - the word as it is in the text, with the vowel points and
+                  accents of the Hebrew and the accents and breathings of
+                  the Greek
+    unaccented  - the word without its accents, the Hebrew cantillation
+                  marks and meteg and the Greek acute, grave and circumflex.
+                  Hebrew vowel points and Greek breathings, diaeresis and
+                  iota subscript are kept.
+    consonantal - the word with every combining mark removed, the bare
+                  Hebrew consonants and Greek letters
+
+The form chosen decides which words of a passage are the same, and so which
+are left once repeats are removed. A word is normalized by decomposing it,
+deleting the marks of the form with str.translate and composing it again,
+and each word is only normalized once. For the corpora, the form of every
+word is worked out once, written beside the word cache keyed by the data
+fingerprint as a column of codes, one per word, and mapped in from there, so
+the words of a passage in any form are a lookup by word index.
+'''
+
+import unicodedata
+from functools import lru_cache
+
+POINTED = 'pointed'
+UNACCENTED = 'unaccented'
+CONSONANTAL = 'consonantal'
+FORMS = (POINTED, UNACCENTED, CONSONANTAL)
+
+CACHE_SIZE = 65536
+
+# The combining diacritical mark blocks and the Hebrew points and accents
+_MARK_RANGES = (range(0x0300, 0x0370), range(0x0591, 0x05C8),
+                range(0x1AB0, 0x1B00), range(0x1DC0, 0x1E00),
+                range(0x20D0, 0x2100), range(0xFB1E, 0xFB1F),
+                range(0xFE20, 0xFE30))
+
+_MARKS = [c for r in _MARK_RANGES for c in r
+          if unicodedata.combining(chr(c))]
+
+# The Hebrew accents, meteg and the upper and lower dots, and the Greek
+# acute, grave and circumflex
+_ACCENTS = [c for c in _MARKS
+            if 0x0591 <= c <= 0x05AF or c in (0x05BD, 0x05C4, 0x05C5,
+                                              0x0300, 0x0301, 0x0342)]
+
+# str.translate tables deleting the marks of each form
+_DELETE = {UNACCENTED: dict.fromkeys(_ACCENTS),
+           CONSONANTAL: dict.fromkeys(_MARKS)}
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _normalize(word, form):
+    return unicodedata.normalize(
+        'NFC', unicodedata.normalize('NFD', word).translate(_DELETE[form]))
+
+def normalize(word, form=POINTED):
+    '''
+    Return a word in one of FORMS.
+
+    Parameters
+
+    word - the word as it is in the text
+    form - POINTED, UNACCENTED or CONSONANTAL
+    '''
+    if form == POINTED:
+        return word
+    if form not in _DELETE:
+        raise Exception(f'unknown form {form}')
+    return _normalize(word, form)
+
+def consonantal(word):
+    '''Return a word or grapheme with its combining marks removed.'''
+    return normalize(word, CONSONANTAL)
+
+# The columns of the corpora in each form, keyed by (corpus, form)
+forms = dict()
+
+def corpus_forms(work, form):
+    '''
+    Return a query.Column of every word of a corpus in a form other than
+    POINTED, building it from the whole corpus if it has not been built
+    before.
+
+    Parameters
+
+    work - the corpus identifier
+    form - UNACCENTED or CONSONANTAL
+    '''
+    column = forms.get((work, form))
+    if column is None:
+        from puzzles.core.etcbc import iter_corpus_words
+        from puzzles.core.query import corpus_column
+        if form not in _DELETE:
+            raise Exception(f'no corpus column for form {form}')
+        column = corpus_column(
+            work, f'.{form}.pzfc',
+            lambda: (_normalize(w, form) for w in iter_corpus_words(work)))
+        forms[(work, form)] = column
+    return column
+
+def iter_forms(*ranges, work=None, form=POINTED):
+    '''
+    Generate the words in the given ranges of a corpus in a form, in order.
+
+    Parameters
+        ranges is a list of ranges as accepted by etcbc.iter_words
+        work is the corpus identifier, by default Hebrew
+        form is one of FORMS
+    '''
+    from puzzles.core.etcbc import Corpus, iter_words, word_spans
+    if work is None:
+        work = Corpus.HEBREW
+    if form == POINTED:
+        yield from iter_words(*ranges, work=work)
+        return
+    column = corpus_forms(work, form)
+    for first, end in word_spans(*ranges, work=work):
+        for i in range(first, end):
+            yield column.value(i)
+
+def get_forms(*ranges, work=None, form=POINTED):
+    '''Return the list of the words in the given ranges in a form, as
+    iter_forms().
+    '''
+    return list(iter_forms(*ranges, work=work, form=form))
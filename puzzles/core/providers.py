@@ -0,0 +1,352 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Word providers, the sources the words of puzzles are taken from.
+
+A provider turns a source, whatever identifies some text to it, into the
+words of that text in order. There are providers for
+
+    TextFabricProvider - passages of the Text-Fabric corpora, the source
+                         being a tuple of ranges as accepted by
+                         etcbc.iter_words
+    TextProvider       - plain text, such as text pasted into a form
+    MarkupProvider     - XML or XHTML, such as the markup returned by a web
+                         API, a whole document or a fragment of one. The
+                         markup is parsed as it is read so a large document
+                         is never held in memory.
+
+get_words() of every provider keeps its results in one cache shared by all
+providers, least recently used first, so the same words are never parsed
+twice however many puzzles are made from them. Words may be asked for in any
+of the forms of puzzles.core.normalize and the result of each form is
+cached separately.
+
+get_provider() returns the provider for a name, ETCBCH, ETCBCG, text or
+markup. Other providers are added by setting them in providers.
+
+A SourceCache keeps what a puzzle builds from the words of a source, such
+as its index of the words, keyed in the same way as the result cache.
+'''
+
+import hashlib
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from xml.etree.ElementTree import XMLPullParser
+
+from puzzles.core.normalize import POINTED, normalize
+
+# The combining marks which may follow a letter within a word. The maqaf,
+# paseq and sof pasuq separate words as they do in the corpora.
+_MARKS = '\u0300-\u036f\u0483-\u0489\u0591-\u05bd\u05bf\u05c1\u05c2' \
+         '\u05c4\u05c5\u05c7\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f'
+
+# A letter, the letters and marks after it and an elision mark at the end
+_WORD = re.compile(r'[^\W\d_](?:[^\W\d_]|[' + _MARKS +
+                   r'])*(?:[\u2019\u02bc](?![^\W\d_]))?')
+
+# The results of get_words() keyed by provider, source and form, least
+# recently used first
+RESULT_CACHE_SIZE = 64
+_results = OrderedDict()
+
+def tokenize(text):
+    '''Return the words of a piece of plain text in order.'''
+    return _WORD.findall(text)
+
+def _text_key(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class WordProvider(ABC):
+    '''
+    The interface of the word providers. Subclasses implement iter_words()
+    and, for the sources whose words may be cached, cache_key().
+
+    Parameters
+
+    key - a hashable value identifying the provider and its settings in the
+          result cache
+    '''
+
+    def __init__(self, key):
+        self.key = key
+
+    def cache_key(self, source):
+        '''Return a hashable value identifying a source, or None if the words
+        of the source are not to be cached.
+        '''
+        return None
+
+    @abstractmethod
+    def iter_words(self, source):
+        '''Generate the words of a source in order, as they are in the
+        source.
+        '''
+
+    def iter_forms(self, source, form=POINTED):
+        '''Generate the words of a source in order in a form.'''
+        for w in self.iter_words(source):
+            yield normalize(w, form)
+
+    def get_words(self, source, form=POINTED):
+        '''
+        Return the list of the words of a source in a form, from the result
+        cache if they have been found before.
+
+        Parameters
+
+        source - the text to take the words from, as the provider expects
+        form - one of puzzles.core.normalize.FORMS
+        '''
+        source_key = self.cache_key(source)
+        if source_key is None:
+            return list(self.iter_forms(source, form))
+        key = (self.key, source_key, form)
+        words = _results.get(key)
+        if words is None:
+            words = tuple(self.iter_forms(source, form))
+            _results[key] = words
+            if len(_results) > RESULT_CACHE_SIZE:
+                _results.popitem(last=False)
+        else:
+            _results.move_to_end(key)
+        return list(words)
+
+class TextFabricProvider(WordProvider):
+    '''
+    The words of the Text-Fabric corpora.
+
+    Parameters
+
+    work - the corpus identifier
+    '''
+
+    def __init__(self, work):
+        super().__init__(('tf', work))
+        self.work = work
+
+    def cache_key(self, source):
+        return tuple(source)
+
+    def iter_words(self, source):
+        from puzzles.core.etcbc import iter_words
+        return iter_words(*source, work=self.work)
+
+    def iter_forms(self, source, form=POINTED):
+        # the other forms are precomputed for the whole corpus
+        from puzzles.core.normalize import iter_forms
+        return iter_forms(*source, work=self.work, form=form)
+
+class TextProvider(WordProvider):
+    '''
+    The words of plain text. A word is a letter followed by any letters and
+    combining marks, so punctuation, digits, the maqaf and sof pasuq all
+    separate words.
+    '''
+
+    def __init__(self):
+        super().__init__(('text',))
+
+    def cache_key(self, source):
+        return _text_key(source)
+
+    def iter_words(self, source):
+        for m in _WORD.finditer(source):
+            yield m.group()
+
+class MarkupProvider(WordProvider):
+    '''
+    The words of XML or XHTML. The source is the markup itself, a file name
+    or a file object. The markup is fed to the parser a chunk at a time and
+    each element is dropped as soon as its text has been read.
+
+    Words do not run across the boundaries of elements, so markup with an
+    element for each word, <w>λόγος</w>, gives one word per element.
+
+    Parameters
+
+    tags - the local names of the elements holding the words, for example
+           {'w'}. If not given the text of every element is used.
+    skip - the local names of elements whose text is never used
+    fragment - True if the sources are fragments of markup, without a single
+               root element or XML declaration
+    '''
+
+    CHUNK_SIZE = 1 << 16
+
+    DEFAULT_SKIP = frozenset(('script', 'style', 'head'))
+
+    def __init__(self, tags=None, skip=DEFAULT_SKIP, fragment=False):
+        self.tags = frozenset(tags) if tags is not None else None
+        self.skip = frozenset(skip)
+        self.fragment = fragment
+        super().__init__(('markup', self.tags, self.skip, fragment))
+
+    def cache_key(self, source):
+        if isinstance(source, str):
+            if source.lstrip().startswith('<'):
+                return _text_key(source)
+            # a file, changed if its size or time are
+            st = os.stat(source)
+            return (os.path.abspath(source), st.st_mtime_ns, st.st_size)
+        # a file object may only be read once
+        return None
+
+    def _chunks(self, source):
+        if isinstance(source, str):
+            if source.lstrip().startswith('<'):
+                yield source
+                return
+            with open(source, mode='rb') as f:
+                yield from self._chunks(f)
+            return
+        while True:
+            chunk = source.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    @staticmethod
+    def _local_name(tag):
+        return tag.rpartition('}')[2]
+
+    def iter_words(self, source):
+        parser = XMLPullParser(events=('start', 'end'))
+        # for each open element, the element, its last child and whether its
+        # text is used
+        stack = []
+
+        def text_before(entry):
+            # the text between the previous event and this one in an element
+            elem, last, _ = entry
+            if last is None:
+                text, elem.text = elem.text, None
+            else:
+                text = last.tail
+                elem.remove(last)
+            return text
+
+        def events():
+            # a fragment is given a root element, in the type of the chunks
+            end = None
+            for chunk in self._chunks(source):
+                if self.fragment and end is None:
+                    start, end = (b'<fragment>', b'</fragment>') \
+                        if isinstance(chunk, bytes) \
+                        else ('<fragment>', '</fragment>')
+                    parser.feed(start)
+                parser.feed(chunk)
+                yield from parser.read_events()
+            if end is not None:
+                parser.feed(end)
+            parser.close()
+            yield from parser.read_events()
+
+        for event, elem in events():
+            if event == 'start':
+                name = self._local_name(elem.tag)
+                used = self.tags is None
+                if stack:
+                    text = text_before(stack[-1])
+                    if text and stack[-1][2]:
+                        yield from tokenize(text)
+                    stack[-1][1] = elem
+                    used = stack[-1][2] or (self.tags is not None and
+                                            name in self.tags)
+                elif self.tags is not None:
+                    used = name in self.tags
+                if name in self.skip:
+                    used = False
+                stack.append([elem, None, used])
+            else:
+                entry = stack.pop()
+                text = text_before(entry)
+                if text and entry[2]:
+                    yield from tokenize(text)
+
+# The providers by name, see get_provider()
+providers = dict()
+
+def get_provider(name):
+    '''
+    Return the provider of a name, creating it the first time it is asked
+    for.
+
+    Parameters
+        name is ETCBCH or ETCBCG for the corpora, text for plain text, markup
+        for XML or XHTML, or the name of a provider set in providers
+    '''
+    provider = providers.get(name)
+    if provider is None:
+        if name in ('ETCBCH', 'ETCBCG'):
+            from puzzles.core.etcbc import Corpus
+            provider = TextFabricProvider(
+                Corpus.HEBREW if name == 'ETCBCH' else Corpus.GREEK)
+        elif name == 'text':
+            provider = TextProvider()
+        elif name == 'markup':
+            provider = MarkupProvider()
+        else:
+            raise Exception(f'unknown word provider {name}')
+        providers[name] = provider
+    return provider
+
+class SourceCache():
+    '''
+    The values built from the words of sources, such as the indexes of the
+    puzzles, kept for the most recently used sources.
+
+    Parameters
+
+    build - a function of a list of words returning the value for them
+    size - the most values kept
+    '''
+
+    def __init__(self, build, size=16):
+        self.build = build
+        self.size = size
+        self._values = OrderedDict()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, provider, source, form=POINTED):
+        '''
+        Return the value for the words of a source, building it the first
+        time the source is asked for.
+
+        Parameters
+
+        provider - the WordProvider of the source
+        source - the source, as the provider expects
+        form - one of puzzles.core.normalize.FORMS
+        '''
+        source_key = provider.cache_key(source)
+        if source_key is None:
+            return self.build(provider.get_words(source, form))
+        key = (provider.key, source_key, form)
+        value = self._values.get(key)
+        if value is None:
+            value = self.build(provider.get_words(source, form))
+            self._values[key] = value
+            if len(self._values) > self.size:
+                self._values.popitem(last=False)
+        else:
+            self._values.move_to_end(key)
+        return value
+
+    def clear(self):
+        '''Drop every value.'''
+        self._values.clear()
+
+def corpus_provider(work=None):
+    '''Return the provider of the words of a corpus, by default Hebrew.'''
+    from puzzles.core.etcbc import Corpus
+    return get_provider('ETCBCG' if work == Corpus.GREEK else 'ETCBCH')
+
+def clear_results():
+    '''Empty the result cache.'''
+    _results.clear()
@@ -0,0 +1,438 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Selection of the words of a passage by their Text-Fabric features, such as
+part of speech, gender, number and person.
+
+Each feature is held as a column, one small integer code per word of the
+corpus standing for the feature's value at that word, and the words having
+a value are a bitmap, a Python int with bit i set for word i. A query is then
+a few ands and ors of bitmaps and a mask for the passage, all done by the
+interpreter in C rather than by a loop over the words in Python. For
+example, all the proper nouns of Genesis 10 are
+
+    select_words(('Genesis', 10), work=Corpus.HEBREW, pos='nmpr')
+
+Columns are read from TF the first time a feature is used and written beside
+the word cache, keyed by the data fingerprint, from where later processes map
+them in without TF. Columns and bitmaps are kept in memory for the life of
+the process and shared by all queries.
+
+Criteria are given as keyword arguments, feature=value for the words with
+that value or feature=(value, ...) for the words with any of them. The names
+are those of the TF features of the corpus, or the aliases in ALIASES. The
+aliases and lexeme features are only defined for the Hebrew corpus. The
+Greek corpus has no part of speech for proper names and its feature names
+differ, so its words are selected by the names of its own TF features and
+an alias of the Hebrew features is an error rather than being taken for a
+Greek feature name.
+
+get_word_records() returns the values of features at every word of a
+passage, for example the word, its lexeme and the gloss of the lexeme for
+crossword clues. Features of the lexemes rather than the words, such as the
+Hebrew gloss, are held as a column with one value per lexeme, in the order
+of the codes of the lexeme feature of the words, so the gloss of a word is
+the value at the word's lexeme code, two array lookups with no TF call.
+'''
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from puzzles.core.etcbc import Corpus, corpus_file_name, get_word_cache, \
+    iter_words, load_features, word_spans, words_at
+
+# Friendly names for the TF features of each corpus
+ALIASES = {Corpus.HEBREW: {'pos': 'sp',
+                           'gender': 'gn',
+                           'number': 'nu',
+                           'person': 'ps',
+                           'state': 'st',
+                           'lexeme': 'lex'}}
+
+# The features of the lexemes of each corpus rather than of its words, with
+# the feature of the words naming their lexeme and the TF type of the
+# lexeme nodes
+LEXEME_FEATURES = {Corpus.HEBREW: ('lex', 'lex', frozenset(('gloss',)))}
+
+# The name of the word itself in get_word_records()
+WORD = 'word'
+
+MAGIC = b'PZFC'
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct('<4sHBBI')
+_TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+def _byte_bitmap(data, byte):
+    '''Return the bitmap of the bytes of data equal to byte, bit i for
+    data[i], by mapping byte to '1' and every other to '0' and reading the
+    result as a binary number.
+    '''
+    table = bytearray(b'0' * 256)
+    table[byte] = ord('1')
+    digits = data.translate(table)
+    return int(digits[::-1], 2) if digits else 0
+
+def _positions(bitmap, offset=0):
+    '''Generate the indexes of the set bits of a bitmap, plus offset.'''
+    bits = bin(bitmap)[:1:-1]
+    i = bits.find('1')
+    while i >= 0:
+        yield i + offset
+        i = bits.find('1', i + 1)
+
+class Column():
+    '''
+    The values of one feature for every word of a corpus.
+
+    Parameters
+
+    values - the distinct values of the feature. values[0] is None, the
+             code of words without the feature.
+    codes - a sequence of the code of the value at each word, an array or a
+            memoryview of typecode B, H or I
+    '''
+
+    def __init__(self, values, codes):
+        self.values = values
+        self._codes = codes
+        self._value_codes = {v: i for i, v in enumerate(values)}
+        self._bitmaps = dict()
+
+    @classmethod
+    def from_values(cls, word_values):
+        '''Build a column from an iterable of the value at each word.'''
+        values = [None]
+        value_codes = {None: 0}
+        codes = []
+        for v in word_values:
+            code = value_codes.get(v)
+            if code is None:
+                code = value_codes[v] = len(values)
+                values.append(v)
+            codes.append(code)
+        typecode = 'B' if len(values) <= 0x100 else \
+            'H' if len(values) <= 0x10000 else 'I'
+        return cls(values, array(typecode, codes))
+
+    def __len__(self):
+        return len(self._codes)
+
+    def value(self, i):
+        '''Return the value of the feature at word i.'''
+        return self.values[self._codes[i]]
+
+    def codes_in(self, first, end):
+        '''Return the codes of words first to end - 1.'''
+        return self._codes[first:end]
+
+    def values_in(self, first, end):
+        '''Return the list of the values of words first to end - 1.'''
+        values = self.values
+        return [values[c] for c in self._codes[first:end]]
+
+    def values_at(self, indexes):
+        '''Return the list of the values at each of a sequence of indexes.'''
+        values, codes = self.values, self._codes
+        return [values[codes[i]] for i in indexes]
+
+    def bitmap(self, value):
+        '''Return the bitmap of the words with a value, 0 if no word has it.
+        Each bitmap is built once, in a single pass over the column.
+        '''
+        code = self._value_codes.get(value)
+        if code is None:
+            return 0
+        bitmap = self._bitmaps.get(code)
+        if bitmap is None:
+            data = bytes(self._codes)
+            itemsize = self._codes.itemsize
+            # codes of more than one byte - the words whose every byte
+            # matches, each byte of the codes taken with a strided slice
+            bitmap = -1
+            for j in range(itemsize):
+                plane = j if sys.byteorder == 'little' else itemsize - 1 - j
+                bitmap &= _byte_bitmap(data[plane::itemsize],
+                                       code >> 8 * j & 0xFF)
+                if not bitmap:
+                    break
+            self._bitmaps[code] = bitmap
+        return bitmap
+
+    def mask(self, values):
+        '''Return the bitmap of the words with any of the values.'''
+        if isinstance(values, (list, tuple, set, frozenset)):
+            bitmap = 0
+            for v in values:
+                bitmap |= self.bitmap(v)
+            return bitmap
+        return self.bitmap(values)
+
+    def save(self, path, fingerprint):
+        '''Write the column to a file, marked with the fingerprint of the data
+        it was read from.
+        '''
+        header = json.dumps({'fingerprint': fingerprint,
+                             'values': self.values[1:]},
+                            ensure_ascii=False).encode('utf-8')
+        pad = -(_PREFIX.size + len(header)) % 8
+        codes = array(self._codes.typecode if hasattr(self._codes, 'typecode')
+                      else self._codes.format, self._codes)
+        if sys.byteorder != 'little':
+            codes.byteswap()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, codes.itemsize, 0,
+                                 len(header)))
+            f.write(header)
+            f.write(b'\0' * pad)
+            codes.tofile(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, fingerprint, length=None):
+        '''Map a column written by save() if it exists and was read from data
+        with the given fingerprint, otherwise return None. A file which is
+        truncated or corrupt, or which does not have length codes if length
+        is given, is treated as missing.
+        '''
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        view = memoryview(mapped)
+        try:
+            magic, version, itemsize, _, header_len = \
+                _PREFIX.unpack_from(view)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError('not a column file of this version')
+            pos = _PREFIX.size
+            header = json.loads(
+                bytes(view[pos:pos + header_len]).decode('utf-8'))
+            if header['fingerprint'] != fingerprint:
+                raise ValueError('column of other data')
+            values = [None] + header['values']
+            pos += header_len
+            pos += -pos % 8
+            typecode = _TYPECODES[itemsize]
+            codes = view[pos:].cast(typecode)
+            if length is not None and len(codes) != length:
+                codes.release()
+                raise ValueError('column of another number of words')
+        except (struct.error, ValueError, KeyError, TypeError):
+            # ValueError covers the JSON and UTF-8 errors
+            view.release()
+            mapped.close()
+            return None
+        if sys.byteorder != 'little' and itemsize > 1:
+            codes = array(typecode, codes)
+            codes.byteswap()
+        return cls(values, codes)
+
+def corpus_column(work, suffix, values):
+    '''
+    Return a Column with a value for every word of a corpus, mapped from the
+    file beside the word cache if it was built from the current data,
+    otherwise built and written there.
+
+    Parameters
+
+    work - the corpus identifier
+    suffix - the end of the file name, see etcbc.corpus_file_name()
+    values - a function returning an iterable of the value at each word
+    '''
+    path = corpus_file_name(work, suffix)
+    try:
+        cache = get_word_cache(work)
+        fp = cache.fingerprint
+    except OSError:
+        # no word cache, so nowhere to keep the column either
+        fp = None
+    if fp is not None:
+        column = Column.load(path, fp, cache.word_count())
+        if column is not None:
+            return column
+    column = Column.from_values(values())
+    if fp is not None:
+        try:
+            column.save(path, fp)
+        except OSError:
+            pass
+    return column
+
+class FeatureIndex():
+    '''
+    The columns of the features of one corpus, read as they are first used.
+
+    Parameters
+
+    work - the corpus identifier
+    columns - columns to start with, by feature name
+    lexeme_columns - columns of lexeme features to start with, by feature
+                     name, each with a value per code of the lexeme feature
+                     of the words
+    '''
+
+    def __init__(self, work=Corpus.HEBREW, columns=None, lexeme_columns=None):
+        self._work = work
+        self._columns = dict(columns or {})
+        self._lexeme_columns = dict(lexeme_columns or {})
+
+    def feature_name(self, name):
+        '''Return the TF feature name for a feature name or alias.'''
+        aliases = ALIASES.get(self._work, {})
+        if name not in aliases and \
+                any(name in a for a in ALIASES.values()):
+            raise Exception(f'{name} is not defined for this corpus, use the '
+                            'name of one of its TF features')
+        return aliases.get(name, name)
+
+    def column(self, name):
+        '''Return the Column of a feature, loading it if need be.'''
+        feature = self.feature_name(name)
+        column = self._columns.get(feature)
+        if column is None:
+            column = self._load_column(feature)
+            self._columns[feature] = column
+        return column
+
+    def _load_column(self, feature):
+        def values():
+            api = load_features([feature], work=self._work)
+            values = api.Fs(feature)
+            if values is None:
+                raise Exception(f'{feature} is not a feature of the corpus')
+            return (values.v(s) for s in range(1, api.F.otype.maxSlot + 1))
+        return corpus_column(self._work, f'.{feature}.pzfc', values)
+
+    def is_lexeme_feature(self, name):
+        '''True if a feature is of the lexemes rather than the words.'''
+        lexeme = LEXEME_FEATURES.get(self._work)
+        return lexeme is not None and self.feature_name(name) in lexeme[2]
+
+    def lexeme_column(self, name):
+        '''Return the column of a lexeme feature, with the value for each
+        code of the lexeme feature of the words, loading it if need be.
+        '''
+        feature = self.feature_name(name)
+        column = self._lexeme_columns.get(feature)
+        if column is None:
+            column = self._load_lexeme_column(feature)
+            self._lexeme_columns[feature] = column
+        return column
+
+    def _load_lexeme_column(self, feature):
+        link, lexeme_type, _ = LEXEME_FEATURES[self._work]
+        lexemes = self.column(link)
+        def values():
+            api = load_features([link, feature], work=self._work)
+            names, values = api.Fs(link), api.Fs(feature)
+            if values is None:
+                raise Exception(f'{feature} is not a feature of the corpus')
+            by_lexeme = {names.v(n): values.v(n)
+                         for n in api.F.otype.s(lexeme_type)}
+            return (by_lexeme.get(v) for v in lexemes.values)
+        return corpus_column(self._work, f'.{feature}.lexemes.pzfc', values)
+
+    def values_in(self, name, spans):
+        '''Return the list of the values of a feature at the words within the
+        (first, end) spans, in order.
+        '''
+        values = []
+        if self.is_lexeme_feature(name):
+            lexemes = self.column(LEXEME_FEATURES[self._work][0])
+            column = self.lexeme_column(name)
+            for first, end in spans:
+                values.extend(column.values_at(lexemes.codes_in(first, end)))
+        else:
+            column = self.column(name)
+            for first, end in spans:
+                values.extend(column.values_in(first, end))
+        return values
+
+    def mask(self, **criteria):
+        '''Return the bitmap of the words meeting all the criteria.'''
+        bitmap = None
+        for name, values in criteria.items():
+            m = self.column(name).mask(values)
+            bitmap = m if bitmap is None else bitmap & m
+            if not bitmap:
+                break
+        return bitmap
+
+    def select_spans(self, spans, **criteria):
+        '''Return the indexes, in order, of the words within the (first, end)
+        spans which meet all the criteria.
+        '''
+        bitmap = self.mask(**criteria)
+        indexes = []
+        for first, end in spans:
+            if bitmap is None:
+                indexes.extend(range(first, end))
+            elif bitmap:
+                indexes.extend(_positions(
+                    (bitmap >> first) & ((1 << (end - first)) - 1), first))
+        return indexes
+
+# The feature indexes of the corpora, by corpus
+indexes = dict()
+
+def get_feature_index(work=Corpus.HEBREW):
+    '''Return the shared FeatureIndex of a corpus.'''
+    index = indexes.get(work)
+    if index is None:
+        index = indexes[work] = FeatureIndex(work)
+    return index
+
+def select_words(*ranges, work=Corpus.HEBREW, **criteria):
+    '''
+    Return the words of a corpus in the given ranges, in order, which meet
+    all the criteria.
+
+    Parameters
+        ranges is a list of ranges as accepted by etcbc.iter_words
+        work is the corpus identifier
+        criteria are feature=value or feature=(value, ...) keyword arguments
+    '''
+    index = get_feature_index(work)
+    return words_at(index.select_spans(word_spans(*ranges, work=work),
+                                       **criteria), work=work)
+
+def get_word_records(refs, features=(WORD,), work=Corpus.HEBREW):
+    '''
+    Return a record for each word of a corpus in the given ranges, in order,
+    a dictionary of each feature asked for to its value at the word.
+
+    Parameters
+        refs is a list of ranges as accepted by etcbc.iter_words
+        features is a list of feature names, WORD for the word itself and
+            otherwise TF feature names or the aliases in ALIASES. The
+            records use the names as given.
+        work is the corpus identifier
+    '''
+    index = get_feature_index(work)
+    spans = word_spans(*refs, work=work)
+    columns = []
+    for name in features:
+        if name == WORD:
+            columns.append(list(iter_words(*refs, work=work)))
+        else:
+            columns.append(index.values_in(name, spans))
+    return [dict(zip(features, values)) for values in zip(*columns)]
+
+def records_to_json(records):
+    '''
+    Return word records as a JSON list, of the words alone if the records
+    have no other feature and otherwise of objects with the same names as
+    the records.
+    '''
+    if all(list(r) == [WORD] for r in records):
+        return json.dumps([r[WORD] for r in records], ensure_ascii=False)
+    return json.dumps(records, ensure_ascii=False)
@@ -3,9 +3,13 @@ Created on Feb 5, 2017
 
 @author: Daniel
 '''
+import gc
 import unittest
-from puzzles.core.etcbc import get_words
-from puzzles.core.etcbc import Corpus
+from types import SimpleNamespace
+from unittest import mock
+from puzzles.core import etcbc
+from puzzles.core.etcbc import get_words, iter_words
+from puzzles.core.etcbc import Corpus, CorpusRegistry
 
 class Test(unittest.TestCase):
 
@@ -44,6 +48,79 @@ class Test(unittest.TestCase):
                           'Ἀράμ'],
                          'incorrect words retrieved')
        
+    def testIterWordsRanges(self):
+        verses = get_words(('Genesis', 1, 1),('Genesis', 1, 2),('Genesis', 1, 3))
+        self.assertEqual(list(iter_words((('Genesis', 1, 1),
+                                          ('Genesis', 1, 3)))),
+                         verses, 'verse range differs from its verses')
+
+        chapter = list(iter_words(('Genesis', 1)))
+        self.assertEqual(chapter[:len(verses)], verses,
+                         'chapter does not start with its first verses')
+        self.assertEqual(list(iter_words((('Genesis', 1), ('Genesis', 2)))),
+                         chapter + list(iter_words(('Genesis', 2))),
+                         'chapter range differs from its chapters')
+
+        book = iter_words(('Matthew',), work=Corpus.GREEK)
+        self.assertEqual(next(book), 'Βίβλος', 'incorrect first word of book')
+
+class FakeRegistry(CorpusRegistry):
+    '''A registry of corpora which grow the process by a set size, in place
+    of loading TF.
+    '''
+
+    rss = 0
+    sizes = {Corpus.HEBREW: 300, Corpus.GREEK: 100}
+
+    def _load(self, work):
+        FakeRegistry.rss += self.sizes[work]
+        api = SimpleNamespace(F=SimpleNamespace())
+        def load(features, add, silent):
+            for f in features:
+                setattr(api.F, f, f)
+                FakeRegistry.rss += 10
+        return SimpleNamespace(load=load), api
+
+@mock.patch.object(etcbc, '_rss', lambda: FakeRegistry.rss)
+class RegistryTest(unittest.TestCase):
+
+    def testMemoryUse(self):
+        registry = FakeRegistry()
+        api = registry.api(Corpus.GREEK)
+        self.assertIs(registry.api(Corpus.GREEK), api)
+        self.assertIs(registry.load_features(['sp', 'gn'], Corpus.GREEK), api)
+        self.assertEqual(api.F.sp, 'sp')
+        registry.api(Corpus.HEBREW)
+        self.assertEqual(registry.memory_use(),
+                         {Corpus.GREEK: 120, Corpus.HEBREW: 300})
+
+    def testEviction(self):
+        registry = FakeRegistry(memory_limit=450)
+        registry.api(Corpus.GREEK)
+        registry.api(Corpus.HEBREW)
+        self.assertEqual(registry.loaded(), [Corpus.GREEK, Corpus.HEBREW])
+
+        # Greek is used last, so Hebrew goes when Greek grows past the limit
+        registry.load_features(['a', 'b', 'c', 'd', 'e', 'f'], Corpus.GREEK)
+        self.assertEqual(registry.loaded(), [Corpus.GREEK])
+
+        # Hebrew was measured before, so Greek makes room before it loads
+        registry.api(Corpus.HEBREW)
+        self.assertEqual(registry.loaded(), [Corpus.HEBREW])
+        self.assertNotIn(Corpus.GREEK, registry)
+
+    @unittest.skipUnless(hasattr(gc, 'freeze'), 'gc.freeze is not available')
+    def testShare(self):
+        registry = FakeRegistry()
+        registry.api(Corpus.GREEK)
+        registry.share()
+        try:
+            self.assertGreater(gc.get_freeze_count(), 0)
+        finally:
+            registry.unshare()
+        # nothing made after the workers start is kept frozen
+        self.assertEqual(gc.get_freeze_count(), 0)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
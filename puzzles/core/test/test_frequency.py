@@ -0,0 +1,59 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import os
+import tempfile
+import unittest
+from random import Random
+from puzzles.core.frequency import FrequencyTable
+from puzzles.core.normalize import CONSONANTAL, consonantal
+
+class Test(unittest.TestCase):
+
+    def testCounts(self):
+        table = FrequencyTable.from_words(['בְּ', 'רֵאשִׁ֖ית', 'בָּרָ֣א', 'בְּ'])
+
+        # most frequent first, in grapheme order among equals
+        self.assertEqual(table.graphemes[:2], ['א', 'בְּ'])
+        self.assertEqual(table.counts[:3], [2, 2, 1])
+        self.assertEqual(table.cum_weights[-1], 10)
+        self.assertAlmostEqual(table.frequency('א'), 2 / 10)
+        self.assertEqual(table.frequency('ג'), 0.0)
+
+    def testConsonantal(self):
+        self.assertEqual(consonantal('שִׁ'), 'ש')
+        self.assertEqual(consonantal('ὶ'), 'ι')
+        table = FrequencyTable.from_words(['בְּ', 'רֵאשִׁ֖ית', 'בָּרָ֣א', 'בְּ'],
+                                          CONSONANTAL)
+        self.assertEqual(dict(zip(table.graphemes, table.counts)),
+                         {'ב': 3, 'ר': 2, 'א': 2, 'ש': 1, 'י': 1, 'ת': 1})
+        self.assertRaises(Exception, FrequencyTable.from_words, ['α'],
+                          'unknown')
+
+    def testSample(self):
+        table = FrequencyTable({'α': 90, 'β': 10})
+        drawn = table.sample(Random(1), 10000)
+
+        self.assertEqual(drawn, table.sample(Random(1), 10000),
+                         'sample not reproducible from its seed')
+        self.assertGreater(drawn.count('α'), 8500)
+        self.assertGreater(drawn.count('β'), 500)
+
+    def testSaveLoad(self):
+        table = FrequencyTable({'α': 3, 'β': 1})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache', 'greek.freq.json')
+            table.save(path, 'fp1')
+
+            loaded = FrequencyTable.load(path, 'fp1')
+            self.assertEqual(loaded.graphemes, table.graphemes)
+            self.assertEqual(loaded.counts, table.counts)
+            self.assertIsNone(FrequencyTable.load(path, 'fp2'),
+                              'table for other data loaded')
+            self.assertIsNone(FrequencyTable.load(path + '.missing', 'fp1'))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,48 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from uniseg.graphemecluster import grapheme_clusters
+from puzzles.core.graphemes import graphemes, grapheme_count, cache_clear
+
+WORDS = ['בְּ', 'רֵאשִׁ֖ית', 'בָּרָ֣א', 'אֱלֹהִ֑ים', 'שָּׁמַ֖יִם', 'אָֽרֶץ',
+         'Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'Χριστοῦ', 'υἱοῦ', 'Δαυὶδ',
+         'Ἀβραάμ', 'word', '']
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        cache_clear()
+
+    def testMatchesUniseg(self):
+        for w in WORDS:
+            self.assertEqual(graphemes(w), tuple(grapheme_clusters(w)), w)
+
+    def testHebrew(self):
+        self.assertEqual(graphemes('רֵאשִׁ֖ית'), ('רֵ', 'א', 'שִׁ֖', 'י', 'ת'))
+        self.assertEqual(grapheme_count('בָּרָ֣א'), 3)
+
+    def testGreek(self):
+        self.assertEqual(graphemes('Ἰησοῦ'), ('Ἰ', 'η', 'σ', 'ο', 'ῦ'))
+        self.assertEqual(graphemes('Δαυὶδ'), ('Δ', 'α', 'υ', 'ὶ', 'δ'))
+
+    def testFallback(self):
+        # Characters outside the fast path are segmented by uniseg
+        for w in ['\uac01', 'a\u00adb', 'x\r\ny', '\U0001f44d\U0001f3fd']:
+            self.assertEqual(graphemes(w), tuple(grapheme_clusters(w)), repr(w))
+
+    def testCached(self):
+        self.assertIs(graphemes('Χριστοῦ'), graphemes('Χριστοῦ'))
+
+    def testThreads(self):
+        expected = [tuple(grapheme_clusters(w)) for w in WORDS] * 50
+        with ThreadPoolExecutor(8) as pool:
+            got = list(pool.map(graphemes, WORDS * 50))
+        self.assertEqual(got, expected)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
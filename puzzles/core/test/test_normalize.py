@@ -0,0 +1,46 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import unittest
+from unittest import mock
+from puzzles.core import normalize as nz
+from puzzles.core.etcbc import Corpus
+from puzzles.core.normalize import CONSONANTAL, POINTED, UNACCENTED, \
+    get_forms, normalize
+from puzzles.core.query import Column
+
+class Test(unittest.TestCase):
+
+    def testHebrew(self):
+        word = 'בְּרֵאשִׁ֖ית'
+        self.assertEqual(normalize(word), word)
+        self.assertEqual(normalize(word, POINTED), word)
+        self.assertEqual(normalize(word, UNACCENTED), 'בְּרֵאשִׁית')
+        self.assertEqual(normalize(word, CONSONANTAL), 'בראשית')
+        # meteg goes with the accents, the vowels stay
+        self.assertEqual(normalize('הָֽאָרֶץ', UNACCENTED), 'הָאָרֶץ')
+
+    def testGreek(self):
+        # breathings, diaeresis and iota subscript are not accents
+        self.assertEqual(normalize('υἱοῦ', UNACCENTED), 'υἱου')
+        self.assertEqual(normalize('Ἰησοῦ', CONSONANTAL), 'Ιησου')
+        self.assertEqual(normalize('ἀρχῇ', UNACCENTED), 'ἀρχῃ')
+        self.assertEqual(normalize('ἀρχῇ', CONSONANTAL), 'αρχη')
+        self.assertEqual(normalize('Δαυὶδ', UNACCENTED), 'Δαυιδ')
+        self.assertRaises(Exception, normalize, 'λόγος', 'unknown')
+
+    def testForms(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'Χριστοῦ', 'υἱοῦ']
+        column = Column.from_values(normalize(w, CONSONANTAL) for w in words)
+        with mock.patch.dict(nz.forms, {(Corpus.GREEK, CONSONANTAL): column}), \
+                mock.patch('puzzles.core.etcbc.word_spans',
+                           return_value=[(0, 1), (2, 5)]):
+            self.assertEqual(get_forms(('Matthew', 1, 1), work=Corpus.GREEK,
+                                       form=CONSONANTAL),
+                             ['Βιβλος', 'Ιησου', 'Χριστου', 'υιου'])
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
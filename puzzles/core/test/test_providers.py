@@ -0,0 +1,92 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from puzzles.core import providers
+from puzzles.core.normalize import CONSONANTAL
+from puzzles.core.providers import MarkupProvider, SourceCache, \
+    TextProvider, WordProvider, get_provider, tokenize
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        providers.clear_results()
+
+    def testTokenize(self):
+        self.assertEqual(tokenize('וְאֵ֥ת הָאָֽרֶץ׃ עַל־פְּנֵ֥י'),
+                         ['וְאֵ֥ת', 'הָאָֽרֶץ', 'עַל', 'פְּנֵ֥י'])
+        self.assertEqual(tokenize('ὁ λόγος, πρὸς τὸν θεόν. δι’ αὐτοῦ 12'),
+                         ['ὁ', 'λόγος', 'πρὸς', 'τὸν', 'θεόν', 'δι’',
+                          'αὐτοῦ'])
+
+    def testText(self):
+        provider = TextProvider()
+        text = 'Ἐν ἀρχῇ ἦν ὁ λόγος'
+        self.assertEqual(provider.get_words(text, CONSONANTAL),
+                         ['Εν', 'αρχη', 'ην', 'ο', 'λογος'])
+        # a second provider finds the words in the shared cache
+        with mock.patch.object(TextProvider, 'iter_words') as iter_words:
+            self.assertEqual(TextProvider().get_words(text, CONSONANTAL),
+                             ['Εν', 'αρχη', 'ην', 'ο', 'λογος'])
+            iter_words.assert_not_called()
+        self.assertIs(get_provider('text'), get_provider('text'))
+        self.assertRaises(Exception, get_provider, 'LXX')
+
+    def testIncompleteProvider(self):
+        class NoWords(WordProvider):
+            pass
+        self.assertRaises(TypeError, NoWords, ('none',))
+
+    def testSourceCache(self):
+        cache = SourceCache(tuple, size=2)
+        text = get_provider('text')
+        first = cache.get(text, 'ὁ λόγος')
+        self.assertEqual(first, ('ὁ', 'λόγος'))
+        self.assertIs(cache.get(text, 'ὁ λόγος'), first)
+        self.assertEqual(cache.get(text, 'ὁ λόγος', CONSONANTAL),
+                         ('ο', 'λογος'))
+        # the least recently used source is dropped
+        cache.get(text, 'ἐν ἀρχῇ')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNot(cache.get(text, 'ὁ λόγος'), first)
+        # sources which are not cached are built every time
+        source = io.BytesIO('<p>ὁ λόγος</p>'.encode())
+        self.assertEqual(cache.get(MarkupProvider(), source),
+                         ('ὁ', 'λόγος'))
+        self.assertEqual(len(cache), 2)
+
+    def testMarkup(self):
+        doc = ('<?xml version="1.0"?><t xmlns="urn:t"><v n="1">1 '
+               '<w>λόγος</w> καὶ<w>θεὸς</w><note>ἦν</note></v></t>')
+        self.assertEqual(MarkupProvider(tags={'w'}).get_words(doc),
+                         ['λόγος', 'θεὸς'])
+        self.assertEqual(MarkupProvider().get_words(doc),
+                         ['λόγος', 'καὶ', 'θεὸς', 'ἦν'])
+
+        fragment = '<p>In the <b>beginning</b></p><script>x</script><p>was</p>'
+        provider = MarkupProvider(fragment=True)
+        self.assertEqual(provider.get_words(fragment),
+                         ['In', 'the', 'beginning', 'was'])
+        self.assertEqual(provider.get_words(io.BytesIO(fragment.encode())),
+                         ['In', 'the', 'beginning', 'was'])
+
+    def testMarkupFile(self):
+        provider = MarkupProvider(tags={'w'}, fragment=True)
+        provider.CHUNK_SIZE = 7
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'words.xml')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('<w>ἀρχῇ</w>\n' * 1000)
+            words = provider.get_words(path)
+            self.assertEqual(words, ['ἀρχῇ'] * 1000)
+            self.assertEqual(len(providers._results), 1)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
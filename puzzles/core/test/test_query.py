@@ -0,0 +1,121 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from puzzles.core import query
+from puzzles.core.etcbc import Corpus
+from puzzles.core.query import Column, FeatureIndex, get_word_records, \
+    records_to_json
+
+class Test(unittest.TestCase):
+
+    sp = ['prep', 'subs', 'verb', 'nmpr', 'subs', None, 'nmpr', 'verb']
+    gn = ['NA', 'm', 'm', 'm', 'f', None, 'f', 'm']
+
+    def setUp(self):
+        self.index = FeatureIndex(Corpus.HEBREW,
+                                  {'sp': Column.from_values(self.sp),
+                                   'gn': Column.from_values(self.gn)})
+
+    def testBitmap(self):
+        column = Column.from_values(self.sp)
+        self.assertEqual(column.bitmap('nmpr'), 0b01001000)
+        self.assertEqual(column.bitmap('adjv'), 0)
+        self.assertEqual(column.mask(('subs', 'verb')), 0b10010110)
+        self.assertEqual(column.value(5), None)
+
+        # more than a byte of values, codes sharing a byte with others
+        column = Column.from_values(list(range(300)) * 2)
+        self.assertEqual(column.bitmap(299), (1 << 299) | (1 << 599))
+        self.assertEqual(column.bitmap(43), (1 << 43) | (1 << 343))
+        self.assertEqual(column.bitmap(255), (1 << 255) | (1 << 555))
+        column = Column.from_values([i % 70000 for i in range(70003)])
+        self.assertEqual(column.bitmap(2), (1 << 2) | (1 << 70002))
+
+    def testSelect(self):
+        self.assertEqual(self.index.select_spans([(0, 8)], pos='nmpr'),
+                         [3, 6])
+        self.assertEqual(self.index.select_spans([(0, 4), (6, 8)],
+                                                 sp=('subs', 'verb'),
+                                                 gender='m'), [1, 2, 7])
+        self.assertEqual(self.index.select_spans([(2, 5)]), [2, 3, 4])
+        self.assertEqual(self.index.select_spans([(0, 8)], pos='adjv',
+                                                 gender='m'), [])
+
+        # the aliases are of the Hebrew features only
+        index = FeatureIndex(Corpus.GREEK,
+                             {'sp': Column.from_values(self.sp)})
+        self.assertEqual(index.select_spans([(0, 8)], sp='nmpr'), [3, 6])
+        with self.assertRaises(Exception):
+            index.select_spans([(0, 8)], pos='nmpr')
+
+    def testRecords(self):
+        words = ['בְּ', 'רֵאשִׁית', 'בָּרָא', 'אֱלֹהִים', 'אֵת', 'הַ', 'שָּׁמַיִם']
+        lex = ['B', 'R>CJT/', 'BR>[', '>LHJM/', '>T', 'H', 'CMJM/']
+        glosses = {'B': 'in', 'R>CJT/': 'beginning', 'BR>[': 'create',
+                   '>LHJM/': 'god(s)', '>T': '<object marker>',
+                   'CMJM/': 'heavens'}
+        lexemes = Column.from_values(lex)
+        index = FeatureIndex(Corpus.HEBREW, {'lex': lexemes},
+                             {'gloss': Column.from_values(
+                                 glosses.get(v) for v in lexemes.values)})
+        self.assertEqual(index.values_in('gloss', [(1, 3), (4, 6)]),
+                         ['beginning', 'create', '<object marker>', None])
+
+        with mock.patch.dict(query.indexes, {Corpus.HEBREW: index}), \
+                mock.patch('puzzles.core.query.word_spans',
+                           return_value=[(1, 4)]), \
+                mock.patch('puzzles.core.query.iter_words',
+                           return_value=iter(words[1:4])):
+            records = get_word_records([('Genesis', 1, 1)],
+                                       ['word', 'lexeme', 'gloss'])
+        self.assertEqual(records[2], {'word': 'אֱלֹהִים', 'lexeme': '>LHJM/',
+                                      'gloss': 'god(s)'})
+        self.assertEqual(json.loads(records_to_json(records)), records)
+        self.assertEqual(json.loads(records_to_json([{'word': 'אֵת'}])),
+                         ['אֵת'])
+
+    def testSaveLoad(self):
+        column = Column.from_values(self.sp)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sp.pzfc')
+            column.save(path, 'abc')
+            self.assertIsNone(Column.load(path, 'other'))
+            loaded = Column.load(path, 'abc')
+            self.assertEqual(loaded.values, column.values)
+            self.assertEqual([loaded.value(i) for i in range(len(loaded))],
+                             self.sp)
+            self.assertEqual(loaded.bitmap('subs'), column.bitmap('subs'))
+            loaded = None
+        self.assertIsNone(Column.load(path, 'abc'))
+
+    def testLoadCorrupt(self):
+        column = Column.from_values(self.sp)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sp.pzfc')
+            column.save(path, 'abc')
+            with open(path, 'rb') as f:
+                data = f.read()
+            # truncated in the prefix, in the header, and a bad header
+            for corrupt in [data[:6], data[:20], data[:12] + b'{' * 20]:
+                with open(path, 'wb') as f:
+                    f.write(corrupt)
+                self.assertIsNone(Column.load(path, 'abc'), corrupt)
+            # the file is closed, so it can be rebuilt in place
+            column.save(path, 'abc')
+            self.assertIsNotNone(Column.load(path, 'abc', len(self.sp)))
+            # well formed but of another number of words
+            self.assertIsNone(Column.load(path, 'abc', len(self.sp) + 1))
+            Column.from_values(self.sp[:-1]).save(path, 'abc')
+            self.assertIsNone(Column.load(path, 'abc', len(self.sp)))
+            os.remove(path)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
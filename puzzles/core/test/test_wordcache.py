@@ -0,0 +1,83 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import os
+import tempfile
+import time
+import unittest
+from puzzles.core.wordcache import WordCache, build, fingerprint
+
+VERSES = [(('Genesis', 1, 1), ['בְּ', 'רֵאשִׁ֖ית', 'בָּרָ֣א']),
+          (('Genesis', 1, 2), ['וְ', '', 'אָ֗רֶץ']),
+          (('Genesis', 2, 1), ['וַ', 'יְכֻלּ֛וּ']),
+          (('Exodus', 1, 1), ['וְ', 'אֵ֗לֶּה'])]
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache', 'words.pzwc')
+        build(self.path, 'fp1', VERSES)
+        self.cache = WordCache.open(self.path, 'fp1')
+
+    def tearDown(self):
+        self.cache = None
+        self.tmp.cleanup()
+
+    def testVerseWords(self):
+        self.assertEqual(self.cache.verse_words('Genesis', 1, 2),
+                         ['וְ', '', 'אָ֗רֶץ'], 'incorrect words retrieved')
+        self.assertEqual(self.cache.verse_words('Exodus', 1, 1),
+                         ['וְ', 'אֵ֗לֶּה'], 'incorrect words retrieved')
+        self.assertRaises(KeyError, self.cache.verse_words, 'Genesis', 1, 3)
+        self.assertRaises(KeyError, self.cache.verse_words, 'Leviticus', 1, 1)
+
+    def testSpans(self):
+        self.assertEqual(self.cache.chapter_span('Genesis', 1), (0, 6))
+        self.assertEqual(self.cache.book_span('Genesis'), (0, 8))
+        self.assertEqual(self.cache.section_span(('Exodus',)), (8, 10))
+        self.assertEqual(self.cache.word_count(), 10)
+        self.assertEqual(self.cache.word(9), 'אֵ֗לֶּה')
+        self.assertEqual(self.cache.words(*self.cache.chapter_span('Genesis', 2)),
+                         ['וַ', 'יְכֻלּ֛וּ'], 'incorrect words retrieved')
+        self.assertEqual(self.cache.books(), ['Genesis', 'Exodus'])
+
+    def testTruncatedCache(self):
+        self.cache = None
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        for corrupt in [data[:3], data[:20], data[:-1], data[:-7],
+                        data + b'\0', b'\0' * len(data)]:
+            with open(self.path, 'wb') as f:
+                f.write(corrupt)
+            self.assertIsNone(WordCache.open(self.path, 'fp1'),
+                              f'{len(corrupt)} bytes opened as a cache')
+        # the file is closed, so the cache can be rebuilt in place
+        build(self.path, 'fp1', VERSES)
+        self.assertEqual(WordCache.open(self.path, 'fp1').word_count(), 10)
+
+    def testStaleCache(self):
+        self.assertIsNone(WordCache.open(self.path, 'fp2'),
+                          'cache with another fingerprint should not open')
+        self.assertIsNone(WordCache.open(self.path + '.missing', 'fp1'),
+                          'missing cache should not open')
+
+    def testFingerprint(self):
+        data_dir = os.path.join(self.tmp.name, 'data')
+        os.makedirs(data_dir)
+        feature = os.path.join(data_dir, 'g_word_utf8.tf')
+        with open(feature, 'w') as f:
+            f.write('@node\n')
+        fp = fingerprint(data_dir)
+        self.assertEqual(fp, fingerprint(data_dir), 'fingerprint not stable')
+        with open(feature, 'a') as f:
+            f.write('word\n')
+        os.utime(feature, ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertNotEqual(fp, fingerprint(data_dir),
+                            'fingerprint did not change with the data')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,274 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+A persistent, memory-mapped index of the words of each verse of a corpus.
+
+Loading a Text-Fabric corpus takes seconds, which every new process would pay
+before it could return the words of a single verse. The cache is built once
+from Text-Fabric and written to disk. Reading it needs no Text-Fabric at all,
+only an mmap of the file, so lookups are available within milliseconds of
+process start.
+
+File layout, all integers little-endian:
+
+    magic            4 bytes  b'PZWC'
+    format version   uint16
+    reserved         uint16
+    header length    uint32
+    header           UTF-8 JSON: fingerprint, books, n_verses, n_words,
+                     blob_len
+    padding          to a multiple of 8 bytes
+    verse keys       uint64 x n_verses, (book << 32 | chapter << 16 | verse)
+                     where book is the index in the books list, in corpus
+                     order and therefore ascending
+    verse starts     uint32 x (n_verses + 1), index of each verse's first word
+    word offsets     uint32 x (n_words + 1), byte offset of each word in blob
+    blob             the UTF-8 encoded words concatenated
+'''
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+MAGIC = b'PZWC'
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct('<4sHHI')
+
+def fingerprint(data_dir):
+    '''Compute a fingerprint of the Text-Fabric data in data_dir from the
+    names, sizes and modification times of its feature files. Any change to
+    the data, including installing a new version of it, changes the
+    fingerprint. Only the file system is consulted so this is cheap.
+    '''
+    entries = []
+    for root, dirs, files in os.walk(data_dir):
+        # skip hidden directories, such as the TF binary cache and ours
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for f in sorted(files):
+            if f.endswith('.tf'):
+                st = os.stat(os.path.join(root, f))
+                entries.append(f'{os.path.relpath(os.path.join(root, f), data_dir)}'
+                               f':{st.st_size}:{st.st_mtime_ns}')
+    if not entries:
+        raise FileNotFoundError(f'no Text-Fabric features in {data_dir}')
+    return hashlib.sha1('\n'.join(entries).encode('utf-8')).hexdigest()
+
+def _key(book_id, chapter, verse):
+    return (book_id << 32) | (chapter << 16) | verse
+
+def build(path, fingerprint, verses):
+    '''Write a cache file.
+
+    Parameters
+
+    path - the file to write. It is written to a temporary file first and
+           then renamed into place so readers never see a partial file.
+    fingerprint - the fingerprint of the data the cache is built from
+    verses - an iterable of ((book, chapter, verse), words) in corpus order
+    '''
+    books = []
+    book_ids = dict()
+    keys = array('Q')
+    starts = array('I', [0])
+    offsets = array('I', [0])
+    blob = bytearray()
+    for (book, chapter, verse), words in verses:
+        book_id = book_ids.get(book)
+        if book_id is None:
+            book_id = book_ids[book] = len(books)
+            books.append(book)
+        keys.append(_key(book_id, chapter, verse))
+        for w in words:
+            blob += w.encode('utf-8')
+            offsets.append(len(blob))
+        starts.append(len(offsets) - 1)
+
+    header = json.dumps({'fingerprint': fingerprint,
+                         'books': books,
+                         'n_verses': len(keys),
+                         'n_words': len(offsets) - 1,
+                         'blob_len': len(blob)}).encode('utf-8')
+    pad = -(_PREFIX.size + len(header)) % 8
+
+    for a in (keys, starts, offsets):
+        if sys.byteorder != 'little':
+            a.byteswap()
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, 0, len(header)))
+        f.write(header)
+        f.write(b'\0' * pad)
+        keys.tofile(f)
+        starts.tofile(f)
+        offsets.tofile(f)
+        f.write(blob)
+    os.replace(tmp, path)
+
+class WordCache():
+    '''
+    A read-only view of a cache file. Nothing is read from the file beyond
+    its header until a lookup touches it.
+
+    Use WordCache.open() rather than the constructor to get None for a
+    missing, out of date, truncated or corrupt cache. The constructor raises
+    ValueError for a file which is not a whole cache.
+
+    Parameters
+
+    path - the cache file
+    '''
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise ValueError('word cache requires a little-endian host')
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            self._read(path)
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            # ValueError covers the JSON and UTF-8 errors
+            for view in reversed(self._views):
+                view.release()
+            self._mmap.close()
+            raise ValueError(f'{path} is not a whole version '
+                             f'{FORMAT_VERSION} word cache') from e
+
+    def _read(self, path):
+        view = memoryview(self._mmap)
+        self._views.append(view)
+        magic, version, _, header_len = _PREFIX.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('not a word cache of this version')
+        pos = _PREFIX.size
+        if pos + header_len > len(view):
+            raise ValueError('truncated header')
+        header = json.loads(bytes(view[pos:pos + header_len]).decode('utf-8'))
+        pos += header_len
+        pos += -pos % 8
+
+        fingerprint = header['fingerprint']
+        books = {b: i for i, b in enumerate(header['books'])}
+        n_verses = header['n_verses']
+        n_words = header['n_words']
+        blob_len = header['blob_len']
+        if pos + 8 * n_verses + 4 * (n_verses + n_words + 2) + blob_len != \
+                len(view):
+            raise ValueError('sections do not match the file size')
+
+        def take(fmt, count):
+            nonlocal pos
+            size = struct.calcsize(fmt) * count
+            a = view[pos:pos + size].cast(fmt)
+            self._views.append(a)
+            pos += size
+            return a
+
+        self._keys = take('Q', n_verses)
+        self._starts = take('I', n_verses + 1)
+        self._offsets = take('I', n_words + 1)
+        self._blob = view[pos:pos + blob_len]
+        self._views.append(self._blob)
+        if self._starts[-1] != n_words or self._offsets[-1] != blob_len:
+            raise ValueError('sections do not match the header')
+        self.fingerprint = fingerprint
+        self._books = books
+
+    @classmethod
+    def open(cls, path, fingerprint):
+        '''Open the cache at path if it exists and was built from data with
+        the given fingerprint, otherwise return None.
+        '''
+        try:
+            cache = cls(path)
+        except (OSError, ValueError):
+            return None
+        if cache.fingerprint != fingerprint:
+            return None
+        return cache
+
+    def books(self):
+        '''Return the book names in corpus order.'''
+        return sorted(self._books, key=self._books.get)
+
+    def _book_id(self, book):
+        book_id = self._books.get(book)
+        if book_id is None:
+            raise KeyError(f'unknown book {book}')
+        return book_id
+
+    def _verse_range(self, lo_key, hi_key):
+        '''Return the word span of the verses with keys in [lo_key, hi_key).'''
+        lo = bisect_left(self._keys, lo_key)
+        hi = bisect_left(self._keys, hi_key, lo)
+        return self._starts[lo], self._starts[hi]
+
+    def verse_span(self, book, chapter, verse):
+        '''Return (first, end) word indexes of a verse.'''
+        book_id = self._book_id(book)
+        key = _key(book_id, chapter, verse)
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            raise KeyError(f'{book} {chapter}:{verse} not in corpus')
+        return self._starts[i], self._starts[i + 1]
+
+    def chapter_span(self, book, chapter):
+        '''Return (first, end) word indexes of a chapter.'''
+        book_id = self._book_id(book)
+        span = self._verse_range(_key(book_id, chapter, 0),
+                                 _key(book_id, chapter + 1, 0))
+        if span[0] == span[1]:
+            raise KeyError(f'{book} {chapter} not in corpus')
+        return span
+
+    def book_span(self, book):
+        '''Return (first, end) word indexes of a book.'''
+        book_id = self._book_id(book)
+        return self._verse_range(_key(book_id, 0, 0), _key(book_id + 1, 0, 0))
+
+    def section_span(self, section):
+        '''Return (first, end) word indexes of a (book,), (book, chapter) or
+        (book, chapter, verse) tuple.
+        '''
+        if len(section) == 3:
+            return self.verse_span(*section)
+        if len(section) == 2:
+            return self.chapter_span(*section)
+        if len(section) == 1:
+            return self.book_span(*section)
+        raise ValueError(f'invalid section {section}')
+
+    def word_count(self):
+        '''Return the number of words in the corpus.'''
+        return len(self._offsets) - 1
+
+    def iter_words(self, first, end):
+        '''Generate the words with indexes in [first, end).'''
+        offsets = self._offsets
+        blob = self._blob
+        start = offsets[first]
+        for i in range(first + 1, end + 1):
+            stop = offsets[i]
+            yield str(blob[start:stop], 'utf-8')
+            start = stop
+
+    def word(self, i):
+        '''Return the word with index i.'''
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+    def words(self, first, end):
+        '''Return the list of words with indexes in [first, end).'''
+        return list(self.iter_words(first, end))
+
+    def verse_words(self, book, chapter, verse):
+        '''Return the list of words in a verse.'''
+        return self.words(*self.verse_span(book, chapter, verse))
@@ -0,0 +1,231 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Counting puzzles, on the numeric values of the letters of Hebrew, gematria,
+and of Greek, isopsephy.
+
+A Numbering has a table of every character it knows to its value, worked out
+once when the numbering is defined. The letters have their values, the
+final forms, capitals and letters with accents or breathings of the Unicode
+blocks of the script the value of their bare letter, and the vowel points,
+accents and every other character 0. The value of a word is then the sum of
+the table lookups of its characters, with no normalization of the word, and
+the value of a passage is one count of the characters of all its words,
+done by collections.Counter in C, and a sum over the distinct characters.
+
+A ValueIndex maps each value to the words of a passage having it, so the
+words summing to N are one lookup, as are the pairs of words summing to N
+by a lookup per value. The words of passages are read through their word
+provider and the indexes of the most recently used passages kept in a
+providers.SourceCache.
+
+Puzzles
+
+    value - the value of a word is to be found
+    find  - the words of the passage with a value are to be found
+'''
+
+import json
+from collections import Counter
+from functools import partial
+from random import Random, getrandbits
+
+from puzzles.core.normalize import POINTED, consonantal
+from puzzles.core.providers import SourceCache, corpus_provider
+
+VALUE = 'value'
+FIND = 'find'
+KINDS = (VALUE, FIND)
+
+class _Table(dict):
+    '''A table of characters to values, 0 for those not in it.'''
+
+    def __missing__(self, c):
+        return 0
+
+class Numbering():
+    '''
+    A system of letter values.
+
+    Parameters
+
+    name - the name of the system
+    values - a dictionary of each letter, lower case where the script has
+             case, to its value
+    blocks - ranges of the codepoints of the script. Each character of them
+             whose bare lower case letter has a value is given that value,
+             and the others 0.
+    '''
+
+    def __init__(self, name, values, blocks=()):
+        self.name = name
+        self.letters = dict(values)
+        self._table = _Table(self.letters)
+        for block in blocks:
+            for c in map(chr, block):
+                if c not in self._table:
+                    self._table[c] = self.letters.get(consonantal(c).lower(),
+                                                      0)
+
+    def value(self, word):
+        '''Return the value of a word or grapheme, ignoring its points and
+        accents.
+        '''
+        return sum(map(self._table.__getitem__, word))
+
+    def values(self, words):
+        '''Return the list of the values of a list of words, each distinct
+        word being summed once.
+        '''
+        value = self.value
+        values = {w: value(w) for w in set(words)}
+        return [values[w] for w in words]
+
+    def total(self, words):
+        '''Return the value of all the words of a passage together.'''
+        counts = Counter(''.join(words))
+        table = self._table
+        return sum(table[c] * n for c, n in counts.items())
+
+    def totals(self, groups):
+        '''Return the totals of a list of groups of words, the verses of a
+        passage for example, as returned by a word provider for each verse.
+        '''
+        return [self.total(words) for words in groups]
+
+HEBREW_VALUES = dict(zip(
+    'אבגדהוזחטיכלמנסעפצקרשת',
+    [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 200,
+     300, 400]))
+HEBREW_VALUES.update({'ך': 20, 'ם': 40, 'ן': 50, 'ף': 80, 'ץ': 90})
+
+# The letters dropped from the alphabet keep their places as numerals,
+# stigma (or digamma) 6, koppa 90 and sampi 900
+GREEK_VALUES = dict(zip(
+    'αβγδεϛζηθικλμνξοπϙρστυφχψωϡ',
+    [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 200,
+     300, 400, 500, 600, 700, 800, 900]))
+GREEK_VALUES.update({'ς': 200, 'ϝ': 6, 'ϟ': 90})
+
+HEBREW = Numbering('hebrew', HEBREW_VALUES,
+                   blocks=(range(0x0590, 0x0600), range(0xFB1D, 0xFB50)))
+
+GREEK = Numbering('greek', GREEK_VALUES,
+                  blocks=(range(0x0300, 0x0400), range(0x1F00, 0x2000)))
+
+NUMBERINGS = {HEBREW.name: HEBREW, GREEK.name: GREEK}
+
+def get_numbering(name):
+    '''Return the Numbering of a name, hebrew or greek.'''
+    numbering = NUMBERINGS.get(name)
+    if numbering is None:
+        raise Exception(f'unknown numbering {name}')
+    return numbering
+
+class ValueIndex():
+    '''
+    The words of a vocabulary by their value.
+
+    Parameters
+
+    numbering - the Numbering giving the values
+    words - the words, in any order and with any repeats
+    '''
+
+    def __init__(self, numbering, words):
+        self._words = dict()
+        distinct = sorted({w for w in words if w})
+        for w, v in zip(distinct, numbering.values(distinct)):
+            if v:
+                self._words.setdefault(v, []).append(w)
+
+    def __len__(self):
+        return sum(len(ws) for ws in self._words.values())
+
+    def values(self):
+        '''Return the values with words, in order.'''
+        return sorted(self._words)
+
+    def words(self, value):
+        '''Return the words with a value, in order.'''
+        return list(self._words.get(value, ()))
+
+    def pairs(self, value):
+        '''Return the pairs of words, (a, b) with a before b, whose values sum
+        to value.
+        '''
+        pairs = []
+        for v, ws in self._words.items():
+            other = value - v
+            if other < v:
+                continue
+            for i, a in enumerate(ws):
+                for b in (ws[i + 1:] if other == v
+                          else self._words.get(other, ())):
+                    pairs.append((a, b))
+        return sorted(pairs)
+
+def make_puzzles(index, count, kind=VALUE, seed=None):
+    '''
+    Return a list of puzzles from the words of a ValueIndex, as
+    dictionaries, of kind
+
+        value - {"kind", "word", "answer"}, the answer being the value of the
+                word
+        find  - {"kind", "value", "answers"}, the answers being the words of
+                the index with the value
+
+    Parameters
+
+    index - the ValueIndex of the passage
+    count - the most puzzles to make. Each puzzle is of a different word or
+            value.
+    kind - VALUE or FIND
+    seed - the seed for the choice of the puzzles
+    '''
+    rng = Random(getrandbits(64) if seed is None else seed)
+    values = index.values()
+    if kind == VALUE:
+        words = [(w, v) for v in values for w in index.words(v)]
+        return [{'kind': VALUE, 'word': w, 'answer': v}
+                for w, v in rng.sample(words, min(count, len(words)))]
+    elif kind == FIND:
+        return [{'kind': FIND, 'value': v, 'answers': index.words(v)}
+                for v in rng.sample(values, min(count, len(values)))]
+    raise Exception(f'unknown kind of puzzle {kind}')
+
+def puzzles_to_json(puzzles):
+    '''Return puzzles from make_puzzles() as a JSON list.'''
+    return json.dumps(puzzles, ensure_ascii=False)
+
+# The value indexes of the passages used in this process, by numbering
+_indexes = {numbering: SourceCache(partial(ValueIndex, numbering))
+            for numbering in (HEBREW, GREEK)}
+
+def _corpus_numbering(work):
+    from puzzles.core.etcbc import Corpus
+    return GREEK if work == Corpus.GREEK else HEBREW
+
+def passage_index(*ranges, work=None, form=POINTED):
+    '''
+    Return the ValueIndex of the words of a passage, building it the first
+    time the passage is asked for.
+
+    Parameters
+        ranges is a list of ranges as accepted by etcbc.iter_words
+        work is the corpus identifier, by default Hebrew
+        form is one of puzzles.core.normalize.FORMS, deciding which words
+            are the same
+    '''
+    return _indexes[_corpus_numbering(work)].get(corpus_provider(work),
+                                                 ranges, form)
+
+def verse_totals(*verses, work=None):
+    '''Return the value of each of a list of verses, or of any ranges
+    accepted by etcbc.iter_words.
+    '''
+    provider = corpus_provider(work)
+    return _corpus_numbering(work).totals(provider.get_words((v,))
+                                          for v in verses)
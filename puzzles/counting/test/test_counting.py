@@ -0,0 +1,53 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import json
+import unittest
+from puzzles.counting.counting import FIND, GREEK, HEBREW, VALUE, \
+    ValueIndex, make_puzzles, puzzles_to_json
+
+class Test(unittest.TestCase):
+
+    words = 'Ἐν ἀρχῇ ἦν ὁ λόγος, καὶ ὁ λόγος ἦν πρὸς τὸν θεόν'.split()
+
+    def testValues(self):
+        # points, accents and the letter forms do not change the value
+        self.assertEqual(HEBREW.value('בְּרֵאשִׁ֖ית'), 913)
+        self.assertEqual(HEBREW.value('בראשית'), 913)
+        self.assertEqual(HEBREW.value('אֱלֹהִ֑ים'), 86)
+        self.assertEqual(GREEK.value('Ἰησοῦς'), 888)
+        self.assertEqual(GREEK.value('ΙΗΣΟΥΣ'), 888)
+        self.assertEqual(GREEK.value('λόγος,'), GREEK.value('λογοσ'))
+
+    def testTotals(self):
+        values = GREEK.values(self.words)
+        self.assertEqual(values[4], 373)
+        self.assertEqual(GREEK.total(self.words), sum(values))
+        self.assertEqual(GREEK.totals([self.words[:3], self.words[3:]]),
+                         [sum(values[:3]), sum(values[3:])])
+        self.assertEqual(GREEK.total([]), 0)
+
+    def testIndex(self):
+        index = ValueIndex(GREEK, self.words)
+        self.assertEqual(index.words(58), ['ἦν'])
+        self.assertEqual(index.words(59), [])
+        self.assertEqual(index.pairs(86), [('καὶ', 'Ἐν')])
+        self.assertEqual(len(index), 10)
+
+    def testPuzzles(self):
+        index = ValueIndex(GREEK, self.words)
+        puzzles = make_puzzles(index, 5, VALUE, seed=2)
+        self.assertEqual(puzzles, make_puzzles(index, 5, VALUE, seed=2))
+        self.assertEqual(len({p['word'] for p in puzzles}), 5)
+        for p in puzzles:
+            self.assertEqual(p['answer'], GREEK.value(p['word']))
+        for p in make_puzzles(index, 100, FIND, seed=2):
+            self.assertEqual(p['answers'], index.words(p['value']))
+        self.assertEqual(json.loads(puzzles_to_json(puzzles)), puzzles)
+        self.assertRaises(Exception, make_puzzles, index, 1, 'sum')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
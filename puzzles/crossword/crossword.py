@@ -0,0 +1,544 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Crossword generation from the words of a passage.
+
+The words are laid out across and down a grid of fixed size, interlocking
+where they share a grapheme, and every square no word runs through is a
+black square. As in a printed crossword every run of two or more letters
+across or down is a word, so a word may only touch another where it crosses
+it.
+
+The layout is built one word at a time on the Grid of the wordsearch. Each
+line of the grid, a row across or a column down, has the slots where a word
+could still go, those crossing a letter already on the grid and leaving no
+letter touching another except at a crossing, each with its domain, the
+bitmap from the CandidateIndex of the words which fit the letters it
+crosses. Placing a word changes only the lines through and beside it, so
+only the slots of those lines are worked out again, their domains narrowed
+to the words fitting the new letters, and the domains of every other line
+are kept.
+
+Each attempt is a depth first search. The slot with the fewest words to
+choose from is filled next, then the one crossing the most letters and the
+longest. A few of its words, drawn at random, are each placed in turn to see
+how many slots still have a word left afterwards, forward checking, and are
+tried in that order, most first. When no slot has a word left the search
+goes back to the last slot with words untried and tries the next, up to
+MAX_BACKTRACKS times an attempt. Attempts are made from the seed until
+every word is placed, STALE_ATTEMPTS attempts in a row find no better
+layout or the time budget runs out, and the layout placing the most words
+is kept. How much of the grid can be filled depends mostly on how many
+words of the vocabulary share letters, as two crossings of random letters
+seldom leave a word to fill a slot.
+
+Hebrew grids run right to left. Squares are worked in reading order, column
+0 being the first column read, and are turned round only for display, so
+(row, col) in the output is always as seen from the left.
+
+Clues are given as a dictionary of word to clue. passage_crossword() makes
+the crossword of a passage with the glosses of the words as the clues, or
+the values of any other feature from query.get_word_records().
+'''
+
+import html
+import json
+import time
+from random import Random, getrandbits
+
+from puzzles.core.graphemes import sorted_graphemes
+from puzzles.crossword.index import CandidateIndex
+from puzzles.wordsearch.grid import Grid
+
+ACROSS = 'across'
+DOWN = 'down'
+
+# (row, col) step along a word in each direction
+_STEPS = {ACROSS: (0, 1), DOWN: (1, 0)}
+# the flag marking a square as in a word in each direction
+_FLAGS = {ACROSS: 1, DOWN: 2}
+_OTHER = {ACROSS: DOWN, DOWN: ACROSS}
+
+_HTML_HEAD = '''
+<html>
+ <head>
+  <meta charset="UTF-8">
+    <style>
+    div#crossword { float: left;}
+    div#clues {float: left; margin-left: 20px;}
+    table { border-collapse: collapse;}
+    td { width: 2em; height: 2em; border: 1px solid black;
+         vertical-align: top; font-size: 70%;}
+    td.black { background: black;}
+    ul {list-style-type: none;}
+  </style>
+</head>
+<body>
+'''
+
+_HTML_FOOT = '''
+</div>
+</body>
+</html>
+'''
+
+class Crossword():
+    '''
+    A crossword of the words of a passage.
+
+    Parameters
+
+    words - the words to choose the entries from. Words of fewer than
+            MIN_LENGTH graphemes or too long for the grid are not used.
+    rows - number of rows in the grid
+    cols - number of columns in the grid
+    direction - LTR or RTL, the direction the words across are read
+    seed - the seed for all the random choices of the layout, chosen at
+           random if not given and available from get_seed()
+    time_budget - seconds to spend on layout attempts
+    attempts - the most layout attempts to make, by default as many as the
+               time budget allows. The same words, options and seed give the
+               same crossword when the attempts are made within the budget.
+    clues - a dictionary of each word to its clue. Entries without a clue
+            are listed by number and length alone.
+    '''
+    LTR = 1
+    RTL = 2
+
+    # Default layout search time in seconds
+    DEFAULT_TIME_BUDGET = 0.5
+
+    # The fewest graphemes in an entry
+    MIN_LENGTH = 2
+
+    # The most words of a slot tried, best first, by the search
+    MAX_CHOICES = 4
+
+    # The most times an attempt goes back to try another word in a slot
+    MAX_BACKTRACKS = 16
+
+    # The attempts made without a better layout after which the search stops
+    STALE_ATTEMPTS = 8
+
+    def __init__(self, words, rows=15, cols=15, direction=LTR, seed=None,
+                 time_budget=DEFAULT_TIME_BUDGET, attempts=None, clues=None):
+        self._rows = rows
+        self._cols = cols
+        self._direction = direction
+        self._time_budget = time_budget
+        self._max_attempts = attempts
+        self._clues = dict(clues or {})
+        if seed is None:
+            seed = getrandbits(64)
+        self._seed = seed
+        self._random = Random(seed)
+
+        longest = max(rows, cols)
+        self._entries = []
+        self._unplaced_words = []
+        for w, g_s in sorted_graphemes(set(words)):
+            if self.MIN_LENGTH <= len(g_s) <= longest:
+                self._entries.append((w, g_s))
+            elif w:
+                self._unplaced_words.append(w)
+
+        self._grid = Grid(rows, cols, fixed=True)
+        self._ids = [self._grid.intern_all(g_s) for _, g_s in self._entries]
+        self._index = CandidateIndex(self._ids)
+        # the directions of the words through each square, _FLAGS bits
+        self._flags = bytearray(rows * cols)
+        # (word number, row, col, direction) of each word in placement order
+        self._placements = []
+        self._attempts = 0
+        self._fill()
+
+    def _fill(self):
+        '''Make layout attempts and keep the best.'''
+        deadline = time.monotonic() + self._time_budget
+        best = []
+        stale = 0
+        while True:
+            placements = self._attempt()
+            self._attempts += 1
+            if self._rank(placements) > self._rank(best):
+                best = placements
+                stale = 0
+            else:
+                stale += 1
+            if (len(best) == len(self._entries) or
+                    stale == self.STALE_ATTEMPTS or
+                    self._attempts == self._max_attempts or
+                    time.monotonic() >= deadline):
+                break
+        for p in best:
+            self._place(*p)
+        self._placements = best
+        placed = {n for n, _, _, _ in best}
+        self._unplaced_words += [w for n, (w, _) in enumerate(self._entries)
+                                 if n not in placed]
+
+    def _rank(self, placements):
+        '''Rank layouts, the most words and then the most letters first.'''
+        return (len(placements),
+                sum(len(self._ids[n]) for n, _, _, _ in placements))
+
+    def _place(self, n, row, col, direction):
+        self._grid.place(self._ids[n], row, col, *_STEPS[direction])
+        d_row, d_col = _STEPS[direction]
+        for k in range(len(self._ids[n])):
+            self._flags[(row + k * d_row) * self._cols + col + k * d_col] |= \
+                _FLAGS[direction]
+
+    def _unplace(self, n, row, col, direction):
+        self._grid.remove(self._ids[n], row, col, *_STEPS[direction])
+        d_row, d_col = _STEPS[direction]
+        for k in range(len(self._ids[n])):
+            self._flags[(row + k * d_row) * self._cols + col + k * d_col] &= \
+                ~_FLAGS[direction]
+
+    def _push(self, placement, slots, unused, lengths):
+        '''Place a word and narrow the domains of the slots of the lines
+        through and beside it. Returns what _pop() needs to undo it.
+        '''
+        n, row, col, direction = placement
+        self._place(n, row, col, direction)
+        length = len(self._ids[n])
+        unused[length] &= ~self._index.bit(n)
+        undo = []
+        for line in self._affected(row, col, direction, length):
+            undo.append((line, slots.get(line)))
+            line_slots = self._line_slots(*line, lengths)
+            if line_slots:
+                slots[line] = line_slots
+            else:
+                slots.pop(line, None)
+        return undo
+
+    def _pop(self, placement, undo, slots, unused):
+        '''Take a word off the grid and restore the slots _push() changed.'''
+        n, row, col, direction = placement
+        self._unplace(n, row, col, direction)
+        unused[len(self._ids[n])] |= self._index.bit(n)
+        for line, line_slots in reversed(undo):
+            if line_slots is None:
+                slots.pop(line, None)
+            else:
+                slots[line] = line_slots
+
+    @staticmethod
+    def _live(slots, unused):
+        '''Return the number of slots with a word left.'''
+        return sum(1 for line_slots in slots.values()
+                   for _, length, mask, _ in line_slots
+                   if mask & unused[length])
+
+    def _attempt(self):
+        '''Lay out as many words as possible by the search described above
+        and return the placements of the best layout found. The grid is left
+        empty.
+        '''
+        if not self._entries:
+            return []
+        index, rng = self._index, self._random
+        lengths = index.lengths()
+        # the bitmap of the words of each length not yet placed
+        unused = {length: index.all(length) for length in lengths}
+
+        # Start from one of the longest words across the middle row, or down
+        # the middle column if no word fits across
+        if len(self._ids[-1]) <= self._cols:
+            direction, width = ACROSS, self._cols
+        else:
+            direction, width = DOWN, self._rows
+        fits = [n for n, ids in enumerate(self._ids) if len(ids) <= width]
+        longest = len(self._ids[fits[0]])
+        n = rng.choice([m for m in fits if len(self._ids[m]) >= longest - 1])
+        length = len(self._ids[n])
+        offset = rng.randrange(width - length + 1)
+        if direction == ACROSS:
+            row, col = self._rows // 2, offset
+        else:
+            row, col = offset, self._cols // 2
+
+        # (direction, line) -> the slots of the line with a word left
+        slots = dict()
+        placements = []
+        best = []
+        backtracks = self.MAX_BACKTRACKS
+
+        def search(placement):
+            nonlocal best, backtracks
+            undo = self._push(placement, slots, unused, lengths)
+            placements.append(placement)
+            if self._rank(placements) > self._rank(best):
+                best = list(placements)
+            if len(best) < len(self._entries):
+                for child in self._children(slots, unused, lengths):
+                    search(child)
+                    if backtracks == 0:
+                        break
+                    backtracks -= 1
+            placements.pop()
+            self._pop(placement, undo, slots, unused)
+
+        search((n, row, col, direction))
+        return best
+
+    def _children(self, slots, unused, lengths):
+        '''Return the placements to try next, best first. The slot with the
+        fewest words to choose from, then the one crossing the most letters,
+        then the longest, is filled, with up to MAX_CHOICES of its words
+        ordered by the slots each leaves with a word left.
+        '''
+        index, rng = self._index, self._random
+        best, choices = None, []
+        for (direction, line), line_slots in slots.items():
+            for start, length, mask, crossings in line_slots:
+                mask &= unused[length]
+                if not mask:
+                    continue
+                rank = (-bin(mask).count('1'), crossings, length)
+                if best is None or rank > best:
+                    best, choices = rank, []
+                if rank == best:
+                    choices.append((direction, line, start, length, mask))
+        if not choices:
+            return []
+        direction, line, start, length, mask = rng.choice(choices)
+        row, col = (line, start) if direction == ACROSS else (start, line)
+        words = index.words(length, mask)
+        words = rng.sample(words, min(len(words), self.MAX_CHOICES))
+        if len(words) == 1:
+            return [(words[0], row, col, direction)]
+        # forward checking, the domains of the slots each word leaves
+        scored = []
+        for n in words:
+            placement = (n, row, col, direction)
+            undo = self._push(placement, slots, unused, lengths)
+            scored.append((-self._live(slots, unused), len(scored),
+                           placement))
+            self._pop(placement, undo, slots, unused)
+        return [placement for _, _, placement in sorted(scored)]
+
+    def _affected(self, row, col, direction, length):
+        '''Return the lines whose slots may change when a word is placed,
+        the line of the word, those either side of it and those crossing it
+        or its ends, as (direction, line) pairs.
+        '''
+        if direction == ACROSS:
+            along, across_from, limit = row, col, self._cols
+            other_limit = self._rows
+        else:
+            along, across_from, limit = col, row, self._rows
+            other_limit = self._cols
+        lines = [(direction, k) for k in (along - 1, along, along + 1)
+                 if 0 <= k < other_limit]
+        lines += [(_OTHER[direction], k)
+                  for k in range(across_from - 1, across_from + length + 1)
+                  if 0 <= k < limit]
+        return lines
+
+    def _line_slots(self, direction, line, lengths):
+        '''
+        Return the slots of a line where a word could go, as (start, length,
+        domain, crossings) tuples. A slot crosses at least one letter already
+        on the grid, runs through no square already in a word in the same
+        direction and leaves no letter touching another except where words
+        cross. Its domain is the bitmap of the words of its length with the
+        letters it crosses, from the candidate index, and is never empty.
+
+        Parameters
+
+        direction - ACROSS or DOWN
+        line - the row of a line across or the column of a line down
+        lengths - the lengths of the words, shortest first
+        '''
+        grid = self._grid
+        if direction == ACROSS:
+            squares = [(line, c) for c in range(self._cols)]
+        else:
+            squares = [(r, line) for r in range(self._rows)]
+        d_row, d_col = _STEPS[_OTHER[direction]]
+        flag = _FLAGS[direction]
+        ids = [grid.get_id(r, c) for r, c in squares]
+        used = [self._flags[r * self._cols + c] & flag for r, c in squares]
+        # squares with a letter beside them, across the line
+        crowded = [grid.get_id(r - d_row, c - d_col) or
+                   grid.get_id(r + d_row, c + d_col) for r, c in squares]
+
+        size = len(squares)
+        seen = set()
+        slots = []
+        for a in range(size):
+            if not ids[a] or used[a]:
+                continue
+            for length in lengths:
+                if length > size:
+                    break
+                for start in range(max(0, a - length + 1),
+                                   min(a, size - length) + 1):
+                    if (start, length) in seen:
+                        continue
+                    seen.add((start, length))
+                    end = start + length
+                    # a word may not run on into a letter at either end
+                    if (start > 0 and ids[start - 1]) or \
+                            (end < size and ids[end]):
+                        continue
+                    fixed = []
+                    for k in range(start, end):
+                        if ids[k]:
+                            if used[k]:
+                                break
+                            fixed.append((k - start, ids[k]))
+                        elif crowded[k]:
+                            break
+                    else:
+                        mask = self._index.candidates(length, fixed)
+                        if mask:
+                            slots.append((start, length, mask, len(fixed)))
+        return slots
+
+    def _display_col(self, col):
+        '''Return the column as seen from the left of a column in reading
+        order.
+        '''
+        return col if self._direction == self.LTR else self._cols - 1 - col
+
+    def get(self, row, col):
+        '''Return the grapheme at (row, col) as displayed, None for a black
+        square.
+        '''
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return None
+        return self._grid.get(row, self._display_col(col))
+
+    def get_entries(self):
+        '''
+        Return the entries of the crossword, a list of dictionaries with the
+        keys
+
+            num  - the number of the entry on the grid
+            dir  - ACROSS or DOWN
+            loc  - the [row, col] of its first grapheme as displayed
+            word - the word
+            len  - the number of graphemes in the word
+            clue - the clue, if the word has one
+
+        across first, then down, each in number order. Squares are numbered
+        in reading order.
+        '''
+        starts = sorted({(row, col) for _, row, col, _ in self._placements})
+        numbers = {square: i + 1 for i, square in enumerate(starts)}
+        entries = [{'num': numbers[(row, col)], 'dir': direction,
+                    'loc': [row, self._display_col(col)],
+                    'word': self._entries[n][0],
+                    'len': len(self._ids[n])}
+                   for n, row, col, direction in self._placements]
+        for e in entries:
+            clue = self._clues.get(e['word'])
+            if clue:
+                e['clue'] = clue
+        entries.sort(key=lambda e: (e['dir'] != ACROSS, e['num']))
+        return entries
+
+    def get_grid(self, output_format='json'):
+        '''
+        Get a string representation of the crossword.
+
+        Parameters
+
+        output_format - 'json' an object with the rows and cols of the grid,
+                        'squares', a list of {'loc', 'grf'} objects, one per
+                        white square row by row, with 'num' on the numbered
+                        squares, and 'entries' as get_entries().
+                        'html' a page with the empty grid and the entries.
+        '''
+        entries = self.get_entries()
+        numbers = {tuple(e['loc']): e['num'] for e in entries}
+        if output_format == 'json':
+            squares = []
+            for row in range(self._rows):
+                for col in range(self._cols):
+                    g = self.get(row, col)
+                    if g is None:
+                        continue
+                    square = {'loc': [row, col], 'grf': g}
+                    if (row, col) in numbers:
+                        square['num'] = numbers[(row, col)]
+                    squares.append(square)
+            return json.dumps({'rows': self._rows, 'cols': self._cols,
+                               'squares': squares, 'entries': entries},
+                              ensure_ascii=False)
+        elif output_format == 'html':
+            chunks = [_HTML_HEAD, '<div id="main"><div id="crossword">'
+                      '<table>']
+            for row in range(self._rows):
+                chunks.append('<tr>' + ''.join(
+                    '<td class="black"></td>' if self.get(row, col) is None
+                    else f'<td>{numbers.get((row, col), "")}</td>'
+                    for col in range(self._cols)) + '</tr>')
+            chunks.append('</table></div>\n<div id="clues">')
+            for direction in (ACROSS, DOWN):
+                chunks.append(f'\n<h3>{direction.capitalize()}</h3>\n<ul>')
+                chunks.append(''.join(
+                    f'<li>{e["num"]} {html.escape(e.get("clue", ""))} '
+                    f'({e["len"]})</li>'
+                    for e in entries if e['dir'] == direction))
+                chunks.append('</ul>')
+            chunks.append(_HTML_FOOT)
+            return ''.join(chunks)
+        raise Exception(f'unsupported output format {output_format}')
+
+    def get_word_list(self):
+        '''Return the words placed, in placement order.'''
+        return [self._entries[n][0] for n, _, _, _ in self._placements]
+
+    def get_unplaced_words(self):
+        return self._unplaced_words
+
+    def get_seed(self):
+        return self._seed
+
+    def get_attempts(self):
+        '''Return the number of layout attempts made.'''
+        return self._attempts
+
+    def get_clues(self):
+        '''Return the dictionary of words to clues.'''
+        return self._clues
+
+    def get_rows(self):
+        return self._rows
+
+    def get_cols(self):
+        return self._cols
+
+def passage_crossword(*ranges, work=None, clue_feature='gloss', **options):
+    '''
+    Return a Crossword of the words of a passage clued with a feature of
+    each word, by default its gloss. A word found more than once is clued
+    with the value at its first occurrence.
+
+    Parameters
+        ranges is a list of ranges as accepted by etcbc.iter_words
+        work is the corpus identifier, by default Hebrew, whose words are
+            read right to left
+        clue_feature is the feature giving the clues, as accepted by
+            query.get_word_records()
+        options are the other parameters of Crossword
+    '''
+    from puzzles.core.etcbc import Corpus
+    from puzzles.core.query import WORD, get_word_records
+    if work is None:
+        work = Corpus.HEBREW
+    records = get_word_records(ranges, [WORD, clue_feature], work=work)
+    clues = dict()
+    for r in records:
+        if r[clue_feature]:
+            clues.setdefault(r[WORD], r[clue_feature])
+    options.setdefault('direction', Crossword.RTL if work == Corpus.HEBREW
+                       else Crossword.LTR)
+    return Crossword([r[WORD] for r in records], clues=clues, **options)
@@ -0,0 +1,80 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+The candidate index of a crossword vocabulary.
+
+For each word length, position and grapheme the index holds a bitmap, a
+Python int with bit k set when the k-th word of that length has that grapheme
+at that position. The words which fit a slot are then the bitmap of all the
+words of its length anded with one bitmap per grapheme already in the slot,
+a dictionary lookup and an and for each crossing however large the
+vocabulary.
+'''
+
+class CandidateIndex():
+    '''
+    An index from (length, position, grapheme) to the words which have that
+    grapheme at that position.
+
+    Parameters
+
+    words - a sequence of words, each a sequence of graphemes or grapheme
+            IDs. Words are numbered by their place in the sequence.
+    '''
+
+    def __init__(self, words):
+        # length -> the numbers of the words of that length, by bit
+        self._words = dict()
+        # word number -> its bit among the words of its length
+        self._bits = dict()
+        # (length, position, grapheme) -> bitmap of the words of that length
+        self._masks = dict()
+        for n, word in enumerate(words):
+            length = len(word)
+            same_length = self._words.setdefault(length, [])
+            bit = self._bits[n] = 1 << len(same_length)
+            same_length.append(n)
+            for position, g in enumerate(word):
+                key = (length, position, g)
+                self._masks[key] = self._masks.get(key, 0) | bit
+
+    def lengths(self):
+        '''Return the word lengths in the index, shortest first.'''
+        return sorted(self._words)
+
+    def all(self, length):
+        '''Return the bitmap of all the words of a length.'''
+        return (1 << len(self._words.get(length, ()))) - 1
+
+    def bit(self, n):
+        '''Return the bit of word n among the words of its length.'''
+        return self._bits[n]
+
+    def candidates(self, length, fixed, mask=None):
+        '''
+        Return the bitmap of the words of a length with the given graphemes
+        at the given positions.
+
+        Parameters
+
+        length - the number of graphemes
+        fixed - an iterable of (position, grapheme) pairs
+        mask - the bitmap to start from, by default all the words of the
+               length
+        '''
+        if mask is None:
+            mask = self.all(length)
+        masks = self._masks
+        for position, g in fixed:
+            mask &= masks.get((length, position, g), 0)
+            if not mask:
+                break
+        return mask
+
+    def words(self, length, mask):
+        '''Return the numbers of the words in a bitmap of words of a length.'''
+        same_length = self._words.get(length, ())
+        bits = bin(mask)[:1:-1]
+        return [same_length[k] for k in range(len(bits)) if bits[k] == '1']
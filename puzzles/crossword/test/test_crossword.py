@@ -0,0 +1,149 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import json
+import unittest
+from random import Random
+from puzzles.core.graphemes import graphemes
+from puzzles.crossword.crossword import ACROSS, DOWN, Crossword
+
+class Test(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = Random(1)
+        cls.words = {''.join(rng.choice('αβγδεζηθικλμνοπρστ')
+                             for _ in range(rng.randint(2, 8)))
+                     for _ in range(200)}
+
+    def _runs(self, cw):
+        '''Return the runs of two or more white squares across and down as
+        (direction, start square, graphemes).
+        '''
+        runs = []
+        for direction, lines, length in ((ACROSS, cw.get_rows(),
+                                          cw.get_cols()),
+                                         (DOWN, cw.get_cols(),
+                                          cw.get_rows())):
+            for line in range(lines):
+                run = []
+                for k in range(length + 1):
+                    square = (line, k) if direction == ACROSS else (k, line)
+                    g = cw.get(*square) if k < length else None
+                    if g is not None:
+                        run.append((square, g))
+                        continue
+                    if len(run) > 1:
+                        runs.append((direction, run[0][0],
+                                     tuple(g for _, g in run)))
+                    run = []
+        return runs
+
+    def _assert_valid(self, cw, rtl=False):
+        entries = cw.get_entries()
+        self.assertEqual(len(entries), len(cw.get_word_list()))
+        # every run of letters is an entry and every entry a run
+        runs = self._runs(cw)
+        found = []
+        for e in entries:
+            g_s = graphemes(e['word'])
+            if rtl and e['dir'] == ACROSS:
+                # read from the right, so the run ends at the first grapheme
+                row, col = e['loc']
+                found.append((ACROSS, (row, col - len(g_s) + 1),
+                              tuple(reversed(g_s))))
+            else:
+                found.append((e['dir'], tuple(e['loc']), g_s))
+        self.assertEqual(sorted(runs), sorted(found))
+        # every letter is in a word
+        white = {(r, c) for r in range(cw.get_rows())
+                 for c in range(cw.get_cols()) if cw.get(r, c) is not None}
+        in_runs = set()
+        for direction, (r, c), g_s in runs:
+            for k in range(len(g_s)):
+                in_runs.add((r, c + k) if direction == ACROSS else (r + k, c))
+        self.assertEqual(white, in_runs)
+
+    def testLayout(self):
+        cw = Crossword(self.words, 15, 15, Crossword.LTR, seed=3, attempts=3)
+        self.assertEqual(cw.get_attempts(), 3)
+        self.assertGreater(len(cw.get_word_list()), 20)
+        self.assertEqual(len(cw.get_word_list()) +
+                         len(cw.get_unplaced_words()), len(self.words))
+        self._assert_valid(cw)
+
+        # numbered in reading order, across first
+        numbers = [e['num'] for e in cw.get_entries() if e['dir'] == ACROSS]
+        self.assertEqual(numbers, sorted(numbers))
+
+    def testSearch(self):
+        cw = Crossword(self.words, 9, 9, seed=2, attempts=1)
+        placed = len(cw.get_word_list())
+        # an attempt searches from the empty grid and leaves it empty
+        for n, row, col, direction in cw._placements:
+            cw._unplace(n, row, col, direction)
+        self.assertEqual(set(cw._flags), {0})
+        best = cw._attempt()
+        self.assertGreaterEqual(len(best), 1)
+        self.assertEqual(set(cw._flags), {0})
+        self.assertTrue(all(cw._grid.get_id(r, c) == 0 for r in range(9)
+                            for c in range(9)))
+        # going back to try other words finds at least as good a layout
+        Crossword.MAX_BACKTRACKS, saved = 0, Crossword.MAX_BACKTRACKS
+        try:
+            greedy = Crossword(self.words, 9, 9, seed=2, attempts=1)
+        finally:
+            Crossword.MAX_BACKTRACKS = saved
+        self.assertGreaterEqual(placed, len(greedy.get_word_list()))
+
+    def testRightToLeft(self):
+        words = ['בְּרֵאשִׁית', 'בָּרָא', 'אֱלֹהִים', 'אֵת', 'הַשָּׁמַיִם', 'וְאֵת',
+                 'הָאָרֶץ', 'וְהָאָרֶץ', 'הָיְתָה', 'תֹהוּ', 'וָבֹהוּ', 'וְחֹשֶׁךְ',
+                 'עַל', 'פְּנֵי', 'תְהוֹם', 'וְרוּחַ', 'מְרַחֶפֶת', 'הַמָּיִם']
+        cw = Crossword(words, 9, 9, Crossword.RTL, seed=1, attempts=5)
+        self._assert_valid(cw, rtl=True)
+        # the first across entry starts at the right of its run
+        e = [e for e in cw.get_entries() if e['dir'] == ACROSS][0]
+        self.assertEqual(cw.get(*e['loc']), graphemes(e['word'])[0])
+
+    def testSeededLayout(self):
+        first = Crossword(self.words, seed=7, attempts=2)
+        second = Crossword(list(reversed(sorted(self.words))), seed=7,
+                           attempts=2)
+        self.assertEqual(first.get_grid('json'), second.get_grid('json'))
+
+    def testGrid(self):
+        cw = Crossword(self.words, 11, 13, seed=5, attempts=1)
+        grid = json.loads(cw.get_grid('json'))
+        self.assertEqual((grid['rows'], grid['cols']), (11, 13))
+        self.assertEqual(grid['entries'], cw.get_entries())
+        numbered = {tuple(s['loc']): s['num'] for s in grid['squares']
+                    if 'num' in s}
+        for e in grid['entries']:
+            self.assertEqual(numbered[tuple(e['loc'])], e['num'])
+        html = cw.get_grid('html')
+        self.assertEqual(html.count('<tr>'), 11)
+        self.assertEqual(html.count('<td'), 11 * 13)
+        self.assertRaises(Exception, cw.get_grid, 'compact')
+
+    def testClues(self):
+        clues = {w: f'<{w[::-1]}>' for w in sorted(self.words)[::2]}
+        cw = Crossword(self.words, seed=5, attempts=1, clues=clues)
+        entries = cw.get_entries()
+        for e in entries:
+            self.assertEqual(e.get('clue'), clues.get(e['word']))
+        self.assertTrue(any('clue' in e for e in entries))
+        self.assertIn(f'&lt;{entries[0]["word"][::-1]}&gt;'
+                      if 'clue' in entries[0] else f'{entries[0]["num"]}  (',
+                      cw.get_grid('html'))
+
+    def testTooFewWords(self):
+        cw = Crossword(['α', ''], seed=1)
+        self.assertEqual(cw.get_word_list(), [])
+        self.assertEqual(cw.get_unplaced_words(), ['α'])
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
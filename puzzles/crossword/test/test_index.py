@@ -0,0 +1,33 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import unittest
+from puzzles.crossword.index import CandidateIndex
+
+class Test(unittest.TestCase):
+
+    def testCandidates(self):
+        words = [('α', 'β'), ('α', 'γ', 'δ'), ('ε', 'β'), ('α', 'β', 'δ'),
+                 ('ε', 'γ')]
+        index = CandidateIndex(words)
+
+        self.assertEqual(index.lengths(), [2, 3])
+        self.assertEqual(index.words(2, index.all(2)), [0, 2, 4])
+        self.assertEqual(index.words(2, index.candidates(2, [(1, 'β')])),
+                         [0, 2])
+        self.assertEqual(index.words(3, index.candidates(3, [(0, 'α'),
+                                                             (2, 'δ')])),
+                         [1, 3])
+        self.assertEqual(index.candidates(3, [(0, 'ε')]), 0)
+        self.assertEqual(index.candidates(4, []), 0)
+
+        # a mask restricts the words considered
+        mask = index.all(2) & ~index.bit(0)
+        self.assertEqual(index.words(2, index.candidates(2, [(1, 'β')], mask)),
+                         [2])
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
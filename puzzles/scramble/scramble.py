@@ -0,0 +1,164 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Scramble puzzles. The letters of each word are shuffled and the player puts
+them back in order.
+
+Letters are graphemes, so a Hebrew letter keeps its points and a Greek letter
+its accents and breathing when shuffled. A scramble is only fair when the
+word is the one way of ordering its letters, so a word which has an anagram
+in the passage is not used. The AnagramIndex of a passage maps the
+signature of each word, its graphemes sorted, to the words with that
+signature, so whether a word has an anagram is one dictionary lookup. The
+indexes of the most recently used passages are kept in a
+providers.SourceCache.
+
+Output
+
+    json - a list of {"num", "grf", "word"} objects, one per scramble, with
+           the scrambled graphemes in grf and the answer in word
+    html - a page listing the scrambles with space for the answers
+'''
+
+import json
+from random import Random, getrandbits
+
+from puzzles.core.graphemes import graphemes, sorted_graphemes
+from puzzles.core.normalize import POINTED
+from puzzles.core.providers import SourceCache, corpus_provider
+
+def signature(word):
+    '''Return the anagram signature of a word, its graphemes in sorted
+    order.
+    '''
+    return tuple(sorted(graphemes(word)))
+
+class AnagramIndex():
+    '''
+    The words of a vocabulary by their anagram signature.
+
+    Parameters
+
+    words - the words, in any order and with any repeats
+    '''
+
+    def __init__(self, words):
+        self._classes = dict()
+        for w in sorted({w for w in words if w}):
+            self._classes.setdefault(signature(w), []).append(w)
+
+    def __len__(self):
+        return sum(len(c) for c in self._classes.values())
+
+    def words(self):
+        '''Return the words of the index in order.'''
+        return sorted(w for c in self._classes.values() for w in c)
+
+    def anagrams(self, word):
+        '''Return the other words of the index with the same graphemes as a
+        word.
+        '''
+        return [w for w in self._classes.get(signature(word), ())
+                if w != word]
+
+    def is_ambiguous(self, word):
+        '''True if another word of the index has the same graphemes.'''
+        anagram_class = self._classes.get(signature(word), ())
+        return len(anagram_class) > 1 or \
+            (len(anagram_class) == 1 and anagram_class[0] != word)
+
+    def classes(self):
+        '''Return the anagram classes of more than one word.'''
+        return [list(c) for c in self._classes.values() if len(c) > 1]
+
+class Scramble():
+    '''
+    The scrambles of the words of a passage.
+
+    Parameters
+
+    words - the words to scramble
+    seed - the seed for the shuffles, chosen at random if not given and
+           available from get_seed()
+    index - the AnagramIndex to check the words against, built from the
+            words if not given. Pass the index of the whole passage to
+            scramble only some of its words.
+    '''
+
+    def __init__(self, words, seed=None, index=None):
+        if seed is None:
+            seed = getrandbits(64)
+        self._seed = seed
+        self._random = Random(seed)
+        if index is None:
+            index = AnagramIndex(words)
+        self._index = index
+
+        # (word, scrambled graphemes) in the order of sorted_graphemes
+        self._scrambles = []
+        self._unused_words = []
+        for w, g_s in sorted_graphemes({w for w in words if w}):
+            if len(set(g_s)) < 2 or index.is_ambiguous(w):
+                # no other order of its letters, or one which is another word
+                self._unused_words.append(w)
+                continue
+            scrambled = list(g_s)
+            while tuple(scrambled) == g_s:
+                self._random.shuffle(scrambled)
+            self._scrambles.append((w, scrambled))
+
+    def get_scrambles(self):
+        '''Return a list of (word, scrambled graphemes) pairs.'''
+        return [(w, list(g_s)) for w, g_s in self._scrambles]
+
+    def get_word_list(self):
+        '''Return the words scrambled.'''
+        return [w for w, _ in self._scrambles]
+
+    def get_unused_words(self):
+        '''Return the words which could not be scrambled unambiguously.'''
+        return self._unused_words
+
+    def get_seed(self):
+        return self._seed
+
+    def get_grid(self, output_format='json'):
+        '''Get a string representation of the scrambles, json or html as
+        described above.
+        '''
+        if output_format == 'json':
+            return json.dumps([{'num': i + 1, 'grf': g_s, 'word': w}
+                               for i, (w, g_s) in enumerate(self._scrambles)],
+                              ensure_ascii=False)
+        elif output_format == 'html':
+            rows = ''.join(f'<tr><td>{i + 1}</td><td>{"".join(g_s)}</td>'
+                           f'<td></td></tr>'
+                           for i, (_, g_s) in enumerate(self._scrambles))
+            return ('<html>\n <head>\n  <meta charset="UTF-8">\n </head>\n'
+                    '<body>\n<h3>Scramble</h3>\n<table border="1">'
+                    f'{rows}</table>\n</body>\n</html>\n')
+        raise Exception(f'unsupported output format {output_format}')
+
+# The anagram indexes of the passages used in this process
+_indexes = SourceCache(AnagramIndex)
+
+def passage_index(*ranges, work=None, form=POINTED):
+    '''
+    Return the AnagramIndex of the words of a passage, building it the first
+    time the passage is asked for.
+
+    Parameters
+        ranges is a list of ranges as accepted by etcbc.iter_words
+        work is the corpus identifier, by default Hebrew
+        form is one of puzzles.core.normalize.FORMS
+    '''
+    return _indexes.get(corpus_provider(work), ranges, form)
+
+def passage_scramble(*ranges, work=None, seed=None, form=POINTED):
+    '''Return the Scramble of every word of a passage in a form, checked
+    against the passage's AnagramIndex.
+    '''
+    index = passage_index(*ranges, work=work, form=form)
+    return Scramble(index.words(), seed=seed, index=index)
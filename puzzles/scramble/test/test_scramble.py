@@ -0,0 +1,62 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import json
+import unittest
+from collections import Counter
+from puzzles.core.graphemes import graphemes
+from puzzles.scramble.scramble import AnagramIndex, Scramble, signature
+
+class Test(unittest.TestCase):
+
+    words = ['λόγος', 'θεός', 'ἀρχῇ', 'ἦν', 'ὁ', 'καὶ', 'πρὸς', 'τὸν',
+             'νὸτ', 'καὶ', 'αα']
+
+    def testIndex(self):
+        index = AnagramIndex(self.words)
+        self.assertEqual(len(index), 10)
+        self.assertEqual(signature('τὸν'), signature('νὸτ'))
+        self.assertEqual(index.anagrams('τὸν'), ['νὸτ'])
+        self.assertTrue(index.is_ambiguous('τὸν'))
+        self.assertFalse(index.is_ambiguous('λόγος'))
+        # a word not in the index is ambiguous if it has an anagram there
+        self.assertTrue(index.is_ambiguous('τνὸ'))
+        self.assertFalse(index.is_ambiguous('λόγοι'))
+        self.assertEqual(index.classes(), [['νὸτ', 'τὸν']])
+
+    def testScramble(self):
+        s = Scramble(self.words, seed=1)
+        self.assertEqual(sorted(s.get_unused_words()),
+                         sorted(['τὸν', 'νὸτ', 'ὁ', 'αα']))
+        self.assertEqual(s.get_word_list(),
+                         ['λόγος', 'θεός', 'πρὸς', 'ἀρχῇ', 'καὶ', 'ἦν'])
+        for w, g_s in s.get_scrambles():
+            self.assertNotEqual(tuple(g_s), graphemes(w))
+            self.assertEqual(Counter(g_s), Counter(graphemes(w)))
+
+        # graphemes keep their marks
+        self.assertIn('ῇ', dict(s.get_scrambles())['ἀρχῇ'])
+
+        self.assertEqual(Scramble(self.words, seed=1).get_scrambles(),
+                         s.get_scrambles())
+
+    def testPassageIndex(self):
+        # checked against the whole passage, not just the words given
+        index = AnagramIndex(self.words)
+        s = Scramble(['τὸν', 'λόγος'], seed=1, index=index)
+        self.assertEqual(s.get_word_list(), ['λόγος'])
+
+    def testGrid(self):
+        s = Scramble(self.words, seed=2)
+        grid = json.loads(s.get_grid('json'))
+        self.assertEqual([g['word'] for g in grid], s.get_word_list())
+        self.assertEqual([g['num'] for g in grid], list(range(1, 7)))
+        self.assertEqual(grid[0]['grf'], s.get_scrambles()[0][1])
+        self.assertEqual(s.get_grid('html').count('<tr>'), 6)
+        self.assertRaises(Exception, s.get_grid, 'compact')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
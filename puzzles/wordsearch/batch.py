@@ -0,0 +1,220 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Batch generation of wordsearches from a manifest.
+
+The manifest is a JSON lines file with one puzzle per line, for example
+
+    {"id": "gen-1", "text": "ETCBCH", "verses": "Gen 1:1-5"}
+    {"id": "mat-1", "text": "ETCBCG", "verses": "Mat 1:1-6", "rows": 15,
+     "cols": 15, "format": "json"}
+
+text and verses are as for the generate command. id names the output file
+and defaults to the line number. rows and cols give a bounded grid as for
+generate, format is html, json or compact and time_budget is the bounded
+layout search time. seed and attempts are as for the --seed and --attempts
+options of generate. Blank lines and lines starting with # are ignored.
+
+Jobs are spread over a pool of worker processes, one per core by default.
+Each worker loads the corpora it needs once when it starts and then builds
+one puzzle per job, writing it straight to the output directory, so the
+results stream out as they are finished rather than at the end. A job which
+runs longer than the timeout is abandoned and reported. Timeouts rely on
+SIGALRM and so are not enforced on Windows. Where workers are forked the
+corpora loaded by the parent are shared with them rather than copied, and a
+corpus memory limit caps what each worker keeps loaded, see
+puzzles.core.etcbc.CorpusRegistry.
+'''
+
+import json
+import os
+import re
+import signal
+import sys
+import time
+from multiprocessing import Pool
+
+from puzzles.core.etcbc import preload, registry
+from puzzles.core.frequency import grapheme_frequencies
+from puzzles.core.normalize import FORMS, POINTED
+from puzzles.wordsearch.render import write_grid
+from puzzles.wordsearch.wordsearch import WordSearch, make_wordsearch, \
+    text_corpus
+
+# The output file extension for each format
+EXTENSIONS = {'html': 'html', 'json': 'json', 'compact': 'json'}
+
+# The per job timeout in a worker process, set by _init_worker()
+_timeout = None
+
+class JobTimeout(Exception):
+    '''Raised in a worker when a job runs past its timeout.'''
+
+def read_manifest(path):
+    '''Read the jobs from a manifest file.
+
+    Parameters
+
+    path - the manifest file name
+    '''
+    jobs = []
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                raise Exception(f'{path}:{line_no}: {e}')
+            for key in ('text', 'verses'):
+                if key not in job:
+                    raise Exception(f'{path}:{line_no}: missing {key}')
+            if ('rows' in job) != ('cols' in job):
+                raise Exception(f'{path}:{line_no}: rows and cols must be '
+                                'given together')
+            if job.get('format', 'html') not in EXTENSIONS:
+                raise Exception(f'{path}:{line_no}: unsupported format '
+                                f'{job["format"]}')
+            if job.get('form', POINTED) not in FORMS:
+                raise Exception(f'{path}:{line_no}: unknown form '
+                                f'{job["form"]}')
+            text_corpus(job['text'])
+            job.setdefault('id', str(line_no))
+            jobs.append(job)
+    return jobs
+
+def _output_name(job):
+    '''Return the output file name for a job, its id made safe for use as a
+    file name.
+    '''
+    name = re.sub(r'[^\w.-]', '_', str(job['id']))
+    return f'{name}.{EXTENSIONS[job.get("format", "html")]}'
+
+def _alarm(signum, frame):
+    raise JobTimeout()
+
+def _init_worker(texts, timeout, memory_limit=None):
+    '''Load the corpora for the texts once per worker process.'''
+    global _timeout
+    _timeout = timeout
+    registry.memory_limit = memory_limit
+    if timeout and hasattr(signal, 'SIGALRM'):
+        signal.signal(signal.SIGALRM, _alarm)
+    for text_name in texts:
+        corpus = text_corpus(text_name)[0]
+        preload(corpus)
+        grapheme_frequencies(corpus)
+
+def _run_job(args):
+    '''Build one puzzle and write it to output_dir. Returns a result
+    dictionary which is all the parent process sees of the job.
+    '''
+    job, output_dir = args
+    result = {'id': job['id'], 'status': 'ok'}
+    start = time.perf_counter()
+    timed = _timeout and hasattr(signal, 'SIGALRM')
+    try:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, _timeout)
+        try:
+            # the workers are daemonic so attempts are made in the worker
+            ws = make_wordsearch(job['text'], job['verses'],
+                                 job.get('rows'), job.get('cols'),
+                                 job.get('time_budget',
+                                         WordSearch.DEFAULT_TIME_BUDGET),
+                                 job.get('seed'), job.get('attempts', 1),
+                                 processes=1, form=job.get('form', POINTED))
+            path = os.path.join(output_dir, _output_name(job))
+            # write then rename so a partly written puzzle is never seen
+            tmp = f'{path}.{os.getpid()}.tmp'
+            try:
+                with open(tmp, mode='w', encoding='utf-8') as f:
+                    write_grid(ws, f, job.get('format', 'html'))
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        finally:
+            if timed:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        result['path'] = path
+        result['unplaced'] = len(ws.get_unplaced_words())
+        result['seed'] = ws.get_seed()
+    except JobTimeout:
+        result['status'] = 'timeout'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = repr(e)
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+def run_batch(jobs, output_dir, processes=None, timeout=None, report=None,
+              memory_limit=None):
+    '''Generate the puzzles for a list of jobs and return a summary of the
+    run.
+
+    Parameters
+
+    jobs - the jobs, as returned by read_manifest()
+    output_dir - the directory to write the puzzles to. It is created if
+                 need be.
+    processes - the number of worker processes, by default one per core
+    timeout - the number of seconds after which a job is abandoned, or None
+              for no limit
+    report - a function called with each job's result as it finishes
+    memory_limit - the bytes of loaded corpora each process may keep, None
+                   for no limit
+    '''
+    os.makedirs(output_dir, exist_ok=True)
+    texts = sorted({job['text'] for job in jobs})
+
+    # Build any missing word caches and frequency tables once here rather
+    # than in every worker, and share what is loaded with forked workers
+    registry.memory_limit = memory_limit
+    for text_name in texts:
+        corpus = text_corpus(text_name)[0]
+        preload(corpus)
+        grapheme_frequencies(corpus)
+    registry.share()
+
+    summary = {'jobs': len(jobs), 'ok': 0, 'timeout': 0, 'error': 0}
+    start = time.perf_counter()
+    with Pool(processes, initializer=_init_worker,
+              initargs=(texts, timeout, memory_limit)) as pool:
+        registry.unshare()
+        for result in pool.imap_unordered(
+                _run_job, [(job, output_dir) for job in jobs]):
+            summary[result['status']] += 1
+            if report is not None:
+                report(result)
+    summary['elapsed'] = time.perf_counter() - start
+    summary['puzzles_per_sec'] = (summary['ok'] / summary['elapsed']
+                                  if summary['elapsed'] else 0.0)
+    return summary
+
+def _report(result):
+    if result['status'] == 'ok':
+        sys.stderr.write(f'{result["id"]}: {result["path"]} '
+                         f'({result["elapsed"]:.2f}s')
+        if result['unplaced']:
+            sys.stderr.write(f', {result["unplaced"]} words unplaced')
+        sys.stderr.write(')\n')
+    elif result['status'] == 'timeout':
+        sys.stderr.write(f'{result["id"]}: timed out after '
+                         f'{result["elapsed"]:.2f}s\n')
+    else:
+        sys.stderr.write(f'{result["id"]}: failed {result["error"]}\n')
+
+def main_batch(args):
+    '''Run the batch command from its parsed command line arguments.'''
+    jobs = read_manifest(args.manifest)
+    summary = run_batch(jobs, args.output_dir, args.processes, args.timeout,
+                        report=_report, memory_limit=args.memory_limit)
+    print(f'{summary["ok"]} of {summary["jobs"]} puzzles in '
+          f'{summary["elapsed"]:.2f}s, '
+          f'{summary["puzzles_per_sec"]:.2f} puzzles/sec '
+          f'({summary["timeout"]} timed out, {summary["error"]} failed)')
+    return 0 if summary['ok'] == summary['jobs'] else 1
@@ -0,0 +1,266 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+A compact binary format for storing finished wordsearches.
+
+All values are little-endian. A file is
+
+    header      - the struct HEADER,
+                    magic b'WSPZ', format version, flags, bytes per square,
+                    top, left, rows, cols, number of graphemes, number of
+                    placed words, number of unplaced words and the offset of
+                    the grapheme table
+    squares     - rows * cols grapheme indices, row-major, each of 1, 2 or 4
+                  bytes as needed for the grapheme table. 0 is an empty
+                  square.
+    graphemes   - the grapheme table, grapheme 1 first. Each string in the
+                  file is a 16 bit byte length and UTF-8.
+    seed        - the layout seed as a decimal string
+    placements  - the struct PLACEMENT for each placed word in the order
+                  placed, start row, start column, direction and number of
+                  graphemes. The word itself is read from the squares.
+    unplaced    - the strings of the words which did not fit a bounded grid
+
+The squares start straight after the header, so loading a file maps it with
+mmap and views the squares in place through a memoryview. Only the grapheme
+table is decoded on loading, the words when they are first asked for, and
+never an object per square.
+'''
+
+import mmap
+import struct
+import sys
+from array import array
+
+from puzzles.wordsearch import solver
+from puzzles.wordsearch.render import iter_grid
+
+MAGIC = b'WSPZ'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHBBiiIIIIII')
+PLACEMENT = struct.Struct('<iiBH')
+_LENGTH = struct.Struct('<H')
+
+# flags
+BOUNDED = 1
+
+# the direction codes of placements
+DIRECTIONS = ('R', 'RD', 'D', 'L', 'LD', 'U', 'LU', 'RU')
+
+_TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+def _pack_str(s):
+    data = s.encode('utf-8')
+    return _LENGTH.pack(len(data)) + data
+
+def dumps(ws):
+    '''Return the binary form of a WordSearch as bytes.'''
+    table = dict()
+    squares = []
+    get = ws._grid.get
+    for i in range(ws._top, ws._bottom + 1):
+        for j in range(ws._left, ws._right + 1):
+            g = get(i, j)
+            if g is None:
+                squares.append(0)
+            else:
+                squares.append(table.setdefault(g, len(table) + 1))
+    itemsize = 1 if len(table) < 0x100 else 2 if len(table) < 0x10000 else 4
+    cells = array(_TYPECODES[itemsize], squares)
+    if sys.byteorder != 'little':
+        cells.byteswap()
+
+    placements = []
+    for w in ws.get_word_list():
+        g_ids, (row, col), cur_dir = ws._placements[w]
+        placements.append(PLACEMENT.pack(row, col, DIRECTIONS.index(cur_dir),
+                                         len(g_ids)))
+    unplaced = ws.get_unplaced_words()
+
+    body = cells.tobytes()
+    header = HEADER.pack(MAGIC, VERSION, BOUNDED if ws._bounded else 0,
+                         itemsize, ws._top, ws._left, ws.get_rows(),
+                         ws.get_cols(), len(table), len(placements),
+                         len(unplaced), HEADER.size + len(body))
+    return b''.join([header, body]
+                    + [_pack_str(g) for g in table]
+                    + [_pack_str(str(ws.get_seed()))]
+                    + placements
+                    + [_pack_str(w) for w in unplaced])
+
+def dump(ws, output_file_name):
+    '''Write a WordSearch to a file in the binary form.'''
+    with open(output_file_name, mode='wb') as f:
+        f.write(dumps(ws))
+
+def loads(data):
+    '''Return a BinaryPuzzle reading the binary form held in a bytes-like
+    object. The squares are not copied.
+    '''
+    return BinaryPuzzle(data)
+
+def load(input_file_name):
+    '''Return a BinaryPuzzle reading a file in the binary form. The file is
+    mapped into memory and the squares are read from the mapping. close()
+    the puzzle, or use it as a context manager, to release the file.
+    '''
+    with open(input_file_name, mode='rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return BinaryPuzzle(mapped, mapped)
+
+class BinaryPuzzle():
+    '''
+    A wordsearch read from its binary form. It has the accessors of a
+    WordSearch which do not depend on the layout search, and get_grid() and
+    the render functions accept it in place of one.
+
+    Parameters
+
+    data - a bytes-like object holding the binary form
+    mapped - the mmap the data is read from, if any, closed by close()
+    '''
+
+    def __init__(self, data, mapped=None):
+        self._mapped = mapped
+        self._view = memoryview(data)
+        (magic, version, flags, itemsize, self._top, self._left, rows, cols,
+         n_graphemes, n_placed, n_unplaced, offset) = \
+            HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise Exception('not a binary wordsearch')
+        if version != VERSION:
+            raise Exception(f'unsupported binary wordsearch version {version}')
+        if itemsize not in _TYPECODES:
+            raise Exception(f'invalid square size {itemsize}')
+        self._bounded = bool(flags & BOUNDED)
+        self._bottom = self._top + rows - 1
+        self._right = self._left + cols - 1
+        self._cols = cols
+
+        self._raw = self._view[HEADER.size:offset]
+        if sys.byteorder == 'little' or itemsize == 1:
+            self._squares = self._raw.cast(_TYPECODES[itemsize])
+        else:
+            self._squares = array(_TYPECODES[itemsize], self._raw)
+            self._squares.byteswap()
+
+        self._graphemes = [None]
+        for _ in range(n_graphemes):
+            g, offset = self._read_str(offset)
+            self._graphemes.append(g)
+        seed, offset = self._read_str(offset)
+        self._seed = int(seed)
+        self._words_offset = offset
+        self._n_placed = n_placed
+        self._n_unplaced = n_unplaced
+        self._placements = None
+
+        # what the render functions use of a WordSearch
+        self._grid = self
+        self._stat_map = dict()
+
+    def _read_words(self):
+        '''Decode the placements and the unplaced words.'''
+        offset = self._words_offset
+        end = offset + self._n_placed * PLACEMENT.size
+        self._placements = dict()
+        squares, table, cols = self._squares, self._graphemes, self._cols
+        for row, col, d, length in \
+                PLACEMENT.iter_unpack(self._view[offset:end]):
+            d_row, d_col = solver.DIRECTIONS[DIRECTIONS[d]]
+            # walk the squares of the word by their flat index
+            i = (row - self._top) * cols + col - self._left
+            step = d_row * cols + d_col
+            w = ''.join([table[squares[j]]
+                         for j in range(i, i + step * length, step)])
+            self._placements[w] = ((row, col), DIRECTIONS[d], length)
+        self._placed_words = list(self._placements)
+        self._unplaced_words = []
+        offset = end
+        for _ in range(self._n_unplaced):
+            w, offset = self._read_str(offset)
+            self._unplaced_words.append(w)
+
+    @property
+    def _words(self):
+        return self.get_word_list() + self.get_unplaced_words()
+
+    def _read_str(self, offset):
+        (length,) = _LENGTH.unpack_from(self._view, offset)
+        offset += _LENGTH.size
+        return str(self._view[offset:offset + length], 'utf-8'), \
+            offset + length
+
+    def get(self, row, col):
+        '''Return the grapheme at (row, col), None for an empty square or one
+        outside the grid.
+        '''
+        if not (self._top <= row <= self._bottom and
+                self._left <= col <= self._right):
+            return None
+        return self._graphemes[self._squares[(row - self._top) * self._cols
+                                             + col - self._left]]
+
+    def get_squares(self):
+        '''Return the grapheme indices of the squares, row-major, as a
+        memoryview on the data where possible.
+        '''
+        return self._squares
+
+    def get_grapheme_table(self):
+        '''Return the graphemes indexed by the values of get_squares(). Index
+        0, the empty square, is None.
+        '''
+        return list(self._graphemes)
+
+    def get_placements(self):
+        '''Return a dictionary of each placed word to its (start square,
+        direction, number of graphemes).
+        '''
+        if self._placements is None:
+            self._read_words()
+        return dict(self._placements)
+
+    def get_grid(self, output_format='html'):
+        '''Get a string representation of the wordsearch as
+        WordSearch.get_grid().
+        '''
+        return ''.join(iter_grid(self, output_format))
+
+    def get_word_list(self):
+        if self._placements is None:
+            self._read_words()
+        return self._placed_words
+
+    def get_unplaced_words(self):
+        if self._placements is None:
+            self._read_words()
+        return self._unplaced_words
+
+    def get_seed(self):
+        return self._seed
+
+    def get_rows(self):
+        return self._bottom - self._top + 1
+
+    def get_cols(self):
+        return self._right - self._left + 1
+
+    def close(self):
+        '''Release the data, closing the file mapping if there is one.'''
+        if isinstance(self._squares, memoryview):
+            self._squares.release()
+        self._raw.release()
+        self._view.release()
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,268 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Dense grid storage for the puzzle layouts.
+
+Graphemes are interned to small integer IDs and the grid itself is a
+preallocated row-major array of those IDs, so checking whether a word fits
+is a run of integer comparisons rather than a series of dict lookups keyed by
+freshly allocated tuples. A per-grapheme position index records where each
+grapheme has been placed so that crossing candidates for a word can be found
+directly from the letters already on the grid.
+'''
+
+from array import array
+
+class Grid():
+    '''
+    A grid of grapheme IDs addressed by (row, col). Coordinates may be
+    negative; the backing array is re-allocated, doubling in the required
+    direction, whenever a placement falls outside the current capacity unless
+    the grid was created with fixed bounds.
+
+    Each square holds a word grapheme, a count of the placed words running
+    through it and, separately, a filler grapheme used only for display. Word
+    graphemes always take precedence over filler.
+
+    Parameters
+
+    rows - initial number of rows of capacity, or the exact number of rows
+           if fixed is True
+    cols - initial number of columns of capacity, or the exact number of
+           columns if fixed is True
+    top - the row coordinate of the first row
+    left - the column coordinate of the first column
+    fixed - if True the grid never grows and squares outside it never fit
+    '''
+    EMPTY = 0
+
+    def __init__(self, rows=16, cols=16, top=0, left=0, fixed=False):
+        self._fixed = fixed
+        self._row0 = top
+        self._col0 = left
+        self._nrows = max(rows, 1)
+        self._ncols = max(cols, 1)
+        size = self._nrows * self._ncols
+        self._cells = array('i', bytes(4 * size))
+        self._counts = array('i', bytes(4 * size))
+        self._filler = array('i', bytes(4 * size))
+
+        # grapheme interning: ID 0 is reserved for the empty square
+        self._graphemes = [None]
+        self._ids = dict()
+
+        # grapheme ID -> set of (row, col) squares holding it
+        self._positions = dict()
+
+    def intern(self, grapheme):
+        '''Return the integer ID for a grapheme, allocating one if this is the
+        first time it has been seen.
+        '''
+        gid = self._ids.get(grapheme)
+        if gid is None:
+            gid = len(self._graphemes)
+            self._graphemes.append(grapheme)
+            self._ids[grapheme] = gid
+        return gid
+
+    def intern_all(self, graphemes):
+        '''Return a tuple of IDs for a sequence of graphemes.'''
+        return tuple(self.intern(g) for g in graphemes)
+
+    def grapheme(self, gid):
+        '''Return the grapheme for an ID, None for the empty square.'''
+        return self._graphemes[gid]
+
+    def grapheme_table(self):
+        '''Return the list of interned graphemes indexed by ID. Index 0, the
+        empty square, is None.
+        '''
+        return list(self._graphemes)
+
+    def _index(self, row, col):
+        r = row - self._row0
+        c = col - self._col0
+        if 0 <= r < self._nrows and 0 <= c < self._ncols:
+            return r * self._ncols + c
+        return -1
+
+    def in_bounds(self, row, col):
+        '''True if (row, col) lies within the current capacity.'''
+        return self._index(row, col) >= 0
+
+    def get_id(self, row, col):
+        '''Return the ID of the word grapheme at (row, col), 0 if empty.'''
+        r = row - self._row0
+        c = col - self._col0
+        if 0 <= r < self._nrows and 0 <= c < self._ncols:
+            return self._cells[r * self._ncols + c]
+        return self.EMPTY
+
+    def get(self, row, col):
+        '''Return the grapheme displayed at (row, col): the word grapheme if
+        there is one, otherwise the filler grapheme, otherwise None.
+        '''
+        i = self._index(row, col)
+        if i < 0:
+            return None
+        gid = self._cells[i] or self._filler[i]
+        return self._graphemes[gid] if gid else None
+
+    def count(self, row, col):
+        '''Return the number of placed words running through (row, col).'''
+        i = self._index(row, col)
+        return self._counts[i] if i >= 0 else 0
+
+    def fits(self, ids, row, col, d_row, d_col):
+        '''Test whether a word fits starting at (row, col) and running in the
+        direction (d_row, d_col). A word fits if every square it would occupy
+        is empty or already holds the same grapheme.
+
+        Parameters
+
+        ids - the tuple of grapheme IDs of the word in text order
+        row, col - the square of the first grapheme
+        d_row, d_col - the step between successive graphemes, each -1, 0 or 1
+        '''
+        return self.first_conflict(ids, row, col, d_row, d_col) < 0
+
+    def first_conflict(self, ids, row, col, d_row, d_col):
+        '''As fits() but return the offset within the word of the first
+        grapheme which does not fit, or -1 if the whole word fits.
+        '''
+        n = len(ids)
+        r = row - self._row0
+        c = col - self._col0
+        end_r = r + d_row * (n - 1)
+        end_c = c + d_col * (n - 1)
+        nrows = self._nrows
+        ncols = self._ncols
+        cells = self._cells
+        if (0 <= r < nrows and 0 <= c < ncols and
+            0 <= end_r < nrows and 0 <= end_c < ncols):
+            # Entirely within the array - walk the flat index directly
+            i = r * ncols + c
+            step = d_row * ncols + d_col
+            for k in range(n):
+                v = cells[i]
+                if v and v != ids[k]:
+                    return k
+                i += step
+            return -1
+        # Partially outside the allocated area. Squares outside are empty
+        # unless the grid is fixed, in which case they never fit.
+        for k in range(n):
+            if 0 <= r < nrows and 0 <= c < ncols:
+                v = cells[r * ncols + c]
+                if v and v != ids[k]:
+                    return k
+            elif self._fixed:
+                return k
+            r += d_row
+            c += d_col
+        return -1
+
+    def place(self, ids, row, col, d_row, d_col):
+        '''Place a word on the grid. The caller must already have checked that
+        it fits. Returns the list of squares which were empty before this
+        placement.
+        '''
+        n = len(ids)
+        self._ensure(row, col)
+        self._ensure(row + d_row * (n - 1), col + d_col * (n - 1))
+        newly_filled = []
+        r, c = row, col
+        for gid in ids:
+            i = self._index(r, c)
+            if not self._cells[i]:
+                self._cells[i] = gid
+                self._filler[i] = self.EMPTY
+                self._positions.setdefault(gid, set()).add((r, c))
+                newly_filled.append((r, c))
+            self._counts[i] += 1
+            r += d_row
+            c += d_col
+        return newly_filled
+
+    def remove(self, ids, row, col, d_row, d_col):
+        '''Remove a previously placed word. Squares no longer used by any
+        word are emptied. Returns the list of squares freed.
+        '''
+        freed = []
+        r, c = row, col
+        for gid in ids:
+            i = self._index(r, c)
+            self._counts[i] -= 1
+            if self._counts[i] == 0:
+                self._cells[i] = self.EMPTY
+                self._positions[gid].discard((r, c))
+                freed.append((r, c))
+            r += d_row
+            c += d_col
+        return freed
+
+    def set_filler(self, row, col, gid):
+        '''Set the filler grapheme shown at an empty square.'''
+        self._ensure(row, col)
+        self._filler[self._index(row, col)] = gid
+
+    def positions(self, gid):
+        '''Return the set of squares currently holding grapheme gid.'''
+        return self._positions.get(gid, set())
+
+    def crossings(self, ids, directions):
+        '''Find the placements at which a word would cross at least one
+        grapheme already on the grid. Candidates are derived from the position
+        index of each of the word's graphemes and are then checked for fit.
+
+        Parameters
+
+        ids - the tuple of grapheme IDs of the word in text order
+        directions - an iterable of (d_row, d_col) steps to consider
+
+        Returns a dict mapping (row, col, d_row, d_col) starting placements to
+        the number of existing graphemes the word would share at that
+        placement.
+        '''
+        shared = dict()
+        for k, gid in enumerate(ids):
+            for (r, c) in self._positions.get(gid, ()):
+                for (d_row, d_col) in directions:
+                    key = (r - k * d_row, c - k * d_col, d_row, d_col)
+                    shared[key] = shared.get(key, 0) + 1
+        return {k: v for k, v in shared.items()
+                if self.fits(ids, k[0], k[1], k[2], k[3])}
+
+    def _ensure(self, row, col):
+        '''Grow the backing arrays so that (row, col) is addressable.'''
+        if self._index(row, col) >= 0:
+            return
+        if self._fixed:
+            raise IndexError(f'square {(row, col)} outside fixed grid')
+        top, left = self._row0, self._col0
+        bottom = top + self._nrows
+        right = left + self._ncols
+        while row < top:
+            top -= bottom - top
+        while row >= bottom:
+            bottom += bottom - top
+        while col < left:
+            left -= right - left
+        while col >= right:
+            right += right - left
+        nrows = bottom - top
+        ncols = right - left
+        size = nrows * ncols
+        arrays = []
+        for old in (self._cells, self._counts, self._filler):
+            new = array('i', bytes(4 * size))
+            for r in range(self._nrows):
+                src = r * self._ncols
+                dst = (r + self._row0 - top) * ncols + (self._col0 - left)
+                new[dst:dst + self._ncols] = old[src:src + self._ncols]
+            arrays.append(new)
+        self._cells, self._counts, self._filler = arrays
+        self._row0, self._col0 = top, left
+        self._nrows, self._ncols = nrows, ncols
@@ -0,0 +1,194 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Rendering of a wordsearch as HTML or JSON, one grid row at a time.
+
+Each format is a generator of string chunks, a header, one chunk per grid row
+and a footer, so a large grid is never held in memory as a whole string or as
+a list of cell objects. The chunks can be joined, written to any file-like
+object with write_grid() or to an asyncio stream with write_grid_async().
+
+Formats
+
+    html    - an HTML page with the grid as a table and the list of words
+    json    - a list of {"loc": [row, col], "grf": grapheme} objects, one per
+              filled square, as returned by get_grid('json')
+    compact - a row-major object,
+
+                {"top": 0, "left": -9,
+                 "rows": ["ab c", ...],
+                 "graphemes": {"a": "בְּ", "b": "רֵ", "c": "א", ...}}
+
+              with one string per row and one character per square. Each
+              character is a key in the graphemes table, and a space is an
+              empty square. This is several times smaller than json.
+'''
+
+import json
+
+FORMATS = ('html', 'json', 'compact')
+
+_HTML_HEAD = '''
+<html>
+ <head>
+  <meta charset="UTF-8">
+    <style>
+    div#wordsearch { float: left; width:50%;}
+    div#wordlist {float: left; margin-left: 20px;}
+    table { width: 100%; border-collapse: collapse;}
+    td { font-size: 200%;}
+    table, th, td { border: 1px solid black; }
+    ul {list-style-type: none;}
+  </style>
+</head>
+<body>
+'''
+
+_HTML_FOOT = '''
+</div>
+</div>
+</body>
+</html>
+'''
+
+# The characters used for the squares of the compact format in order. Those
+# which would need escaping in JSON, and the space which marks an empty square,
+# are left out.
+_COMPACT_ASCII = [chr(c) for c in range(0x21, 0x7f) if chr(c) not in '"\\']
+
+def _compact_code(n):
+    '''Return the character standing for the n-th distinct grapheme.'''
+    if n < len(_COMPACT_ASCII):
+        return _COMPACT_ASCII[n]
+    # continue from Latin Extended, well clear of the surrogates
+    return chr(0x100 + n - len(_COMPACT_ASCII))
+
+def grid_rows(ws):
+    '''Generate the row number and the graphemes, or None, of each row.'''
+    get = ws._grid.get
+    cols = range(ws._left, ws._right + 1)
+    for i in range(ws._top, ws._bottom + 1):
+        yield i, [get(i, j) for j in cols]
+
+def iter_html(ws, header=False):
+    '''Generate the HTML page of a wordsearch.
+
+    Parameters
+
+    ws - the wordsearch
+    header - if True include the number of words, grid extents and layout
+             statistics in the header
+    '''
+    yield _HTML_HEAD
+    if header:
+        yield (f'<div id="header">\n<h3>Wordsearch</h3>\n<ul>\n'
+               f'  <li>Number of words {len(ws._words)}.</li>\n'
+               f'  <li>top {ws._top} left {ws._left} bottom {ws._bottom} '
+               f'right {ws._right}</li>\n'
+               f'  <li>seed {ws.get_seed()}</li>\n'
+               + ''.join(f'<li>{s}={ws._stat_map.get(s)}</li>'
+                         for s in sorted(ws._stat_map.keys()))
+               + '</ul></div>')
+    else:
+        yield '<div id="header">\n<h3>Wordsearch</h3>\n'
+
+    # body including wordsearch grid and list of words
+    yield '<div id="main"><div id="wordsearch"><table border="1">'
+    for _, row in grid_rows(ws):
+        yield '<tr>' + ''.join('<td>.</td>' if g is None
+                               else f'<td align="center">{g}</td>'
+                               for g in row) + '</tr>'
+    yield '</table></div>'
+    yield '\n<div id="wordlist">\n<h3>Words to find</h3>\n<ul>'
+    yield ''.join(f'<li>{w}</li>' for w in sorted(ws._words))
+    yield '</ul></div>'
+    yield _HTML_FOOT
+
+def iter_json(ws):
+    '''Generate the per square JSON list of a wordsearch, the same text as
+    json.dumps() of the whole list.
+    '''
+    yield '['
+    sep = ''
+    for i, row in grid_rows(ws):
+        cells = [f'{{"loc": [{i}, {j}], "grf": '
+                 f'{json.dumps(g, ensure_ascii=False)}}}'
+                 for j, g in enumerate(row, ws._left) if g is not None]
+        if cells:
+            yield sep + ', '.join(cells)
+            sep = ', '
+    yield ']'
+
+def iter_compact(ws):
+    '''Generate the compact row-major JSON object of a wordsearch. The
+    grapheme table is built as the rows are written and comes last.
+    '''
+    codes = dict()
+    yield f'{{"top": {ws._top}, "left": {ws._left}, "rows": ['
+    sep = ''
+    for _, row in grid_rows(ws):
+        chars = []
+        for g in row:
+            if g is None:
+                chars.append(' ')
+                continue
+            c = codes.get(g)
+            if c is None:
+                c = codes[g] = _compact_code(len(codes))
+            chars.append(c)
+        yield sep + json.dumps(''.join(chars), ensure_ascii=False)
+        sep = ', '
+    yield '], "graphemes": '
+    yield json.dumps({c: g for g, c in codes.items()}, ensure_ascii=False)
+    yield '}'
+
+def iter_grid(ws, output_format='html', header=False):
+    '''Generate a wordsearch in one of FORMATS, row by row.
+
+    Parameters
+
+    ws - the wordsearch
+    output_format - html, json or compact
+    header - for html, include the grid statistics in the header
+    '''
+    if output_format == 'html':
+        return iter_html(ws, header)
+    elif output_format == 'json':
+        return iter_json(ws)
+    elif output_format == 'compact':
+        return iter_compact(ws)
+    raise Exception(f'unsupported output format {output_format}')
+
+def write_grid(ws, out, output_format='html', header=False):
+    '''Write a wordsearch to a file-like object a row at a time.
+
+    Parameters
+
+    ws - the wordsearch
+    out - an object with a write() method taking strings, such as a file
+          opened in text mode or sys.stdout
+    output_format - html, json or compact
+    header - for html, include the grid statistics in the header
+    '''
+    for chunk in iter_grid(ws, output_format, header):
+        out.write(chunk)
+
+async def write_grid_async(ws, writer, output_format='html', header=False,
+                           encoding='utf-8'):
+    '''Write a wordsearch to an asyncio stream a row at a time, waiting for
+    the stream to drain after each row so a slow reader is not buffered for.
+
+    Parameters
+
+    ws - the wordsearch
+    writer - an asyncio.StreamWriter or any object with write() taking bytes
+             and an awaitable drain()
+    output_format - html, json or compact
+    header - for html, include the grid statistics in the header
+    encoding - the encoding of the bytes written
+    '''
+    for chunk in iter_grid(ws, output_format, header):
+        writer.write(chunk.encode(encoding))
+        await writer.drain()
@@ -0,0 +1,317 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+A long running HTTP service which generates wordsearches.
+
+Starting a process per puzzle means loading the corpus and importing
+everything again for every request. The service loads both corpora once, in
+each of a pool of worker processes, and then serves requests of the form
+
+    GET /wordsearch?text=ETCBCH&verses=Gen+1:1-5
+    GET /wordsearch?text=ETCBCG&verses=Mat+1:1-6&rows=15&cols=15&format=html
+
+text and verses are as for the generate command, rows and cols give a
+bounded grid, of at most MAX_ROWS by MAX_COLS, and time_budget its search
+time, up to MAX_TIME_BUDGET seconds. seed, attempts and form are as for
+the --seed, --attempts and --form options of generate. format is
+json, the default, which returns get_grid('json'), compact or html, see
+puzzles.wordsearch.render. GET /health answers as soon as the service is
+up.
+
+The event loop only parses requests and writes responses. Generation runs in
+the worker processes so a slow grid never holds up other requests, and a
+request which takes longer than the timeout is answered with 504. The
+deadline of each request goes with it to the worker, which abandons the
+request once the deadline has passed, whether it was still waiting for a
+worker or being generated, so timed out requests do not keep the workers
+busy. The deadline is enforced with SIGALRM and so not on Windows.
+
+Only as much HTTP/1.1 as the service needs is implemented - GET requests,
+keep-alive and Content-Length. It is meant to sit behind a proper web
+server rather than face the internet directly.
+'''
+
+import asyncio
+import json
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit, parse_qs
+
+from puzzles.core.etcbc import preload, registry
+from puzzles.core.frequency import grapheme_frequencies
+from puzzles.core.normalize import FORMS, POINTED
+from puzzles.wordsearch.batch import JobTimeout
+from puzzles.wordsearch.wordsearch import WordSearch, make_wordsearch, \
+    text_corpus
+
+TEXTS = ('ETCBCH', 'ETCBCG')
+
+# Seconds to wait for a wordsearch before answering 504
+DEFAULT_TIMEOUT = 30.0
+
+# The most layout attempts one request may ask for
+MAX_ATTEMPTS = 16
+
+# The largest grid one request may ask for
+MAX_ROWS = 100
+MAX_COLS = 100
+
+# The most seconds one request may spend fitting words into its grid
+MAX_TIME_BUDGET = 10.0
+
+# The largest request body read, and discarded, in bytes
+MAX_BODY = 1 << 16
+
+CONTENT_TYPES = {'json': 'application/json; charset=utf-8',
+                 'compact': 'application/json; charset=utf-8',
+                 'html': 'text/html; charset=utf-8'}
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error',
+           504: 'Gateway Timeout'}
+
+class RequestError(Exception):
+    '''A request which cannot be served, with the HTTP status to answer.'''
+    def __init__(self, status, msg):
+        super().__init__(msg)
+        self.status = status
+
+def parse_params(query):
+    '''Parse and check the query string of a wordsearch request. Returns the
+    keyword arguments for _generate().
+
+    Parameters
+
+    query - the query string of the request URL
+    '''
+    params = {k: v[-1] for k, v in parse_qs(query).items()}
+    for key in ('text', 'verses'):
+        if key not in params:
+            raise RequestError(400, f'missing parameter {key}')
+    try:
+        text_corpus(params['text'])
+    except Exception:
+        raise RequestError(400, f'unknown text {params["text"]}')
+    output_format = params.get('format', 'json')
+    if output_format not in CONTENT_TYPES:
+        raise RequestError(400, f'unsupported format {output_format}')
+    form = params.get('form', POINTED)
+    if form not in FORMS:
+        raise RequestError(400, f'unknown form {form}')
+    if ('rows' in params) != ('cols' in params):
+        raise RequestError(400, 'rows and cols must be given together')
+    try:
+        rows = int(params['rows']) if 'rows' in params else None
+        cols = int(params['cols']) if 'cols' in params else None
+        time_budget = float(params.get('time_budget',
+                                       WordSearch.DEFAULT_TIME_BUDGET))
+        seed = int(params['seed']) if 'seed' in params else None
+        attempts = int(params.get('attempts', 1))
+    except ValueError as e:
+        raise RequestError(400, str(e))
+    if not 1 <= attempts <= MAX_ATTEMPTS:
+        raise RequestError(400, f'attempts must be from 1 to {MAX_ATTEMPTS}')
+    if rows is not None and not 1 <= rows <= MAX_ROWS:
+        raise RequestError(400, f'rows must be from 1 to {MAX_ROWS}')
+    if cols is not None and not 1 <= cols <= MAX_COLS:
+        raise RequestError(400, f'cols must be from 1 to {MAX_COLS}')
+    if not 0 < time_budget <= MAX_TIME_BUDGET:
+        raise RequestError(400, f'time_budget must be more than 0 and at most '
+                                f'{MAX_TIME_BUDGET}')
+    return {'text_name': params['text'], 'verses': params['verses'],
+            'rows': rows, 'cols': cols, 'time_budget': time_budget,
+            'seed': seed, 'attempts': attempts,
+            'form': form, 'output_format': output_format}
+
+def _alarm(signum, frame):
+    raise JobTimeout()
+
+def _init_worker(texts, memory_limit=None):
+    '''Load the corpora once per worker process.'''
+    registry.memory_limit = memory_limit
+    if hasattr(signal, 'SIGALRM'):
+        signal.signal(signal.SIGALRM, _alarm)
+    for text_name in texts:
+        corpus = text_corpus(text_name)[0]
+        preload(corpus)
+        grapheme_frequencies(corpus)
+
+def _generate(text_name, verses, rows, cols, time_budget, seed, attempts,
+              form, output_format, deadline=None):
+    '''Build a wordsearch in a worker process and return it in the requested
+    format. The layout attempts are all made in the worker, the other
+    workers being busy with other requests. JobTimeout is raised if the
+    deadline, a time.time() value, passes first.
+    '''
+    timed = deadline is not None and hasattr(signal, 'SIGALRM')
+    if timed:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise JobTimeout()
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        ws = make_wordsearch(text_name, verses, rows, cols, time_budget,
+                             seed, attempts, processes=1, form=form)
+        return ws.get_grid(output_format)
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+class WordSearchService():
+    '''
+    The wordsearch HTTP service.
+
+    Parameters
+
+    host - the address to listen on
+    port - the port to listen on, 0 for any free port
+    processes - the number of worker processes, by default one per core
+    texts - the texts to load before serving requests
+    timeout - seconds to wait for a wordsearch before answering 504
+    memory_limit - the bytes of loaded corpora each process may keep, None
+                   for no limit
+    '''
+
+    def __init__(self, host='127.0.0.1', port=8080, processes=None,
+                 texts=TEXTS, timeout=DEFAULT_TIMEOUT, memory_limit=None):
+        self._host = host
+        self._port = port
+        self._processes = processes
+        self._texts = tuple(texts)
+        self._timeout = timeout
+        self._memory_limit = memory_limit
+        self._pool = None
+        self._server = None
+
+    async def start(self):
+        '''Load the corpora, start the workers and begin listening. Returns
+        the (host, port) the service is listening on.
+        '''
+        # Loading here first means any missing word cache is built once and,
+        # where workers are forked, the loaded corpora are shared with them.
+        _init_worker(self._texts, self._memory_limit)
+        registry.share()
+        self._pool = ProcessPoolExecutor(self._processes,
+                                         initializer=_init_worker,
+                                         initargs=(self._texts,
+                                                   self._memory_limit))
+        # Start the workers before there are any client connections. Forked
+        # workers would otherwise inherit the sockets open at the time and
+        # keep them open after the service has closed them.
+        await asyncio.get_running_loop().run_in_executor(self._pool, int)
+        registry.unshare()
+        self._server = await asyncio.start_server(self._handle, self._host,
+                                                  self._port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        '''Stop listening and shut down the workers.'''
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def serve_forever(self):
+        '''Start the service and serve requests until cancelled.'''
+        host, port = await self.start()
+        print(f'serving wordsearches on http://{host}:{port}/', flush=True)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _dispatch(self, method, target):
+        '''Serve one request, returning the status, content type and body.'''
+        url = urlsplit(target)
+        if url.path == '/health':
+            return 200, CONTENT_TYPES['json'], '{"status": "ok"}'
+        if url.path != '/wordsearch':
+            raise RequestError(404, f'no such resource {url.path}')
+        if method != 'GET':
+            raise RequestError(405, f'{method} not supported')
+        params = parse_params(url.query)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._pool, partial(_generate, **params,
+                                deadline=time.time() + self._timeout))
+        try:
+            body = await asyncio.wait_for(future, self._timeout)
+        except (asyncio.TimeoutError, JobTimeout):
+            return 504, CONTENT_TYPES['json'], \
+                json.dumps({'error': 'wordsearch generation timed out'})
+        except Exception as e:
+            return 500, CONTENT_TYPES['json'], json.dumps({'error': repr(e)})
+        return 200, CONTENT_TYPES[params['output_format']], body
+
+    async def _handle(self, reader, writer):
+        '''Serve the requests on one connection.'''
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = dict()
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                # a body which cannot be read ends the connection
+                body_ok = 0 <= length <= MAX_BODY
+                if body_ok and length:
+                    await reader.readexactly(length)
+
+                keep_alive = False
+                try:
+                    if not body_ok:
+                        raise RequestError(400, 'invalid Content-Length')
+                    method, target, version = \
+                        request_line.decode('latin-1').split()
+                    keep_alive = version == 'HTTP/1.1' and \
+                        headers.get('connection', '').lower() != 'close'
+                    status, content_type, body = \
+                        await self._dispatch(method, target)
+                except RequestError as e:
+                    status, content_type = e.status, CONTENT_TYPES['json']
+                    body = json.dumps({'error': str(e)})
+                except ValueError:
+                    status, content_type = 400, CONTENT_TYPES['json']
+                    body = json.dumps({'error': 'malformed request'})
+
+                data = body.encode('utf-8')
+                connection = 'keep-alive' if keep_alive else 'close'
+                header = (f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                          f'Content-Type: {content_type}\r\n'
+                          f'Content-Length: {len(data)}\r\n'
+                          f'Connection: {connection}\r\n\r\n')
+                writer.write(header.encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+def main_serve(args):
+    '''Run the serve command from its parsed command line arguments.'''
+    service = WordSearchService(args.host, args.port, args.processes,
+                                timeout=args.timeout,
+                                memory_limit=args.memory_limit)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,208 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Find the words in a finished wordsearch grid.
+
+The words are compiled into one Aho-Corasick automaton over their grapheme
+sequences, forwards and reversed, and every row, column and diagonal of the
+grid is then scanned once through it. A reversed match is the word running
+the other way along the line, so the four scans cover all eight directions,
+and the time taken grows with the size of the grid rather than with the
+number of words times squares times directions.
+
+Directions are named as for the wordsearch layout, R for right, LD for left
+and down and so on, and are listed in DIRECTIONS.
+'''
+
+from puzzles.core.graphemes import graphemes
+from puzzles.wordsearch.render import grid_rows
+
+# (row, col) step of each direction a word may run in
+DIRECTIONS = {'R': (0, 1),
+              'L': (0, -1),
+              'D': (1, 0),
+              'U': (-1, 0),
+              'RD': (1, 1),
+              'LU': (-1, -1),
+              'LD': (1, -1),
+              'RU': (-1, 1)}
+
+_NAMES = {step: name for name, step in DIRECTIONS.items()}
+
+class Solver():
+    '''
+    A multi-word search over wordsearch grids.
+
+    Parameters
+
+    words - the words to look for. Words of no graphemes are ignored.
+    '''
+
+    def __init__(self, words):
+        self._words = []
+        self._symbols = dict()
+        # the automaton: goto transitions, failure links and, for each
+        # state, the (word index, reversed) patterns which end there
+        self._goto = [dict()]
+        self._fail = [0]
+        self._out = [[]]
+        for w in dict.fromkeys(words):
+            g_s = graphemes(w)
+            if not g_s:
+                continue
+            n = len(self._words)
+            self._words.append((w, len(g_s)))
+            self._add(g_s, (n, False))
+            # a palindrome reversed is the same match
+            if g_s[::-1] != g_s:
+                self._add(g_s[::-1], (n, True))
+        self._link()
+
+    def _add(self, g_s, pattern):
+        '''Add the path for a grapheme sequence to the trie.'''
+        s = 0
+        for g in g_s:
+            c = self._symbols.setdefault(g, len(self._symbols))
+            nxt = self._goto[s].get(c)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[s][c] = nxt
+                self._goto.append(dict())
+                self._fail.append(0)
+                self._out.append([])
+            s = nxt
+        self._out[s].append(pattern)
+
+    def _link(self):
+        '''Set the failure links breadth first and merge the outputs along
+        them, so each state lists every pattern ending at it.
+        '''
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        for s in queue:
+            for c, nxt in goto[s].items():
+                f = fail[s]
+                while f and c not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(c, 0)
+                fail[nxt] = f
+                out[nxt] = out[nxt] + out[f]
+                queue.append(nxt)
+
+    def _scan(self, line, squares, step, found):
+        '''Run one grid line through the automaton.
+
+        Parameters
+
+        line - the symbols of the line, -1 for a grapheme in no word
+        squares - the (row, col) square of each symbol
+        step - the (row, col) step along the line
+        found - the dictionary of results to add the matches to
+        '''
+        goto, fail, out = self._goto, self._fail, self._out
+        s = 0
+        for p, c in enumerate(line):
+            if c < 0:
+                s = 0
+                continue
+            while s and c not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(c, 0)
+            for n, reverse in out[s]:
+                word, length = self._words[n]
+                if length == 1 and step != (0, 1):
+                    # a single grapheme is reported once, as running right
+                    continue
+                if reverse:
+                    square = squares[p]
+                    d = (-step[0], -step[1])
+                else:
+                    square = squares[p - length + 1]
+                    d = step
+                found.setdefault(word, []).append((square, _NAMES[d]))
+
+    def find_rows(self, rows, top=0, left=0):
+        '''Find the words in a grid given as rows of graphemes. Returns a
+        dictionary of each word found to the list of its (square, direction)
+        occurrences, where square is the (row, col) of the first grapheme.
+
+        Parameters
+
+        rows - a sequence of equal length sequences of graphemes. An empty
+               square is None.
+        top - the row number of the first row
+        left - the column number of the first column
+        '''
+        symbols = self._symbols
+        cells = [[symbols.get(g, -1) if g is not None else -1 for g in row]
+                 for row in rows]
+        n_rows = len(cells)
+        n_cols = len(cells[0]) if cells else 0
+        found = dict()
+
+        def scan(start_row, start_col, d_row, d_col):
+            line = []
+            squares = []
+            r, c = start_row, start_col
+            while 0 <= r < n_rows and 0 <= c < n_cols:
+                line.append(cells[r][c])
+                squares.append((top + r, left + c))
+                r += d_row
+                c += d_col
+            self._scan(line, squares, (d_row, d_col), found)
+
+        for r in range(n_rows):
+            scan(r, 0, 0, 1)
+        for c in range(n_cols):
+            scan(0, c, 1, 0)
+        # diagonals start on the top row and down the first or last column
+        for c in range(n_cols):
+            scan(0, c, 1, 1)
+            scan(0, c, 1, -1)
+        for r in range(1, n_rows):
+            scan(r, 0, 1, 1)
+            scan(r, n_cols - 1, 1, -1)
+        return found
+
+    def find_lines(self, get, lines):
+        '''Find the words along some of the lines of a grid only, as
+        find_rows(). Each line is scanned in both directions, so a word is
+        found along the line whichever way it runs.
+
+        Parameters
+
+        get - a function of (row, col) returning the grapheme there or None
+        lines - an iterable of (row, col, d_row, d_col, length), the first
+                square, the step and the number of squares of each line
+        '''
+        symbols = self._symbols
+        found = dict()
+        for row, col, d_row, d_col, length in lines:
+            squares = [(row + k * d_row, col + k * d_col)
+                       for k in range(length)]
+            line = []
+            for sq in squares:
+                g = get(*sq)
+                line.append(symbols.get(g, -1) if g is not None else -1)
+            self._scan(line, squares, (d_row, d_col), found)
+        return found
+
+    def solve(self, ws):
+        '''Find the words in a WordSearch, filler included, as find_rows().'''
+        return self.find_rows([row for _, row in grid_rows(ws)], ws._top,
+                              ws._left)
+
+def solve(ws, words=None):
+    '''Find the words of a WordSearch in its grid. Returns a dictionary as
+    Solver.find_rows(). A placed word appears at least once. More than one
+    occurrence means the same word was also made elsewhere, by crossing
+    words or by the filler.
+
+    Parameters
+
+    ws - the wordsearch
+    words - the words to look for, by default the placed words
+    '''
+    return Solver(ws.get_word_list() if words is None else words).solve(ws)
@@ -0,0 +1,100 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+
+Statistics gathered while generating a wordsearch, to show where the time
+goes for a particular passage.
+'''
+
+import json
+
+class LayoutStats():
+    '''
+    Timings and counts from the generation of one wordsearch.
+
+    segment_time - seconds spent splitting the words into graphemes
+    place_time - seconds spent laying the words out on the grid
+    fill_time - seconds spent filling the empty squares
+    words - for each word, a dictionary of
+                probed - the starting squares, or in a bounded grid the
+                         placements, tried for the word
+                skipped - the starting squares passed over without being
+                          tried because the word could not start there
+                retries - the placements tried which failed, directions
+                          which did not fit or, in a bounded grid,
+                          placements undone by the search
+    placed - the number of words placed in each direction
+    rows, cols - the size of the grid
+    word_squares - the number of squares holding part of a word
+    filler_redrawn - the number of filler graphemes drawn again because they
+                     spelled one of the words
+    '''
+
+    def __init__(self):
+        self.segment_time = 0.0
+        self.place_time = 0.0
+        self.fill_time = 0.0
+        self.words = dict()
+        self.placed = dict()
+        self.rows = 0
+        self.cols = 0
+        self.word_squares = 0
+        self.filler_redrawn = 0
+
+    def word(self, word):
+        '''Return the counters of a word, creating them if need be.'''
+        counters = self.words.get(word)
+        if counters is None:
+            counters = self.words[word] = {'probed': 0, 'skipped': 0,
+                                           'retries': 0}
+        return counters
+
+    @property
+    def total_time(self):
+        return self.segment_time + self.place_time + self.fill_time
+
+    @property
+    def squares_probed(self):
+        return sum(c['probed'] for c in self.words.values())
+
+    @property
+    def squares_skipped(self):
+        return sum(c['skipped'] for c in self.words.values())
+
+    @property
+    def direction_retries(self):
+        return sum(c['retries'] for c in self.words.values())
+
+    @property
+    def density(self):
+        '''The fraction of the grid squares which hold part of a word.'''
+        squares = self.rows * self.cols
+        return self.word_squares / squares if squares else 0.0
+
+    def slowest_words(self, n=10):
+        '''Return the n words which took the most probes and retries to
+        place, as (word, counters) pairs, most first.
+        '''
+        return sorted(self.words.items(),
+                      key=lambda w: -(w[1]['probed'] + w[1]['retries']))[:n]
+
+    def to_dict(self):
+        '''Return the statistics as a dictionary of plain values.'''
+        return {'segment_time': self.segment_time,
+                'place_time': self.place_time,
+                'fill_time': self.fill_time,
+                'total_time': self.total_time,
+                'rows': self.rows,
+                'cols': self.cols,
+                'density': self.density,
+                'squares_probed': self.squares_probed,
+                'squares_skipped': self.squares_skipped,
+                'direction_retries': self.direction_retries,
+                'filler_redrawn': self.filler_redrawn,
+                'placed': dict(self.placed),
+                'words': {w: dict(c) for w, c in self.words.items()}}
+
+    def to_json(self, indent=None):
+        '''Return the statistics as a JSON string.'''
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
@@ -0,0 +1,68 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import json
+import os
+import tempfile
+import unittest
+from puzzles.wordsearch.batch import read_manifest, run_batch
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def writeManifest(self, lines):
+        path = os.path.join(self.tmp.name, 'manifest.jsonl')
+        with open(path, mode='w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+        return path
+
+    def testReadManifest(self):
+        jobs = read_manifest(self.writeManifest([
+            '# Genesis',
+            '{"id": "gen 1", "text": "ETCBCH", "verses": "Genesis 1:1-3"}',
+            '',
+            '{"text": "ETCBCG", "verses": "Luke 1:2", "rows": 8, "cols": 8}']))
+        self.assertEqual([j['id'] for j in jobs], ['gen 1', '4'])
+        self.assertEqual(jobs[1]['rows'], 8)
+
+    def testReadManifestErrors(self):
+        for line in ['{"text": "ETCBCH"}',
+                     '{"text": "LXX", "verses": "Genesis 1:1"}',
+                     '{"text": "ETCBCH", "verses": "Genesis 1:1", "rows": 8}',
+                     '{"text": "ETCBCH", "verses": "Genesis 1:1", '
+                     '"format": "pdf"}',
+                     'not json']:
+            with self.assertRaises(Exception, msg=line):
+                read_manifest(self.writeManifest([line]))
+
+    def testRunBatch(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        jobs = read_manifest(self.writeManifest([
+            '{"id": "gen", "text": "ETCBCH", "verses": "Genesis 1:1-3"}',
+            '{"id": "luke", "text": "ETCBCG", "verses": "Luke 1:2,5", '
+            '"rows": 12, "cols": 12, "format": "json"}',
+            '{"id": "bad", "text": "ETCBCH", "verses": "Nowhere 99:1"}']))
+        results = []
+        summary = run_batch(jobs, out_dir, processes=2, timeout=30,
+                            report=results.append)
+
+        self.assertEqual(summary['jobs'], 3)
+        self.assertEqual(summary['ok'], 2)
+        self.assertEqual(summary['error'], 1)
+        self.assertGreater(summary['puzzles_per_sec'], 0)
+        self.assertEqual(sorted(r['id'] for r in results),
+                         ['bad', 'gen', 'luke'])
+        self.assertEqual(sorted(os.listdir(out_dir)), ['gen.html', 'luke.json'])
+        with open(os.path.join(out_dir, 'luke.json'), encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 144)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
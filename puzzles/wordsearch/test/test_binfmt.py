@@ -0,0 +1,70 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import os
+import tempfile
+import unittest
+from puzzles.wordsearch import binfmt
+from puzzles.wordsearch.wordsearch import WordSearch
+
+class Test(unittest.TestCase):
+
+    words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ',
+             'Ἀβραάμ', 'τὸν', 'δὲ']
+
+    def testRoundTrip(self):
+        for direction in (WordSearch.LTR, WordSearch.RTL):
+            ws = WordSearch(self.words, None, None, direction, seed=3)
+            puzzle = binfmt.loads(binfmt.dumps(ws))
+
+            for output_format in ('html', 'json', 'compact'):
+                self.assertEqual(puzzle.get_grid(output_format),
+                                 ws.get_grid(output_format),
+                                 f'{output_format} output differs')
+            self.assertEqual(puzzle.get_word_list(), ws.get_word_list())
+            self.assertEqual(puzzle.get_seed(), 3)
+            self.assertEqual((puzzle.get_rows(), puzzle.get_cols()),
+                             (ws.get_rows(), ws.get_cols()))
+            self.assertEqual(puzzle.get_placements(),
+                             {w: (square, cur_dir, len(g_ids))
+                              for w, (g_ids, square, cur_dir)
+                              in ws._placements.items()})
+
+    def testBounded(self):
+        ws = WordSearch(self.words, 5, 5, WordSearch.LTR, bounded=True,
+                        seed=1)
+        puzzle = binfmt.loads(binfmt.dumps(ws))
+
+        self.assertEqual(puzzle.get_unplaced_words(),
+                         ws.get_unplaced_words())
+        self.assertEqual(puzzle.get_grid('json'), ws.get_grid('json'))
+
+    def testLoadFile(self):
+        ws = WordSearch(self.words, None, None, WordSearch.LTR, seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'puzzle.wsb')
+            binfmt.dump(ws, path)
+            with binfmt.load(path) as puzzle:
+                self.assertIsInstance(puzzle.get_squares(), memoryview)
+                table = puzzle.get_grapheme_table()
+                self.assertEqual(table[puzzle.get_squares()[0]],
+                                 ws._grid.get(0, 0))
+                self.assertEqual(puzzle.get(ws._top, ws._left),
+                                 ws._grid.get(ws._top, ws._left))
+                self.assertIsNone(puzzle.get(ws._bottom + 1, 0))
+            # the squares take a byte each and follow the header
+            self.assertLess(os.path.getsize(path),
+                            len(ws.get_grid('compact').encode('utf-8')))
+
+    def testInvalid(self):
+        data = bytearray(binfmt.dumps(WordSearch(['δὲ'], None, None,
+                                                 WordSearch.LTR, seed=1)))
+        self.assertRaises(Exception, binfmt.loads, b'WSXX' + data[4:])
+        data[4] = binfmt.VERSION + 1
+        self.assertRaises(Exception, binfmt.loads, data)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,74 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import unittest
+from puzzles.wordsearch.grid import Grid
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = Grid(rows=2, cols=2)
+        self.word = self.grid.intern_all(['a', 'b', 'c'])
+
+    def tearDown(self):
+        pass
+
+    def testIntern(self):
+        self.assertEqual(self.word, (1, 2, 3), 'incorrect grapheme ids')
+        self.assertEqual(self.grid.intern('b'), 2, 'id not reused')
+        self.assertEqual(self.grid.grapheme(3), 'c', 'incorrect grapheme')
+
+    def testPlaceGrows(self):
+        self.assertTrue(self.grid.fits(self.word, 0, 0, 1, 1))
+        self.grid.place(self.word, 0, 0, 1, 1)
+        self.assertEqual(self.grid.get(2, 2), 'c', 'grid did not grow')
+        self.grid.place(self.word, 0, 0, 0, -1)
+        self.assertEqual(self.grid.get(0, -2), 'c', 'grid did not grow left')
+        self.assertEqual(self.grid.get(2, 2), 'c', 'content lost on growth')
+
+    def testFits(self):
+        self.grid.place(self.word, 0, 0, 0, 1)
+        crossing = self.grid.intern_all(['x', 'b', 'y'])
+        self.assertTrue(self.grid.fits(crossing, -1, 1, 1, 0),
+                        'crossing on a shared grapheme should fit')
+        self.assertFalse(self.grid.fits(crossing, 0, 0, 1, 0),
+                         'conflicting grapheme should not fit')
+        self.assertEqual(self.grid.first_conflict(crossing, 1, -1, -1, 1), 1,
+                         'incorrect conflict offset')
+
+    def testFixedBounds(self):
+        grid = Grid(rows=3, cols=3, fixed=True)
+        word = grid.intern_all(['a', 'b', 'c'])
+        self.assertTrue(grid.fits(word, 0, 0, 0, 1))
+        self.assertFalse(grid.fits(word, 0, 1, 0, 1),
+                         'word running off a fixed grid should not fit')
+
+    def testRemove(self):
+        self.grid.place(self.word, 0, 0, 0, 1)
+        crossing = self.grid.intern_all(['x', 'b'])
+        self.grid.place(crossing, -1, 1, 1, 0)
+        freed = self.grid.remove(self.word, 0, 0, 0, 1)
+        self.assertEqual(sorted(freed), [(0, 0), (0, 2)],
+                         'shared square should not be freed')
+        self.assertEqual(self.grid.get(0, 1), 'b', 'shared square emptied')
+        self.assertEqual(self.grid.positions(3), set(), 'index not updated')
+
+    def testCrossings(self):
+        self.grid.place(self.word, 0, 0, 0, 1)
+        crossing = self.grid.intern_all(['x', 'b', 'c'])
+        found = self.grid.crossings(crossing, [(1, 0), (0, 1)])
+        self.assertEqual(found, {(-1, 1, 1, 0): 1, (-2, 2, 1, 0): 1},
+                         'incorrect crossing candidates')
+
+    def testFiller(self):
+        self.grid.place(self.word, 0, 0, 0, 1)
+        self.grid.set_filler(1, 1, self.grid.intern('z'))
+        self.assertEqual(self.grid.get(1, 1), 'z', 'filler not shown')
+        self.assertEqual(self.grid.get_id(1, 1), Grid.EMPTY,
+                         'filler should not occupy the square')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
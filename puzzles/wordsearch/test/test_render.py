@@ -0,0 +1,100 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import asyncio
+import io
+import json
+import unittest
+from puzzles.wordsearch.grid import Grid
+from puzzles.wordsearch.render import iter_grid, write_grid, \
+    write_grid_async
+from puzzles.wordsearch.wordsearch import WordSearch
+
+WORDS = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ', 'Ἀβραάμ',
+         'ἐγέννησεν', 'τὸν', 'Ἰσαάκ', 'δὲ', 'Ἰακώβ', 'Ἰούδαν', 'καὶ', 'τοὺς',
+         'ἀδελφοὺς', 'αὐτοῦ', 'Φαρὲς', 'Ζάρα', 'ἐκ', 'τῆς', 'Θαμάρ']
+
+class StreamWriter():
+    '''Collects what is written as an asyncio.StreamWriter would send it.'''
+    def __init__(self):
+        self.data = b''
+        self.drains = 0
+    def write(self, data):
+        self.data += data
+    async def drain(self):
+        self.drains += 1
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.ws = WordSearch(WORDS, None, None, WordSearch.LTR, seed=1)
+        # clear the filler from the first square not part of a word to check
+        # empty squares are rendered as such
+        ws, grid = self.ws, self.ws._grid
+        self.empty = next((i, j) for i in range(ws._top, ws._bottom + 1)
+                          for j in range(ws._left, ws._right + 1)
+                          if grid.get_id(i, j) == Grid.EMPTY)
+        grid.set_filler(*self.empty, Grid.EMPTY)
+
+    def squares(self):
+        ws = self.ws
+        return [[ws._grid.get(i, j) for j in range(ws._left, ws._right + 1)]
+                for i in range(ws._top, ws._bottom + 1)]
+
+    def testJson(self):
+        ws = self.ws
+        expected = [{'loc': [i, j], 'grf': ws._grid.get(i, j)}
+                    for i in range(ws._top, ws._bottom + 1)
+                    for j in range(ws._left, ws._right + 1)
+                    if ws._grid.get(i, j) is not None]
+        self.assertEqual(ws.get_grid('json'),
+                         json.dumps(expected, ensure_ascii=False))
+
+    def testCompact(self):
+        compact = json.loads(self.ws.get_grid('compact'))
+        self.assertEqual((compact['top'], compact['left']),
+                         (self.ws._top, self.ws._left))
+        table = compact['graphemes']
+        self.assertNotIn(' ', table)
+        self.assertEqual([[None if c == ' ' else table[c] for c in row]
+                          for row in compact['rows']], self.squares())
+        self.assertIsNone(self.squares()[self.empty[0] - self.ws._top]
+                                        [self.empty[1] - self.ws._left])
+        self.assertLess(len(self.ws.get_grid('compact')),
+                        len(self.ws.get_grid('json')) / 3)
+
+    def testHtml(self):
+        html = self.ws.get_grid('html')
+        self.assertEqual(html.count('<tr>'), self.ws.get_rows())
+        self.assertEqual(html.count('<td'),
+                         self.ws.get_rows() * self.ws.get_cols())
+        self.assertEqual(html.count('<li>'), len(WORDS))
+        self.assertNotIn('placedR', html)
+        out = io.StringIO()
+        write_grid(self.ws, out, 'html', header=True)
+        self.assertIn('placedR', out.getvalue())
+
+    def testWriteGrid(self):
+        for output_format in ('html', 'json', 'compact'):
+            out = io.StringIO()
+            write_grid(self.ws, out, output_format)
+            self.assertEqual(out.getvalue(), self.ws.get_grid(output_format))
+
+    def testWriteGridAsync(self):
+        for output_format in ('html', 'json', 'compact'):
+            writer = StreamWriter()
+            asyncio.run(write_grid_async(self.ws, writer, output_format))
+            self.assertEqual(writer.data.decode('utf-8'),
+                             self.ws.get_grid(output_format))
+            # at least one drain per row
+            self.assertGreater(writer.drains, self.ws.get_rows())
+
+    def testUnsupportedFormat(self):
+        with self.assertRaises(Exception):
+            list(iter_grid(self.ws, 'pdf'))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
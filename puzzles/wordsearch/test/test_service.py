@@ -0,0 +1,110 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import asyncio
+import json
+import time
+import unittest
+from puzzles.wordsearch.batch import JobTimeout
+from puzzles.wordsearch.service import MAX_ATTEMPTS, MAX_COLS, MAX_ROWS, \
+    MAX_TIME_BUDGET, RequestError, WordSearchService, _generate, parse_params
+
+class Test(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # The corpora are loaded on first use rather than up front so that
+        # only testWordsearch needs the Text-Fabric data
+        self.service = WordSearchService(port=0, processes=1, texts=())
+        self.host, self.port = await self.service.start()
+
+    async def asyncTearDown(self):
+        await self.service.stop()
+
+    async def get(self, target):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(f'GET {target} HTTP/1.1\r\nConnection: close\r\n\r\n'
+                     .encode('latin-1'))
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        return int(head.split()[1]), json.loads(body.decode('utf-8'))
+
+    def testParseParams(self):
+        params = parse_params('text=ETCBCG&verses=Luke+1:2&rows=8&cols=9')
+        self.assertEqual(params['verses'], 'Luke 1:2')
+        self.assertEqual((params['rows'], params['cols']), (8, 9))
+        self.assertEqual(params['output_format'], 'json')
+        self.assertEqual(params['form'], 'pointed')
+        params = parse_params('text=ETCBCH&verses=Gen+1:1&form=consonantal')
+        self.assertEqual(params['form'], 'consonantal')
+
+    def testParseParamsErrors(self):
+        for query in ['verses=Luke+1:2', 'text=LXX&verses=Luke+1:2',
+                      'text=ETCBCG&verses=Luke+1:2&rows=8',
+                      'text=ETCBCG&verses=Luke+1:2&rows=8&cols=x',
+                      'text=ETCBCG&verses=Luke+1:2&format=pdf',
+                      'text=ETCBCG&verses=Luke+1:2&form=bare']:
+            with self.assertRaises(RequestError, msg=query) as cm:
+                parse_params(query)
+            self.assertEqual(cm.exception.status, 400)
+
+    def testParseParamsLimits(self):
+        base = 'text=ETCBCG&verses=Luke+1:2'
+        params = parse_params(f'{base}&rows={MAX_ROWS}&cols={MAX_COLS}'
+                              f'&time_budget={MAX_TIME_BUDGET}')
+        self.assertEqual((params['rows'], params['cols']),
+                         (MAX_ROWS, MAX_COLS))
+        self.assertEqual(params['time_budget'], MAX_TIME_BUDGET)
+        for query in [f'rows={MAX_ROWS + 1}&cols=8', 'rows=0&cols=8',
+                      'rows=-8&cols=8', f'rows=8&cols={MAX_COLS + 1}',
+                      'rows=8&cols=0', 'rows=8&cols=-8',
+                      f'time_budget={MAX_TIME_BUDGET + 1}', 'time_budget=0',
+                      'time_budget=-1', 'time_budget=nan',
+                      f'attempts={MAX_ATTEMPTS + 1}', 'attempts=0']:
+            with self.assertRaises(RequestError, msg=query) as cm:
+                parse_params(f'{base}&{query}')
+            self.assertEqual(cm.exception.status, 400)
+
+    async def testHealth(self):
+        self.assertEqual(await self.get('/health'), (200, {'status': 'ok'}))
+
+    async def testErrors(self):
+        status, _ = await self.get('/nowhere')
+        self.assertEqual(status, 404)
+        status, body = await self.get('/wordsearch?text=LXX&verses=Gen+1:1')
+        self.assertEqual(status, 400)
+        self.assertIn('LXX', body['error'])
+
+    async def testBadContentLength(self):
+        for length in ['x', '-1', str(1 << 30)]:
+            reader, writer = await asyncio.open_connection(self.host,
+                                                           self.port)
+            writer.write(f'GET /health HTTP/1.1\r\nContent-Length: {length}'
+                         '\r\n\r\n'.encode('latin-1'))
+            response = await reader.read()
+            writer.close()
+            head, _, body = response.partition(b'\r\n\r\n')
+            self.assertEqual(int(head.split()[1]), 400, length)
+            self.assertIn(b'Connection: close', head)
+        # the service is still up
+        self.assertEqual(await self.get('/health'), (200, {'status': 'ok'}))
+
+    def testDeadline(self):
+        # a request whose deadline passed while it waited is not generated
+        with self.assertRaises(JobTimeout):
+            _generate('ETCBCG', 'Luke 1:2', None, None, 1.0, 1, 1,
+                      'pointed', 'json', deadline=time.time() - 1)
+
+    async def testWordsearch(self):
+        results = await asyncio.gather(*[
+            self.get('/wordsearch?text=ETCBCG&verses=Luke+1:2,5'
+                     '&rows=12&cols=12') for _ in range(4)])
+        for status, grid in results:
+            self.assertEqual(status, 200)
+            self.assertEqual(len(grid), 144)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,75 @@
+'''
+Created on Oct 18, 2026
+
+@author: Daniel
+'''
+import unittest
+from puzzles.wordsearch.solver import DIRECTIONS, Solver, solve
+from puzzles.wordsearch.wordsearch import WordSearch
+
+class Test(unittest.TestCase):
+
+    def testAllDirections(self):
+        solver = Solver(['abc', 'cb', 'b'])
+        found = solver.find_rows([list('abc'),
+                                  list('bxb'),
+                                  list('cba')])
+
+        self.assertEqual(sorted(found['abc']),
+                         sorted([((0, 0), 'R'), ((0, 0), 'D'),
+                                 ((2, 2), 'L'), ((2, 2), 'U')]))
+        self.assertEqual(sorted(found['cb']),
+                         sorted([((0, 2), 'L'), ((0, 2), 'D'),
+                                 ((2, 0), 'R'), ((2, 0), 'U')]))
+        # a single grapheme is found once per square
+        self.assertEqual(len(found['b']), 4)
+
+    def testDiagonals(self):
+        solver = Solver(['aei', 'ceg', 'hd'])
+        found = solver.find_rows([list('abc'),
+                                  list('def'),
+                                  list('ghi')], top=5, left=-1)
+
+        self.assertEqual(found['aei'], [((5, -1), 'RD')])
+        self.assertEqual(found['ceg'], [((5, 1), 'LD')])
+        self.assertEqual(found['hd'], [((7, 0), 'LU')])
+        self.assertEqual(set(DIRECTIONS), {'R', 'L', 'D', 'U', 'RD', 'LU',
+                                           'LD', 'RU'})
+
+    def testGraphemes(self):
+        # words are matched grapheme by grapheme, not by code point
+        solver = Solver(['Βίβλος', 'λό'])
+        found = solver.find_rows([['Β', 'ί', 'β', 'λ', 'ο', 'ς'],
+                                  ['ς', 'Β', 'ί', 'β', 'λ', 'ό']])
+
+        self.assertEqual(found['Βίβλος'], [((0, 0), 'R')])
+        self.assertEqual(found['λό'], [((1, 4), 'R')])
+
+        # an empty square breaks a match
+        found = solver.find_rows([['λ', None, 'ό', 'α', 'λ', 'ό']])
+        self.assertEqual(found['λό'], [((0, 4), 'R')])
+
+    def testFindLines(self):
+        rows = [list('abc'),
+                list('def'),
+                list('ghi')]
+        solver = Solver(['aei', 'fed', 'bc'])
+        found = solver.find_lines(lambda r, c: rows[r][c],
+                                  [(0, 0, 1, 1, 3), (1, 0, 0, 1, 3)])
+
+        self.assertEqual(found, {'aei': [((0, 0), 'RD')],
+                                 'fed': [((1, 2), 'L')]})
+
+    def testSolveWordSearch(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ',
+                 'Ἀβραάμ', 'τὸν', 'δὲ']
+        for direction in (WordSearch.LTR, WordSearch.RTL):
+            ws = WordSearch(words, None, None, direction, seed=3)
+            found = solve(ws)
+            for w, (_, square, cur_dir) in ws._placements.items():
+                self.assertIn((square, cur_dir), found[w],
+                              f'{w} not found where it was placed')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -3,11 +3,23 @@ Created on Mar 19, 2017
 
 @author: Daniel
 '''
+import json
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
+from argparse import ArgumentTypeError
+from random import Random
 from bibleutils.versification import convert_refs, expand_refs, parse_refs, \
                                      ReferenceFormID
 from puzzles.core.etcbc import Corpus, get_words
-from puzzles.wordsearch.wordsearch import WordSearch
+from puzzles.core.frequency import FrequencyTable
+from puzzles.wordsearch.solver import DIRECTIONS, Solver, solve
+from puzzles.wordsearch.wordsearch import WordSearch, attempt_seeds, \
+    best_layout, positive_int, profile, _skip_randranges
 
 class Test(unittest.TestCase):
 
@@ -76,6 +88,319 @@ class Test(unittest.TestCase):
         self.assertGreater(ws._bottom, 5, 'bottom extent too small')
         self.assertLess(ws._bottom, 10, 'bottom extent too large')
 
+    def testSeededLayout(self):
+        # The layout for a given seed must not change when the grid
+        # implementation changes, nor depend on the order of the words
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ',
+                 'Ἀβραάμ', 'τὸν', 'δὲ']
+        for word_order in (words, list(reversed(words))):
+            ws = WordSearch(word_order, None, None, WordSearch.LTR, seed=3)
+
+            layout = [''.join(ws._grid.get(i, j) if ws._grid.get_id(i, j)
+                              else '.'
+                              for j in range(ws._left, ws._right+1))
+                      for i in range(ws._top, ws._bottom+1)]
+            self.assertEqual(layout,
+                             ['γενέσεως',
+                              'χΒίβλος.',
+                              'ρἈβραάμ.',
+                              'ιΔἸησοῦ.',
+                              'σαυτδ...',
+                              'τυ.ἱὸὲ..',
+                              'οὶ..ον..',
+                              'ῦδ...ῦ..'],
+                             'layout changed')
+            self.assertEqual(ws._stat_map, {'placedR': 4, 'placedD': 2,
+                                            'placedRD': 3},
+                             'incorrect placement statistics')
+            # the filler is seeded too
+            self.assertEqual([''.join(ws._grid.get(i, j)
+                                      for j in range(ws._left, ws._right+1))
+                              for i in range(ws._top, ws._bottom+1)][-4:],
+                             ['σαυτδΒὶΔ',
+                              'τυἱἱὸὲίΔ',
+                              'οὶέΔονάο',
+                              'ῦδΔὶωῦάρ'],
+                             'filler changed')
+            self.assertEqual(ws.get_seed(), 3)
+
+    def testSkipRandranges(self):
+        # skipping squares relies on randrange(n) drawing as CPython does,
+        # getrandbits(n.bit_length()) until below n
+        for n_dirs in (1, 3, 8):
+            draws = [(n, n.bit_length()) for n in range(n_dirs, 0, -1)]
+            for seed in range(5):
+                called, skipped = Random(seed), Random(seed)
+                for _ in range(50):
+                    for n, _ in draws:
+                        called.randrange(n)
+                _skip_randranges(skipped.getrandbits, draws, 50)
+                self.assertEqual(called.getstate(), skipped.getstate(),
+                                 'randrange draws differently, layouts will '
+                                 'change')
+
+    def testRandomSeed(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ']
+        ws = WordSearch(words, None, None, WordSearch.RTL)
+        again = WordSearch(words, None, None, WordSearch.RTL,
+                           seed=ws.get_seed())
+        self.assertEqual(ws.get_grid('json'), again.get_grid('json'),
+                         'layout not reproduced from its seed')
+
+    def testBestLayout(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ',
+                 'Ἀβραάμ', 'ἐγέννησεν', 'τὸν', 'Ἰσαάκ', 'δὲ', 'Ἰακώβ']
+        seeds = attempt_seeds(7, 4)
+        self.assertEqual(seeds[0], 7)
+        areas = [WordSearch(words, None, None, WordSearch.LTR, seed=s)
+                 for s in seeds]
+        areas = [ws.get_rows() * ws.get_cols() for ws in areas]
+
+        best = best_layout(words, None, None, WordSearch.LTR, seed=7,
+                           attempts=4, processes=2)
+        self.assertEqual(best.get_rows() * best.get_cols(), min(areas))
+        self.assertEqual(best.get_seed(), seeds[areas.index(min(areas))])
+
+        # repeated requests come from the cache but are separate objects
+        again = best_layout(words, None, None, WordSearch.LTR, seed=7,
+                            attempts=4)
+        self.assertIsNot(again, best)
+        self.assertEqual(again.get_grid('json'), best.get_grid('json'))
+
+    def testLayoutStats(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ',
+                 'Ἀβραάμ', 'τὸν', 'δὲ']
+        ws = WordSearch(words, None, None, WordSearch.LTR, seed=3)
+        stats = ws.get_stats()
+
+        self.assertEqual(stats.placed, {'R': 4, 'D': 2, 'RD': 3})
+        self.assertEqual((stats.rows, stats.cols), (8, 8))
+        self.assertEqual(stats.word_squares, 46)
+        self.assertAlmostEqual(stats.density, 46 / 64)
+        self.assertEqual(sorted(stats.words), sorted(words))
+        # every word was placed at the first square tried
+        self.assertEqual(stats.squares_probed, len(words))
+        self.assertEqual(stats.direction_retries, 0)
+        self.assertEqual(stats.words['δὲ']['skipped'], 20)
+        self.assertGreater(stats.total_time, 0)
+
+        d = json.loads(stats.to_json())
+        self.assertEqual(d['placed'], stats.placed)
+        self.assertEqual(d['words']['Βίβλος'], stats.words['Βίβλος'])
+
+    def testProfile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report = os.path.join(tmp, 'profile.txt')
+            ws = profile(WordSearch, (['γενέσεως', 'Βίβλος'], None, None,
+                                      WordSearch.LTR), report)
+            self.assertEqual(len(ws.get_word_list()), 2)
+            with open(report, encoding='utf-8') as f:
+                self.assertIn('cumulative', f.read())
+
+            raw = os.path.join(tmp, 'profile.prof')
+            profile(WordSearch, (['δὲ'], None, None, WordSearch.LTR), raw)
+            self.assertGreater(pstats.Stats(raw).total_calls, 0)
+
+    def testBoundedWordsearch(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ',
+                 'Ἀβραάμ', 'τὸν', 'δὲ', 'ἐγέννησεν']
+        ws = WordSearch(words, 7, 9, WordSearch.LTR, bounded=True, seed=3)
+
+        self.assertEqual(ws.get_rows(), 7, 'incorrect number of rows')
+        self.assertEqual(ws.get_cols(), 9, 'incorrect number of columns')
+        self.assertEqual(sorted(ws.get_word_list() + ws.get_unplaced_words()),
+                         sorted(words), 'words lost')
+        # ἐγέννησεν is nine graphemes long so can only run across
+        self.assertIn('ἐγέννησεν', ws.get_word_list(),
+                      'longest word not placed')
+
+    def testBoundedUnplacedWords(self):
+        words = ['γενέσεως', 'Βίβλος', 'δὲ']
+        ws = WordSearch(words, 4, 4, WordSearch.RTL, bounded=True,
+                        time_budget=0.1)
+
+        self.assertEqual(ws.get_unplaced_words(), ['γενέσεως', 'Βίβλος'],
+                         'words too long for the grid not reported')
+        self.assertEqual(ws.get_word_list(), ['δὲ'], 'incorrect words placed')
+        self.assertEqual((ws._left, ws._right), (-3, 0),
+                         'RTL grid should extend left from column 0')
+
+    def testNonPositiveRowsCols(self):
+        for rows, cols in ((0, 5), (5, 0), (-1, 5), (5, -2)):
+            with self.assertRaises(Exception, msg=f'{rows}x{cols} accepted'):
+                WordSearch(['δὲ'], rows, cols, WordSearch.LTR, bounded=True)
+
+        self.assertEqual(positive_int('4'), 4, 'positive count rejected')
+        for value in ('0', '-3'):
+            with self.assertRaises(ArgumentTypeError,
+                                   msg=f'-r/-c {value} accepted'):
+                positive_int(value)
+
+    def testBoundedTimeBudget(self):
+        rng = Random(1)
+        words = sorted({''.join(rng.choice('αβγδεζηθικλμνξοπρστυφχψω')
+                                for _ in range(rng.randint(3, 9)))
+                        for _ in range(300)})
+        start = time.monotonic()
+        ws = WordSearch(words, 30, 30, WordSearch.LTR, bounded=True, seed=1,
+                        time_budget=0.2)
+
+        self.assertLess(time.monotonic() - start, 5,
+                        'time budget not respected')
+        self.assertTrue(ws.get_unplaced_words(),
+                        'words not reached in time should be unplaced')
+        self.assertEqual(sorted(ws.get_word_list() + ws.get_unplaced_words()),
+                         words, 'words lost')
+
+    def _squares(self, ws):
+        return {(i, j): ws._grid.get(i, j)
+                for i in range(ws._top, ws._bottom+1)
+                for j in range(ws._left, ws._right+1)}
+
+    def _word_squares(self, ws, word):
+        g_ids, (row, col), cur_dir = ws._placements[word]
+        d_row, d_col = ws._STEPS[cur_dir]
+        return [(row + k * d_row, col + k * d_col) for k in range(len(g_ids))]
+
+    def testAddWords(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ']
+        ws = WordSearch(words, None, None, WordSearch.LTR, seed=3)
+        before = self._squares(ws)
+
+        self.assertEqual(ws.add_words(['Ἀβραάμ', 'δὲ', 'Δαυὶδ']),
+                         ['Ἀβραάμ', 'δὲ'])
+        after = self._squares(ws)
+        new_squares = set(self._word_squares(ws, 'Ἀβραάμ') +
+                          self._word_squares(ws, 'δὲ'))
+        for square, g in before.items():
+            if square not in new_squares:
+                self.assertEqual(after[square], g,
+                                 f'square {square} changed')
+        for word in words + ['Ἀβραάμ', 'δὲ']:
+            self.assertEqual(''.join(after[sq] for sq in
+                                     self._word_squares(ws, word)), word)
+        self.assertNotIn(None, after.values(), 'grid not filled')
+        self.assertEqual(sorted(ws._words), sorted(words + ['Ἀβραάμ', 'δὲ']))
+        self.assertEqual(ws.get_stats().word_squares,
+                         len({sq for w in ws.get_word_list()
+                              for sq in self._word_squares(ws, w)}))
+
+    def testRemoveWords(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ', 'υἱοῦ', 'Δαυὶδ',
+                 'Ἀβραάμ', 'τὸν', 'δὲ']
+        ws = WordSearch(words, None, None, WordSearch.LTR, seed=3)
+        before = self._squares(ws)
+        freed = set(self._word_squares(ws, 'Ἀβραάμ')) - \
+            {sq for w in words if w != 'Ἀβραάμ'
+             for sq in self._word_squares(ws, w)}
+
+        self.assertEqual(ws.remove_words(['Ἀβραάμ']), ['Ἀβραάμ'])
+        after = self._squares(ws)
+        for square, g in before.items():
+            if square not in freed:
+                self.assertEqual(after[square], g,
+                                 f'square {square} changed')
+        for square in freed:
+            self.assertEqual(ws._grid.get_id(*square), 0, 'square not freed')
+            self.assertIsNotNone(after[square], 'freed square not filled')
+        self.assertNotIn('Ἀβραάμ', ws.get_word_list())
+        self.assertEqual(ws.get_stats().placed, {'R': 3, 'D': 2, 'RD': 3})
+        self.assertEqual(ws.get_stats().word_squares, 46 - len(freed))
+        self.assertRaises(Exception, ws.remove_words, ['Ἀβραάμ'])
+
+        # the freed squares are free starting squares for words added later
+        self.assertIn(ws._arc_ordinal((2, 1)), ws._holes)
+        holes = list(ws._holes)
+        self.assertEqual(ws.add_words(['Ἀβραάμ']), ['Ἀβραάμ'])
+        self.assertEqual(''.join(ws._grid.get(*sq) for sq in
+                                 self._word_squares(ws, 'Ἀβραάμ')), 'Ἀβραάμ')
+        self.assertIn(ws._arc_ordinal(self._word_squares(ws, 'Ἀβραάμ')[0]),
+                      holes)
+
+    def testBoundedAddWords(self):
+        words = ['Βίβλος', 'Ἰησοῦ', 'υἱοῦ']
+        ws = WordSearch(words, 6, 6, WordSearch.LTR, bounded=True, seed=3)
+
+        placed = ws.add_words(['χριστοῦ', 'δὲ'])
+        self.assertEqual(placed, ['δὲ'])
+        self.assertEqual(ws.get_unplaced_words(), ['χριστοῦ'],
+                         'word too long for the grid not reported')
+        self.assertEqual((ws.get_rows(), ws.get_cols()), (6, 6))
+        ws.remove_words(['χριστοῦ', 'Ἰησοῦ'])
+        self.assertEqual(ws.get_unplaced_words(), [])
+        self.assertEqual(sorted(ws.get_word_list()),
+                         sorted(['Βίβλος', 'υἱοῦ', 'δὲ']))
+        self.assertNotIn(None, self._squares(ws).values(), 'grid not filled')
+
+    def testFrequencyFiller(self):
+        words = ['Βίβλος', 'γενέσεως', 'Ἰησοῦ', 'χριστοῦ']
+        table = FrequencyTable({'ω': 50, 'ψ': 30, 'ξ': 20})
+        ws = WordSearch(words, None, None, WordSearch.LTR, seed=3,
+                        filler=table)
+        again = WordSearch(words, None, None, WordSearch.LTR, seed=3,
+                           filler=table)
+
+        filler = [ws._grid.get(i, j)
+                  for i in range(ws._top, ws._bottom+1)
+                  for j in range(ws._left, ws._right+1)
+                  if not ws._grid.get_id(i, j)]
+        self.assertTrue(filler, 'no filler squares')
+        self.assertEqual(set(filler) - set(table.graphemes), set(),
+                         'filler not drawn from the table')
+        self.assertEqual(ws.get_grid('json'), again.get_grid('json'),
+                         'filler not reproduced from its seed')
+
+    def _assert_no_accidental_words(self, ws, words):
+        for w, occurrences in solve(ws, words).items():
+            for (row, col), d in occurrences:
+                d_row, d_col = DIRECTIONS[d]
+                self.assertTrue(all(ws._grid.get_id(row + k * d_row,
+                                                    col + k * d_col)
+                                    for k in range(len(w))),
+                                f'{w} spelled by filler at {(row, col)}')
+
+    def testAccidentalWords(self):
+        # filler of only a few graphemes spells short words all over the grid
+        words = ['αβ', 'βγα', 'γγ', 'Βίβλος', 'γενέσεως']
+        table = FrequencyTable({g: 1 for g in 'αβγδεζ'})
+        for seed in range(5):
+            ws = WordSearch(words, None, None, WordSearch.RTL, seed=seed,
+                            filler=table)
+            self._assert_no_accidental_words(ws, words)
+            self.assertGreater(ws.get_stats().filler_redrawn, 0)
+
+            # and the same after an edit, for the new word along the lines
+            # through it
+            ws.remove_words(['γενέσεως'])
+            ws.add_words(['αα'])
+            self._assert_no_accidental_words(ws, ['αβ', 'βγα', 'γγ'])
+            lines = ws._lines_through(self._word_squares(ws, 'αα'))
+            for (row, col), d in Solver(['αα']).find_lines(ws._grid.get,
+                                                           lines)['αα']:
+                d_row, d_col = DIRECTIONS[d]
+                self.assertTrue(ws._grid.get_id(row, col) and
+                                ws._grid.get_id(row + d_row, col + d_col),
+                                f'αα spelled by filler at {(row, col)}')
+
+    def testLazyImports(self):
+        # the corpora, bibleutils and the process pool are not imported
+        # until a command needs them
+        heavy = ('tf', 'bibleutils', 'uniseg', 'multiprocessing',
+                 'puzzles.core.etcbc')
+        code = ('import runpy, sys\n'
+                'sys.argv = ["wordsearch", "generate", "--help"]\n'
+                'try:\n'
+                '    runpy.run_module("puzzles.wordsearch.wordsearch",\n'
+                '                     run_name="__main__", alter_sys=True)\n'
+                'except SystemExit:\n'
+                '    pass\n'
+                f'print([m for m in {heavy!r} if m in sys.modules])')
+        out = subprocess.run([sys.executable, '-c', code], check=True,
+                             capture_output=True, text=True,
+                             env=dict(os.environ,
+                                      PYTHONPATH=os.pathsep.join(sys.path)))
+        self.assertEqual(out.stdout.splitlines()[-1], '[]')
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
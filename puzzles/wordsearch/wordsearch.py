@@ -16,15 +16,23 @@ WordSearch generator command line utility
 import sys
 import os
 
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 from argparse import RawDescriptionHelpFormatter
-import json
-from random import randrange
+from collections import OrderedDict
+from copy import deepcopy
+from bisect import bisect_left, insort
+from math import isqrt
+from random import Random, getrandbits
+import time
 
-from bibleutils.versification import parse_refs, convert_refs, expand_refs,\
-     ReferenceFormID
-from puzzles.core.etcbc import Corpus, get_words
-from uniseg.graphemecluster import grapheme_clusters
+# The corpora, bibleutils and the process pool are imported where they are
+# used, so that --help and info start without loading them
+from puzzles.core.graphemes import graphemes, sorted_graphemes
+from puzzles.core.normalize import FORMS, POINTED
+from puzzles.wordsearch.grid import Grid
+from puzzles.wordsearch.render import iter_grid, write_grid
+from puzzles.wordsearch.solver import DIRECTIONS, Solver
+from puzzles.wordsearch.stats import LayoutStats
 
 __all__ = []
 __version__ = 0.1
@@ -33,7 +41,6 @@ __updated__ = '2017-01-18'
 
 DEBUG = 0
 TESTRUN = 0
-PROFILE = 0
 
 class CLIError(Exception):
     '''Generic exception to raise and log different fatal errors.'''
@@ -45,6 +52,13 @@ class CLIError(Exception):
     def __unicode__(self):
         return self.msg
 
+def positive_int(value):
+    '''Argument type for counts which must be at least 1.'''
+    n = int(value)
+    if n < 1:
+        raise ArgumentTypeError(f'{value} is not a positive integer')
+    return n
+
 def parse_command_line(args):
     '''Parse command line options.'''
 
@@ -96,17 +110,55 @@ Example Usages''')
                              action="store",
                              help="see below [default: first 100 words]")
         parser_gen.add_argument("-c", "--columns", dest="cols",
-                             action="store", type=int,
-                             help="number of columns in the wordsearch")
+                             action="store", type=positive_int,
+                             help="""number of columns in the wordsearch. If
+                             both rows and columns are given the words are
+                             packed into a grid of exactly that size and any
+                             which do not fit are reported""")
         parser_gen.add_argument("-r", "--rows", dest="rows",
-                             action="store", type=int,
+                             action="store", type=positive_int,
                              help="number of rows in the wordsearch")
+        parser_gen.add_argument("-t", "--time-budget", dest="time_budget",
+                             action="store", type=float,
+                             default=WordSearch.DEFAULT_TIME_BUDGET,
+                             help="""seconds to spend fitting words into a
+                             grid of fixed rows and columns
+                             [default: %(default)s]""")
+        parser_gen.add_argument("--seed", dest="seed", action="store",
+                             type=int,
+                             help="""seed for the random layout. The same
+                             words, options and seed give the same wordsearch
+                             [default: a random seed]""")
+        parser_gen.add_argument("-n", "--attempts", dest="attempts",
+                             action="store", type=int, default=1,
+                             help="""number of layouts to try, in parallel,
+                             keeping the most compact [default: %(default)s]""")
+        parser_gen.add_argument("--stats", dest="stats", action="store",
+                             metavar="FILE",
+                             help="""write the layout statistics, timings,
+                             squares probed and direction retries per word
+                             and grid density, to FILE as JSON""")
+        parser_gen.add_argument("--profile", dest="profile", action="store",
+                             metavar="FILE",
+                             help="""profile the generation and write the
+                             profile to FILE. A FILE ending in .prof gets the
+                             raw cProfile data for pstats and other viewers,
+                             any other a report sorted by cumulative time""")
         parser_gen.add_argument("-f", "--format", dest="format",
                              action="store",
+                             choices=['html', 'json', 'compact'],
                              help="""format of the output,
-                             html for HTML output, or
-                             fixed for fixed width text output
+                             html for HTML output,
+                             json for a JSON list of squares, or
+                             compact for JSON rows and a grapheme table
                              [default: html]""")
+        parser_gen.add_argument("--form", dest="form", action="store",
+                             choices=FORMS, default=POINTED,
+                             help="""form of the words, pointed as in the
+                             text, unaccented without the accents, or
+                             consonantal without any marks. Words which are
+                             the same in this form are used once
+                             [default: %(default)s]""")
         parser_gen.add_argument("text", choices=['ETCBCH', 'ETCBCG'],
                              help="the name of the text. See below")
         
@@ -126,6 +178,73 @@ Argument Details
                             help="""list all books and book_abbreviations for
                             the chosen text. text must be specified but no
                             other options may be specified""")
+
+        parser_batch = subparsers.add_parser(
+                         'batch',
+                         help='generate many wordsearches from a manifest',
+                         formatter_class=RawDescriptionHelpFormatter,
+                         epilog='''
+Argument Details
+
+  MANIFEST is a JSON lines file with one wordsearch per line, for example
+
+    {"id": "gen-1", "text": "ETCBCH", "verses": "Gen 1:1-5"}
+    {"id": "mat-1", "text": "ETCBCG", "verses": "Mat 1:1-6", "rows": 15,
+     "cols": 15, "format": "json", "form": "consonantal"}
+
+  id, rows, cols, format, form, time_budget, seed and attempts are
+  optional.''')
+        parser_batch.add_argument("manifest",
+                             help="the manifest of wordsearches to generate")
+        parser_batch.add_argument("-o", "--output-dir", dest="output_dir",
+                             action="store", default=".",
+                             help="""directory to write the wordsearches to
+                             [default: the current directory]""")
+        parser_batch.add_argument("-p", "--processes", dest="processes",
+                             action="store", type=int,
+                             help="""number of worker processes
+                             [default: one per core]""")
+        parser_batch.add_argument("--timeout", dest="timeout",
+                             action="store", type=float,
+                             help="""seconds after which a single
+                             wordsearch is abandoned [default: no limit]""")
+        parser_batch.add_argument("--corpus-memory", dest="memory_limit",
+                             action="store", type=lambda mb: int(mb) << 20,
+                             help="""megabytes of loaded corpora each process
+                             may keep, the least recently used being
+                             dropped beyond it [default: no limit]""")
+
+        parser_serve = subparsers.add_parser(
+                         'serve',
+                         help='serve wordsearches over HTTP',
+                         formatter_class=RawDescriptionHelpFormatter,
+                         epilog='''
+Requests
+
+  GET /wordsearch?text=ETCBCH&verses=Gen+1:1-5
+  GET /wordsearch?text=ETCBCG&verses=Mat+1:1-6&rows=15&cols=15&format=html
+
+  rows, cols, format, time_budget, seed and attempts are optional. format
+  is json, compact or html [default: json].''')
+        parser_serve.add_argument("--host", dest="host", action="store",
+                             default="127.0.0.1",
+                             help="address to listen on [default: %(default)s]")
+        parser_serve.add_argument("--port", dest="port", action="store",
+                             type=int, default=8080,
+                             help="port to listen on [default: %(default)s]")
+        parser_serve.add_argument("-p", "--processes", dest="processes",
+                             action="store", type=int,
+                             help="""number of worker processes
+                             [default: one per core]""")
+        parser_serve.add_argument("--timeout", dest="timeout",
+                             action="store", type=float, default=30.0,
+                             help="""seconds to wait for a wordsearch before
+                             giving up on the request [default: %(default)s]""")
+        parser_serve.add_argument("--corpus-memory", dest="memory_limit",
+                             action="store", type=lambda mb: int(mb) << 20,
+                             help="""megabytes of loaded corpora each process
+                             may keep, the least recently used being
+                             dropped beyond it [default: no limit]""")
     except KeyboardInterrupt:
         ### handle keyboard interrupt ###
         return 0
@@ -140,6 +259,28 @@ Argument Details
     # Process arguments
     return parser.parse_args(args)
 
+def _skip_randranges(getrandbits, draws, count):
+    '''
+    Consume the random numbers count rounds of randrange(n) calls would
+    have, one call for each n of draws, without making the calls.
+
+    This depends on how CPython's random.Random.randrange(n) draws, which is
+    a private detail of its _randbelow_with_getrandbits(): k = n.bit_length()
+    bits are taken with getrandbits(k) until they are below n. If a Python
+    release draws differently, layouts made with replay stop matching those
+    made without the position index, and testSkipRandranges fails.
+
+    Parameters
+
+    getrandbits - the getrandbits method of the random.Random
+    draws - a list of (n, n.bit_length()) pairs
+    count - the number of rounds
+    '''
+    for _ in range(count):
+        for n, k in draws:
+            while getrandbits(k) >= n:
+                pass
+
 class WordSearch():
     '''
     Instances of this class hold a grid of letters containing the words
@@ -149,8 +290,8 @@ class WordSearch():
     Parameters
     
     words - a list of source words to put into the wordsearch
-    rows - number of rows in grid
-    cols - number of columns in grid
+    rows - number of rows in grid, at least 1 if given
+    cols - number of columns in grid, at least 1 if given
     directions - a bit vector of directions to run the words. Ultimately there
     are eight possibilities but only two sets of directions are recognised:
     
@@ -159,14 +300,54 @@ class WordSearch():
         
         FIXME there is confusion over language direction and the grid directions
               separate these properly
+    bounded - if True the words are packed into a grid of exactly rows by cols
+              squares. Words which cannot be fitted within time_budget are
+              left out and reported by get_unplaced_words(). Otherwise the
+              grid grows as required to hold every word and rows and cols are
+              not used.
+    time_budget - the number of seconds a bounded layout may spend searching
+                  for a placement of every word
+    seed - the seed for all the random choices made in laying out and filling
+           the grid. The same words, options and seed always give the same
+           wordsearch, except where a bounded layout runs out of time. If not
+           given a seed is chosen at random. Either way it is available from
+           get_seed().
+    filler - a FrequencyTable to draw the graphemes of the empty squares
+             from, in proportion to their frequency. By default they are
+             drawn uniformly from the graphemes of the words.
     '''
     LTR = 1
     RTL = 2
-    def __init__(self, words, rows, cols, directions):
+
+    # (row, col) step for each placement direction
+    _STEPS = {'R': (0, 1),
+              'RD': (1, 1),
+              'D': (1, 0),
+              'L': (0, -1),
+              'LD': (1, -1)}
+
+    # Default search time in seconds for bounded layouts
+    DEFAULT_TIME_BUDGET = 1.0
+
+    # The most times filler which spells a word is drawn again
+    MAX_REFILLS = 10
+
+    def __init__(self, words, rows, cols, directions, bounded=False,
+                 time_budget=DEFAULT_TIME_BUDGET, seed=None, filler=None):
+        if (rows is not None and rows < 1) or (cols is not None and cols < 1):
+            raise Exception(f'rows and cols must be positive, not {rows} '
+                            f'and {cols}')
         # the original inputs to the grid construction
         self._rows = rows
         self._cols = cols
         self._words = words
+        self._sorted_words = None
+        self._bounded = bounded
+        self._time_budget = time_budget
+        if seed is None:
+            seed = getrandbits(64)
+        self._seed = seed
+        self._random = Random(seed)
         
         # the extents of the grid
         self._top = 0
@@ -175,11 +356,23 @@ class WordSearch():
         self._bottom = 0
         
         # the actual grid
-        self._grid = dict()  # tuple (row, col) as key, grapheme as value
+        self._grid = Grid()
         self._placed_words = []
+        self._unplaced_words = []
+        # how each placed word lies on the grid, word -> (grapheme IDs,
+        # starting square, direction)
+        self._placements = dict()
+        # the grapheme IDs used to fill empty squares, if there is no filler
+        # table
+        self._filler = filler
+        self._filler_ids = []
+        # finds words made by accident in the filler, see _solve_filler()
+        self._solver = None
+        # the unbounded layout search state, see _generate()
+        self._frontier = 0
+        self._holes = []
+        self._directions = directions
 
-        # Helper variables - try to get rid of these
-        self._deepest_row = 0
         if directions == self.LTR:
             self._dirs = ['R','RD','D']
         else:
@@ -187,9 +380,16 @@ class WordSearch():
              
         # Statistics
         self._stat_map = dict()
+        self._stats = LayoutStats()
         
         # Generate the grid layout of the word in the word list
-        self._generate(directions)
+        self._get_sorted_words_list()
+        start = time.perf_counter()
+        if bounded:
+            self._generate_bounded(directions)
+        else:
+            self._generate(directions)
+        self._stats.place_time = time.perf_counter() - start
         self._fill_empty_grid_squares()
         
     def _incr_stat(self, stat_name):
@@ -209,89 +409,222 @@ class WordSearch():
             
     def _get_sorted_words_list(self):
         '''Generate graphemes for all words and store them in a map
-        order the list by the descending number of graphemes.
+        order the list by the descending number of graphemes, and words of
+        the same length alphabetically so that the order does not depend on
+        the order the words were given in. The list is built once and kept
+        for the life of the wordsearch.
         '''
-        def grapheme_sort(x):
-            return len(list(grapheme_clusters(x)))
-        graphemes = []
-        for w in sorted(self._words,
-                        key=grapheme_sort,
-                        reverse=True):
-            graphemes.append((w, list(grapheme_clusters(w))))
-        return graphemes
+        if self._sorted_words is None:
+            start = time.perf_counter()
+            self._sorted_words = sorted_graphemes(self._words)
+            self._stats.segment_time = time.perf_counter() - start
+        return self._sorted_words
             
     def _fill_empty_grid_squares(self):
         '''Fill the empty grid squares with random graphemes selected from the
         graphemes in the words in the source word list.
         '''
-        graphemes = self._get_sorted_words_list()
-        g_list = [g for sublist in list(g_ent[1] for g_ent in graphemes)
+        start = time.perf_counter()
+        sorted_words = self._get_sorted_words_list()
+        g_list = [g for sublist in list(g_ent[1] for g_ent in sorted_words)
                     for g in sublist]
-        g_list = list(set(g_list)) # remove duplicates and reform to a list
+        g_list = sorted(set(g_list)) # remove duplicates, in a fixed order
+        self._filler_ids = list(self._grid.intern_all(g_list))
 
-        for i in range(self._top, self._bottom+1):
-            for j in range(self._left, self._right+1):
-                sq = (i, j)
-                if self._grid.get(sq) is None:
-                    self._grid[sq] = g_list[randrange(len(g_list))]
+        empty = self._fill_squares((i, j)
+                                   for i in range(self._top, self._bottom+1)
+                                   for j in range(self._left, self._right+1))
+        self._solve_filler()
+
+        stats = self._stats
+        stats.rows = self.get_rows()
+        stats.cols = self.get_cols()
+        stats.word_squares = stats.rows * stats.cols - len(empty)
+        stats.fill_time = time.perf_counter() - start
+
+    def _fill_squares(self, squares):
+        '''Give each of the squares which holds no word a random filler
+        grapheme, drawn from the filler table in one batch if there is one.
+        Returns the list of squares filled.
+        '''
+        get_id = self._grid.get_id
+        empty = [sq for sq in squares if get_id(*sq) == Grid.EMPTY]
+        if self._filler is not None:
+            drawn = self._grid.intern_all(self._filler.sample(self._random,
+                                                              len(empty)))
+        elif self._filler_ids:
+            g_ids = self._filler_ids
+            randrange = self._random.randrange
+            drawn = [g_ids[randrange(len(g_ids))] for _ in empty]
+        else:
+            return []
+        set_filler = self._grid.set_filler
+        for (i, j), gid in zip(empty, drawn):
+            set_filler(i, j, gid)
+        return empty
+
+    def _solve_filler(self, squares=None):
+        '''Draw again any filler which spells one of the words, so that each
+        word is only found where it was placed. A word made wholly of the
+        graphemes of other words cannot be undone this way and is left. The
+        filler is drawn again at most MAX_REFILLS times.
 
-    def _place_word_on_grid(self, g_s, cur_square, cur_dir):
-        '''Place graphemes on the grid. Graphemes are placed backward
-        along direction from which their placement was checked.
-        
         Parameters
-        
-        g_s the list of graphemes in original text order
-        cur_square the last square - where to place the last grapheme
+
+        squares - the squares just filled. Only the lines through them are
+                  searched. By default the whole grid is.
+        '''
+        if self._solver is None:
+            self._solver = Solver(self._words)
+        get_id = self._grid.get_id
+        for _ in range(self.MAX_REFILLS):
+            if squares is None:
+                found = self._solver.solve(self)
+            else:
+                found = self._solver.find_lines(self._grid.get,
+                                                self._lines_through(squares))
+            redraw = set()
+            for w, occurrences in found.items():
+                length = len(graphemes(w))
+                for (row, col), d in occurrences:
+                    d_row, d_col = DIRECTIONS[d]
+                    redraw.update(sq for sq in
+                                  ((row + k * d_row, col + k * d_col)
+                                   for k in range(length))
+                                  if get_id(*sq) == Grid.EMPTY)
+            if not redraw:
+                return
+            squares = sorted(redraw)
+            self._stats.filler_redrawn += len(squares)
+            self._fill_squares(squares)
+
+    def _lines_through(self, squares):
+        '''Generate the rows, columns and diagonals of the grid which pass
+        through any of the squares, each once, as (row, col, d_row, d_col,
+        length) for Solver.find_lines().
+        '''
+        def inside(r, c):
+            return (self._top <= r <= self._bottom and
+                    self._left <= c <= self._right)
+        seen = set()
+        for row, col in squares:
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                r, c = row, col
+                while inside(r - d_row, c - d_col):
+                    r -= d_row
+                    c -= d_col
+                if (r, c, d_row, d_col) in seen:
+                    continue
+                seen.add((r, c, d_row, d_col))
+                length = 1
+                while inside(r + length * d_row, c + length * d_col):
+                    length += 1
+                yield (r, c, d_row, d_col, length)
+
+    def _place_word_on_grid(self, g_ids, start_square, cur_dir):
+        '''Place graphemes on the grid and update the grid extents.
+
+        Parameters
+
+        g_ids the tuple of grapheme IDs in original text order
+        start_square the square in which to place the first grapheme
         cur_dir the direction in which the word was placed
+
+        Returns the list of squares which were previously empty.
         '''
-        sq = cur_square
-        if cur_dir == 'R':
-            if sq[1] > self._right:
-                self._right = sq[1]
-            for g in reversed(g_s):
-                self._grid[sq]=g
-                sq = (sq[0], sq[1]-1)
-            self._incr_stat('placedR')
-        elif cur_dir == 'RD':
-            if sq[0] > self._bottom:
-                self._bottom = sq[0]
-            if sq[1] > self._right:
-                self._right = sq[1]
-            for g in reversed(g_s):
-                self._grid[sq]=g
-                sq = (sq[0]-1, sq[1]-1)
-            self._incr_stat('placedRD')
-        elif cur_dir == 'D':
-            if sq[0] > self._bottom:
-                self._bottom = sq[0]
-            for g in reversed(g_s):
-                self._grid[sq]=g
-                sq = (sq[0]-1, sq[1])
-            self._incr_stat('placedD')
-        elif cur_dir == 'L':
-            if sq[1] < self._left:
-                self._left = sq[1]
-            for g in reversed(g_s):
-                self._grid[sq]=g
-                sq = (sq[0], sq[1]+1)
-            self._incr_stat('placedL')
-        elif cur_dir == 'LD':
-            if sq[0] > self._bottom:
-                self._bottom = sq[0]
-            if sq[1] < self._left:
-                self._left = sq[1]
-            for g in reversed(g_s):
-                self._grid[sq]=g
-                sq = (sq[0]-1, sq[1]+1)
-            self._incr_stat('placedLD')
-        else:
+        if cur_dir not in self._STEPS:
             raise Exception('unsupported placement direction')
+        d_row, d_col = self._STEPS[cur_dir]
+        last = len(g_ids) - 1
+        end_row = start_square[0] + d_row * last
+        end_col = start_square[1] + d_col * last
+        # Extents are tracked from the final square only, as they always
+        # have been.
+        if cur_dir in ('RD', 'D', 'LD') and end_row > self._bottom:
+            self._bottom = end_row
+        if cur_dir in ('R', 'RD') and end_col > self._right:
+            self._right = end_col
+        if cur_dir in ('L', 'LD') and end_col < self._left:
+            self._left = end_col
+        self._incr_stat('placed' + cur_dir)
+        self._stats.placed[cur_dir] = self._stats.placed.get(cur_dir, 0) + 1
+        return self._grid.place(g_ids, start_square[0], start_square[1],
+                                d_row, d_col)
 
-    def _generate(self, lang_direction):
+    def _place_word(self, word, g_ids, start_square, cur_dir):
+        '''Place a word on the grid and record where it lies so that it can
+        be removed again. Returns the list of squares which were previously
+        empty.
+        '''
+        filled = self._place_word_on_grid(g_ids, start_square, cur_dir)
+        self._placed_words.append(word)
+        self._placements[word] = (g_ids, start_square, cur_dir)
+        self._stats.word_squares += len(filled)
+        return filled
+
+    def _arc_sign(self, lang_direction):
+        if lang_direction == self.LTR:
+            return 1
+        elif lang_direction == self.RTL:
+            return -1
+        raise Exception(f'Invalid lang direction {lang_direction}')
+
+    def _arc_square(self, ordinal, sign):
+        '''Return the square at a position in the starting square order.'''
+        deepest_row = isqrt(ordinal)
+        k = ordinal - deepest_row * deepest_row
+        if k <= deepest_row:
+            return (deepest_row, sign * k)
+        return (2 * deepest_row - k, sign * deepest_row)
+
+    def _arc_ordinal(self, square):
+        '''Return the position of a square in the starting square order.'''
+        row, col = square[0], abs(square[1])
+        deepest_row = max(row, col)
+        if row == deepest_row:
+            return deepest_row * deepest_row + col
+        return deepest_row * deepest_row + 2 * deepest_row - row
+
+    def _starting_squares(self, lang_direction, first=0):
+        '''Generate the candidate starting squares in the order they are tried,
+        beginning with the square at position first.
+
+        Start top left (LTR) or top right (RTL) and work outward in arcs. Each
+        arc starts against the 0 column and searches out through the columns
+        until it reaches the same column number as the row number and then
+        goes up to the horizontal. Because it's a grid the arc is a simple
+        right angle.
+        '''
+        sign = self._arc_sign(lang_direction)
+        deepest_row = isqrt(first)
+        start = first - deepest_row * deepest_row
+        while True:
+            for k in range(start, 2 * deepest_row + 1):
+                if k <= deepest_row:
+                    yield (deepest_row, sign * k)
+                else:
+                    yield (2 * deepest_row - k, sign * deepest_row)
+            deepest_row += 1
+            start = 0
+
+    def _generate(self, lang_direction, sorted_words=None, replay=True):
         '''Do the actual generation of the wordsearch
+
+        Parameters
+
+        lang_direction - LTR or RTL
+        sorted_words - the (word, graphemes) to place, longest first. By
+                       default all the words of the wordsearch.
+        replay - draw the random numbers for skipped squares as trying them
+                 would have, so that layouts match those made without the
+                 position index. Words added later to an existing grid do
+                 not need this, and it would make each addition cost time
+                 in proportion to the size of the grid.
         '''
-        graphemes = self._get_sorted_words_list()
+        if sorted_words is None:
+            sorted_words = self._get_sorted_words_list()
+        randrange = self._random.randrange
+        getrandbits = self._random.getrandbits
 
         def get_direction(dirs_to_try):
             '''From the provided set of directions select one at random and
@@ -304,56 +637,63 @@ class WordSearch():
                 return None
             elt = randrange(len(dirs_to_try))
             return dirs_to_try.pop(elt)
-        
-        def get_starting_square(old):
-            # Assumption : the initial 0,0 square is not generated in this
-            #              function
-            if lang_direction == self.LTR:
-                # Start top left go bottom left and arc counter-clockwise to
-                # horizontal, step by step. Because it's a grid the arc is
-                # a simple right angle.
-                if old[0] == self._deepest_row and old[1] != self._deepest_row:
-                    return (self._deepest_row, old[1]+1)
-                elif old[1] == self._deepest_row and old[0] != 0:
-                    return (old[0]-1, old[1])
-                elif old[0] == 0 and old[1] == self._deepest_row:
-                    self._deepest_row += 1
-                    return (self._deepest_row, 0)
-                else:
-                    raise Exception('LTR row col navigation error')
-
-                if old[1] == 0:
-                    self._deepest_row += 1
-                    return (self._deepest_row, 0)
-                if old[0] == self._deepest_row:
-                    return (self._deepest_row, old[1]-1)
-                return (old[0] + 1, self._deepest_row)
-            
-            elif lang_direction == self.RTL:
-                # Start top right go bottom right and arc clockwise to
-                # horizontal, step by step. Because it's a grid the arc is
-                # a simple right angle.
-                if old[0] == self._deepest_row and old[1] != -(self._deepest_row):
-                    return (self._deepest_row, old[1]-1)
-                elif old[1] == -(self._deepest_row) and old[0] != 0:
-                    return (old[0]-1, old[1])
-                elif old[0] == 0 and old[1] == -(self._deepest_row):
-                    self._deepest_row += 1
-                    return (self._deepest_row, 0)
-                else:
-                    raise Exception('RTL row col navigation error')
-                
-                if old[1] == 0:
-                    self._deepest_row += 1
-                    return (self._deepest_row, 0)
-                if old[0] == self._deepest_row:
-                    return (self._deepest_row, old[1]+1)
-                return (old[0] + 1, self._deepest_row)
-            else:
-                raise Exception(f'Invalid lang direction {lang_direction}')
-                
+
+        def skip_squares(count):
+            '''Consume the random numbers that trying every direction at count
+            squares where nothing can fit would have drawn. This is exactly
+            what randrange(n) does for each n, see _skip_randranges(), but
+            without its call overhead, which otherwise dominates generation
+            time on large grids.
+            '''
+            nonlocal skipped
+            skipped += count
+            if replay:
+                _skip_randranges(getrandbits, skip_draws, count)
+
+        def try_square(g_ids, square):
+            '''Attempt to fit the word at square in each direction in random
+            order. Return the square and direction to place it at, or None.
+
+            All actual placement is deferred until it is known that the entire
+            word can be placed. This removes the need for unplacing partial
+            words on failure.
+
+            Note that a failed attempt leaves the current square at the
+            square where the word failed to fit and the next direction is
+            tried from there rather than from the starting square. This is
+            how layouts have always been produced, so it is retained to keep
+            them stable for a given seed.
+            '''
+            nonlocal probed_squares, retries
+            probed_squares += 1
+            dirs_left = list(self._dirs) # copy the canonical list of dirs
+            cur_square = square
+            cur_dir = get_direction(dirs_left)
+            while cur_dir is not None:
+                d_row, d_col = self._STEPS[cur_dir]
+                k = grid.first_conflict(g_ids, cur_square[0], cur_square[1],
+                                        d_row, d_col)
+                if k < 0:
+                    return (cur_square, cur_dir)
+                retries += 1
+                cur_square = (cur_square[0] + k * d_row,
+                              cur_square[1] + k * d_col)
+                cur_dir = get_direction(dirs_left)
+            return None
+
+        grid = self._grid
+        sign = self._arc_sign(lang_direction)
+        skip_draws = [(n, n.bit_length()) for n in range(len(self._dirs), 0, -1)]
+
+        # Every starting square from frontier on is empty. Before it the
+        # squares are either occupied or are holes, the sorted positions of
+        # the empty squares. Both are kept between calls so that words can be
+        # added to the grid later.
+        frontier = self._frontier
+        holes = self._holes
+
         # iterate the list of words to place
-        for g_ent in graphemes:
+        for g_ent in sorted_words:
             # This check is required because the code below will not terminate
             # if the grapheme list is empty, which is the case for a zero
             # length word.
@@ -365,201 +705,463 @@ class WordSearch():
             # really how the data is so this check must remain unless the loops
             # below are altered to handle this, but this check also cuts off
             # more unnecessary code cycles too.
-            if g_ent[0] is '': continue
+            if g_ent[0] == '': continue
 
-            g_s = g_ent[1]
+            g_ids = grid.intern_all(g_ent[1])
+            probed_squares = skipped = retries = 0
             # Choose starting square for this attempt to place the word
             #   1. Initial placement square, is top left for LTR and top
             #      right for RTL
-            #   2. Next square is a square in the chosen direction
-            #      according to the starting square choosing algorithm.
-            #      This algorithm chooses squares by radiating out from
-            #      the the top left or top right depending upon the
-            #      directions parameter, LTR or RTL respectively. Each arc
-            #      starts against the 0 column and searches out through the
-            #      columns until it reaches the same column number as the
-            #      row number and then goes up to the horizontal. The first
-            #      square into which the word may be fitted at any direction
-            #      is the one chosen. Thus the grid is filled from the top left
-            #      or right corner moving out and down as the filling proceeds.
-            starting_square = (0, 0)
-            self._deepest_row = 0
-            starting_squares_available = True
-            while starting_squares_available:
-                # For a word consider the direction
-                #   choose one at random but track which directions have been
-                #   attempted. Essentially iterate all three.
-                w_placed = False # word not yet placed
-                dirs_left = list(self._dirs) # copy the canonical list of dirs
-                
-                cur_square = starting_square
-                cur_dir = get_direction(dirs_left)
-                while cur_dir is not None:
-                    # Set grapheme counter to zero
-                    g_cntr = 0
-                    for g in g_s:
-                        g_cntr += 1
-                        # Attempt placement of the next grapheme in the next
-                        # square. It can fit if the square is empty or contains
-                        # the same grapheme. All actual placement is deferred
-                        # until it is known that the entire word can be placed.
-                        # This removes the need for unplacing partial words
-                        # on failure.
-                        g_placed = False
-                        if (self._grid.get(cur_square) is None):
-                            g_placed = True
-                        elif (self._grid.get(cur_square) == g):
-                            # Just note as placed and go on
-                            g_placed = True
-                        else:
-                            # failed to place. Roll back and choose new
-                            # starting point
-                            pass
-                            
-                        if g_placed:
-                            # If placement succeeds :
-                            #   if this is the last grapheme for this word :
-                            #      1. mark the word placed
-                            #      2. break out of the iterations both grapheme
-                            #         and starting location placement.
-                            #   else :
-                            #      1. choose next square in the chosen direction
-                            #         Iterate.
-                            if g_cntr == len(g_s):
-                                self._place_word_on_grid(g_s,
-                                                         cur_square,
-                                                         cur_dir)
-                                w_placed = True
-                            else:
-                                if cur_dir == 'R':
-                                    cur_square = (cur_square[0],
-                                                  cur_square[1] + 1)
-                                elif cur_dir == 'RD':
-                                    cur_square = (cur_square[0] + 1,
-                                                  cur_square[1] + 1)
-                                elif cur_dir == 'D':
-                                    cur_square = (cur_square[0] + 1,
-                                                  cur_square[1])
-                                elif cur_dir == 'L':
-                                    cur_square = (cur_square[0],
-                                                  cur_square[1] - 1)
-                                elif cur_dir == 'LD':
-                                    cur_square = (cur_square[0] + 1,
-                                                  cur_square[1] - 1)
-                                elif cur_dir == 'D':
-                                    cur_square = (cur_square[0] + 1,
-                                                  cur_square[1])
-                                else:
-                                    raise Exception('bad direction')
-                        else:
-                            # If placement fails :
-                            #   1. if this is not the first grapheme then
-                            #      un-place all the ones that have been placed,
-                            #      or discard provisional placement data, if
-                            #      that is possible.
-                            #   2. iterate to the next initial square
-                            break
-                        
-                    if w_placed:
-                        break
-                    cur_dir = get_direction(dirs_left)
-                    
-                if w_placed:
-                    self._placed_words.append(g_ent[0])
+            #   2. Next square is the next one out according to
+            #      _starting_squares. The first square into which the word
+            #      may be fitted at any direction is the one chosen. Thus the
+            #      grid is filled from the top left or right corner moving out
+            #      and down as the filling proceeds.
+            #
+            # A word can only start on an empty square or on one which already
+            # holds its first grapheme, so before the frontier only the holes
+            # and the squares the position index gives for the first grapheme
+            # are tried. Every other square is skipped without examining the
+            # grid.
+            candidates = sorted(holes +
+                                [self._arc_ordinal(sq)
+                                 for sq in grid.positions(g_ids[0])])
+            placement = None
+            probed = 0
+            for ordinal in candidates:
+                skip_squares(ordinal - probed)
+                placement = try_square(g_ids, self._arc_square(ordinal, sign))
+                probed = ordinal + 1
+                if placement is not None:
                     break
-                else:       
-                    starting_square = get_starting_square(starting_square)
-        
+
+            if placement is None:
+                skip_squares(frontier - probed)
+                for square in self._starting_squares(lang_direction, frontier):
+                    placement = try_square(g_ids, square)
+                    if placement is not None:
+                        break
+
+            filled = self._place_word(g_ent[0], g_ids, placement[0],
+                                      placement[1])
+            counters = self._stats.word(g_ent[0])
+            counters['probed'] += probed_squares
+            counters['skipped'] += skipped
+            counters['retries'] += retries
+
+            # Maintain the holes and the frontier
+            last = frontier
+            for ordinal in map(self._arc_ordinal, filled):
+                if ordinal < frontier:
+                    del holes[bisect_left(holes, ordinal)]
+                elif ordinal >= last:
+                    last = ordinal + 1
+            for ordinal in range(frontier, last):
+                if not grid.get_id(*self._arc_square(ordinal, sign)):
+                    holes.append(ordinal)
+            frontier = last
+        self._frontier = frontier
+
         # Future refinements :
-        #   1. it is possible to find the starting squares by spiralling out in 
+        #   1. it is possible to find the starting squares by spiralling out in
         #      a full circle rather than just a quarter. And depending upon
         #      which side of the centre you are on, you can place the word
         #      backwards starting with the last grapheme. So if you are placing
         #      RTL words you place them from end to start in the upper right
         #      quadrant.
-        #   2. we may also want to ensure that to limit expansion that we 
+        #   2. we may also want to ensure that to limit expansion that we
         #      favour place only down and left when in the upper right, and
         #      perhaps in the bottom left we place from the end of the word
         #      left and up. There may be other ways to limit growth.
         #   3. do the graphemes need canonicalization ?
-    
+
+    def _generate_bounded(self, lang_direction):
+        '''Pack the words into a fixed grid of self._rows by self._cols.
+
+        Each word has a domain, the set of placements (row, col, direction)
+        at which it still fits. The word with the fewest placements left is
+        placed next, preferring placements which share the most graphemes
+        with words already on the grid, and after each placement the domains
+        of the remaining words lose the placements which cross the squares
+        just filled with a different grapheme. A first greedy pass drops any
+        word whose domain empties. If that leaves words out, a backtracking
+        search over the same ordering looks for a placement of every word
+        until the time budget runs out. The better of the two layouts is kept
+        and any words it leaves out are recorded as unplaced.
+
+        The time budget bounds every stage. Words whose domains were not built
+        in time, or which the greedy pass had not reached, are left out.
+        '''
+        deadline = time.monotonic() + self._time_budget
+        if self._rows is None or self._cols is None:
+            raise Exception('bounded layout requires rows and cols')
+
+        self._top = 0
+        self._bottom = self._rows - 1
+        if self._arc_sign(lang_direction) > 0:
+            self._left, self._right = 0, self._cols - 1
+        else:
+            self._left, self._right = -(self._cols - 1), 0
+        grid = Grid(self._rows, self._cols, self._top, self._left, fixed=True)
+        self._grid = grid
+
+        words = [(w, grid.intern_all(g_s))
+                 for w, g_s in self._get_sorted_words_list() if w != '']
+        counters = [self._stats.word(w) for w, _ in words]
+        steps = [self._STEPS[d] for d in self._dirs]
+        placements = [(r, c, d_row, d_col)
+                      for r in range(self._top, self._bottom + 1)
+                      for c in range(self._left, self._right + 1)
+                      for (d_row, d_col) in steps]
+        rank = {p: n for n, p in enumerate(placements)}
+
+        # Every placement of each word in the empty grid, which depends only
+        # on its length. Words of the same length share the set until a
+        # placement removes something from it.
+        by_length = dict()
+        initial = dict()
+        for i, (_, ids) in enumerate(words):
+            if time.monotonic() >= deadline:
+                break
+            n = len(ids)
+            if n not in by_length:
+                by_length[n] = {(r, c, d_row, d_col)
+                                for (r, c, d_row, d_col) in placements
+                                if grid.in_bounds(r + d_row * (n - 1),
+                                                  c + d_col * (n - 1))}
+            initial[i] = by_length[n]
+
+        def select(left):
+            '''Choose the most constrained word, longest first on ties.'''
+            return min(left,
+                       key=lambda i: (len(domains[i]), -len(words[i][1]), i))
+
+        def order(i, domain):
+            '''Order a word's placements by the number of graphemes shared
+            with the grid, most first, in random order among equals.
+            '''
+            shared = grid.crossings(words[i][1], steps)
+            domain = sorted(domain, key=rank.__getitem__)
+            self._random.shuffle(domain)
+            domain.sort(key=lambda p: -shared.get(p, 0))
+            return domain
+
+        def covering(n, filled):
+            '''For each offset in a word of n graphemes, the placements which
+            put that offset on a square just filled, in all and by the
+            grapheme the square was filled with.
+            '''
+            table = []
+            for k in range(n):
+                by_gid = dict()
+                for r, c, gid in filled:
+                    by_gid.setdefault(gid, set()).update(
+                        (r - k * d_row, c - k * d_col, d_row, d_col)
+                        for (d_row, d_col) in steps)
+                table.append((set().union(*by_gid.values()), by_gid))
+            return table
+
+        def place(i, p):
+            '''Place word i and return the squares it filled.'''
+            return [(r, c, grid.get_id(r, c))
+                    for r, c in grid.place(words[i][1], *p)]
+
+        def prune(left, filled):
+            '''Remove from the domains of the words left the placements which
+            no longer fit and return what was removed. Only placements
+            crossing the squares just filled can have stopped fitting, and
+            they still fit only where the word has the same grapheme on each
+            of them.
+            '''
+            tables = dict()
+            trail = []
+            for i in left:
+                ids = words[i][1]
+                n = len(ids)
+                if n not in tables:
+                    tables[n] = covering(n, filled)
+                domain = domains[i]
+                clash = set()
+                for k, (every, by_gid) in enumerate(tables[n]):
+                    hit = every & domain
+                    if hit:
+                        clash |= hit.difference(by_gid.get(ids[k], ()))
+                if clash:
+                    domain -= clash
+                    trail.append((i, clash))
+            return trail
+
+        def restore(trail):
+            for i, clash in trail:
+                domains[i] |= clash
+
+        def clear(assignment):
+            for i, (r, c, d_row, d_col) in reversed(assignment):
+                grid.remove(words[i][1], r, c, d_row, d_col)
+
+        # Words which do not fit even in the empty grid can never be placed
+        feasible = [i for i, d in initial.items() if d]
+
+        # Greedy pass - never revisit a placement, drop words which no longer
+        # fit anywhere.
+        greedy = []
+        domains = {i: set(initial[i]) for i in feasible}
+        left = set(feasible)
+        while left and time.monotonic() < deadline:
+            i = select(left)
+            left.discard(i)
+            if not domains[i]:
+                continue
+            p = order(i, domains[i])[0]
+            filled = place(i, p)
+            counters[i]['probed'] += 1
+            greedy.append((i, p))
+            prune(left, filled)
+        best = greedy
+        clear(greedy)
+
+        # Backtracking search for a complete layout with forward checking -
+        # a placement which leaves any remaining word without a placement is
+        # abandoned at once. The domains are pruned in place and restored
+        # from the trail of each placement when it is undone.
+        if (feasible and len(best) < len(feasible)
+                and time.monotonic() < deadline):
+            assignment = []
+            domains = {i: set(initial[i]) for i in feasible}
+            left = set(feasible)
+            i = select(left)
+            left.discard(i)
+            # Each frame is [word, ordered placements, next placement, trail
+            # of the word's current placement or None]
+            stack = [[i, order(i, domains[i]), 0, None]]
+            while stack and time.monotonic() < deadline:
+                frame = stack[-1]
+                i, placements, n, trail = frame
+                if trail is not None:
+                    # undo the previous placement of this word
+                    _, p = assignment.pop()
+                    grid.remove(words[i][1], *p)
+                    restore(trail)
+                    frame[3] = None
+                    counters[i]['retries'] += 1
+                if n == len(placements):
+                    stack.pop()
+                    left.add(i)
+                    continue
+                frame[2] = n + 1
+                p = placements[n]
+                filled = place(i, p)
+                counters[i]['probed'] += 1
+                assignment.append((i, p))
+                frame[3] = prune(left, filled)
+                if len(assignment) > len(best):
+                    best = list(assignment)
+                if len(assignment) == len(feasible):
+                    break
+                if not all(domains[j] for j in left):
+                    continue
+                j = select(left)
+                left.discard(j)
+                stack.append([j, order(j, domains[j]), 0, None])
+            clear(assignment)
+
+        placed = set()
+        for i, (r, c, d_row, d_col) in best:
+            cur_dir = [d for d in self._dirs
+                       if self._STEPS[d] == (d_row, d_col)][0]
+            self._place_word(words[i][0], words[i][1], (r, c), cur_dir)
+            placed.add(i)
+        self._unplaced_words = [w for i, (w, _) in enumerate(words)
+                                if i not in placed]
+
     def get_grid(self, output_format='html'):
         '''Get a string representation of the wordsearch in the chosen form.
         
         Parameters
         
         output_format - 'html' an HTML table layout which may be loaded in a
-                        browser
+                        browser, 'json' a list of {'loc', 'grf'} objects, one
+                        per square, or 'compact' a list of strings, one per
+                        row, and a grapheme table. See puzzles.wordsearch.render.
         '''
-        if output_format == 'html':
-            rv = '''
-<html>
- <head>
-  <meta charset="UTF-8">
-    <style>
-    div#wordsearch { float: left; width:50%;}
-    div#wordlist {float: left; margin-left: 20px;}
-    table { width: 100%; border-collapse: collapse;}
-    td { font-size: 200%;}
-    table, th, td { border: 1px solid black; }
-    ul {list-style-type: none;}
-  </style>
-</head>
-<body>
-''' + \
-        '<div id="header">' + \
-        f'''
-<h3>Wordsearch</h3>
-'''
-            # print body including wordsearch grid and list of words
-            rv += '<div id="main">'
-        
-            # wordsearch grid
-            rv += '<div id="wordsearch">'
-            rv += '<table border="1">' 
-            for i in range(self._top, self._bottom+1):
-                rv += '<tr>'
-                for j in range(self._left, self._right+1):
-                    sq = (i, j)
-                    if self._grid.get(sq) is not None:
-                        rv += f'<td align="center">{self._grid.get(sq)}</td>'
-                    else:
-                        rv += '<td>.</td>'
-                rv += '</tr>'
-            rv += '</table></div>'
-        
-            # print the wordlist
-            rv += '''
-<div id="wordlist">
-<h3>Words to find</h3>
-<ul>'''
-            for w in sorted(self._words):
-                rv += f'<li>{w}</li>'
-            rv += '</ul></div>'
-        
-            # print the footer
-            rv += '''
-</div>
-</div>
-</body>
-</html>
-            '''
-            return rv
-        elif output_format == 'json':
-            def tuple_to_str_keys(m):
-                return [{'loc': k, 'grf': v} for k, v in m.items()]
-            
-            rv = []
-            for i in range(self._top, self._bottom+1):
-                for j in range(self._left, self._right+1):
-                    sq = (i, j)
-                    if self._grid.get(sq) is not None:
-                        rv.append({'loc': [i, j], 'grf': self._grid.get(sq)})
-            return json.dumps(rv, ensure_ascii=False)
+        return ''.join(iter_grid(self, output_format))
         
     def get_word_list(self):
         return self._placed_words
+
+    def get_unplaced_words(self):
+        '''Return the words which could not be fitted into a bounded grid.'''
+        return self._unplaced_words
     
+    def get_stats(self):
+        '''Return the LayoutStats of the generation of the wordsearch.'''
+        return self._stats
+
+    def get_seed(self):
+        '''Return the seed the wordsearch was generated from.'''
+        return self._seed
+
+    def add_words(self, words):
+        '''Add words to the wordsearch, laying them out in the existing
+        grid. Words already on the grid stay where they are and only the
+        squares the new words take, any the grid grows by and any filler
+        which spells a word change. Only the lines through the changed
+        squares are searched for words, so filler elsewhere which happens to
+        spell a new word is left. Words already in the wordsearch are
+        ignored. Returns the list of words placed, in order of placement. In
+        a bounded grid a word which does not fit anywhere is added to
+        get_unplaced_words() instead.
+
+        Parameters
+
+        words - the words to add
+        '''
+        known = set(self._words)
+        new_words = []
+        for w in words:
+            if w not in known:
+                known.add(w)
+                new_words.append(w)
+        if not new_words:
+            return []
+
+        start = time.perf_counter()
+        added = sorted_graphemes(new_words)
+        self._words = list(self._words) + new_words
+        self._solver = None
+        if self._sorted_words is not None:
+            self._sorted_words = sorted(
+                self._sorted_words + added,
+                key=lambda g_ent: (-len(g_ent[1]), g_ent[0]))
+        self._stats.segment_time += time.perf_counter() - start
+
+        # the filler is drawn from the graphemes of all the words
+        start = time.perf_counter()
+        filler = {self._grid.grapheme(gid) for gid in self._filler_ids}
+        self._filler_ids += self._grid.intern_all(
+            sorted({g for _, g_s in added for g in g_s} - filler))
+        extents = (self._top, self._left, self._bottom, self._right)
+        n_placed = len(self._placed_words)
+        if self._bounded:
+            self._add_bounded(added)
+        else:
+            self._generate(self._directions, added, replay=False)
+        placed = self._placed_words[n_placed:]
+        self._stats.place_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        changed = list(self._grown_squares(*extents))
+        self._fill_squares(changed)
+        for w in placed:
+            g_ids, (row, col), cur_dir = self._placements[w]
+            d_row, d_col = self._STEPS[cur_dir]
+            changed += ((row + k * d_row, col + k * d_col)
+                        for k in range(len(g_ids)))
+        self._solve_filler(changed)
+        stats = self._stats
+        stats.rows = self.get_rows()
+        stats.cols = self.get_cols()
+        stats.fill_time += time.perf_counter() - start
+        return placed
+
+    def remove_words(self, words):
+        '''Remove words from the wordsearch. The squares which no other word
+        runs through are freed and given new filler, and every other square
+        is left as it was. The grid does not shrink. Returns the list of words
+        removed.
+
+        Parameters
+
+        words - the words to remove. Each must be in the wordsearch, placed
+                or not.
+        '''
+        removing = list(dict.fromkeys(words))
+        known = set(self._words)
+        for w in removing:
+            if w not in known:
+                raise Exception(f'{w} is not in the wordsearch')
+
+        start = time.perf_counter()
+        sign = self._arc_sign(self._directions)
+        freed = []
+        for w in removing:
+            placement = self._placements.pop(w, None)
+            if placement is None:
+                continue
+            g_ids, start_square, cur_dir = placement
+            d_row, d_col = self._STEPS[cur_dir]
+            freed += self._grid.remove(g_ids, start_square[0],
+                                       start_square[1], d_row, d_col)
+            self._stat_map['placed' + cur_dir] -= 1
+            self._stats.placed[cur_dir] -= 1
+        if not self._bounded:
+            # Freed squares are holes the next added word may start in
+            for square in freed:
+                ordinal = self._arc_ordinal(square)
+                if ordinal < self._frontier:
+                    insort(self._holes, ordinal)
+
+        gone = set(removing)
+        self._words = [w for w in self._words if w not in gone]
+        self._solver = None
+        self._placed_words = [w for w in self._placed_words if w not in gone]
+        self._unplaced_words = [w for w in self._unplaced_words
+                                if w not in gone]
+        if self._sorted_words is not None:
+            self._sorted_words = [g_ent for g_ent in self._sorted_words
+                                  if g_ent[0] not in gone]
+        for w in removing:
+            self._stats.words.pop(w, None)
+        self._stats.place_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        self._solve_filler(self._fill_squares(freed))
+        self._stats.word_squares -= len(freed)
+        self._stats.fill_time += time.perf_counter() - start
+        return removing
+
+    def _add_bounded(self, added):
+        '''Place words in a bounded grid which already holds a layout. Each
+        word goes where it shares the most graphemes with the grid, in random
+        order among equals, trying the crossings first and only searching
+        the whole grid for a word which crosses nothing.
+        '''
+        grid = self._grid
+        steps = [self._STEPS[d] for d in self._dirs]
+        dir_names = {self._STEPS[d]: d for d in self._dirs}
+        for w, g_s in added:
+            if w == '':
+                continue
+            ids = grid.intern_all(g_s)
+            counters = self._stats.word(w)
+            shared = grid.crossings(ids, steps)
+            if shared:
+                domain = list(shared)
+            else:
+                domain = [(r, c, d_row, d_col)
+                          for r in range(self._top, self._bottom + 1)
+                          for c in range(self._left, self._right + 1)
+                          for (d_row, d_col) in steps
+                          if grid.fits(ids, r, c, d_row, d_col)]
+            counters['probed'] += len(domain)
+            if not domain:
+                self._unplaced_words.append(w)
+                continue
+            self._random.shuffle(domain)
+            r, c, d_row, d_col = max(domain, key=lambda p: shared.get(p, 0))
+            self._place_word(w, ids, (r, c), dir_names[(d_row, d_col)])
+
+    def _grown_squares(self, top, left, bottom, right):
+        '''Generate the squares within the current extents which lie outside
+        the extents given.
+        '''
+        for i in range(self._top, self._bottom + 1):
+            if top <= i <= bottom:
+                yield from ((i, j) for j in range(self._left, left))
+                yield from ((i, j) for j in range(right + 1, self._right + 1))
+            else:
+                yield from ((i, j) for j in range(self._left, self._right + 1))
+
     def get_rows(self):
         return abs(self._top - self._bottom) + 1
     
@@ -567,87 +1169,193 @@ class WordSearch():
         return abs(self._right - self._left) + 1
     
     def dump(self, output_format='html', output_file_name=None):
-        if output_format == 'html' and output_file_name is not None:
-            with open(output_file_name, mode='w', encoding='utf-8') as f:
-                f.write(self.get_grid(output_format))
-        else:
-            raise Exception(f'unsupport output format {output_format}')
-        
-    def dump_html(self, output_file_name=None):
-        '''Print out the wordsearch in the chosen form.
+        '''Write out the wordsearch in the chosen form, a row at a time.
         
         Parameters
         
-        output_format - 'html' an HTML table layout which may be loaded in a
-                        browser
-        output_file_name - a file name to output the dump to
+        output_format - html, json or compact as for get_grid()
+        output_file_name - a file name to output the dump to, or None for
+                           standard output
         '''
-        print('''
-<html>
- <head>
-  <meta charset="UTF-8">
-    <style>
-    div#wordsearch { float: left; width:50%;}
-    div#wordlist {float: left; margin-left: 20px;}
-    table { width: 100%; border-collapse: collapse;}
-    td { font-size: 200%;}
-    table, th, td { border: 1px solid black; }
-    ul {list-style-type: none;}
-  </style>
-</head>
-<body>
-''')
-        # print the header with some basic information
-        print('<div id="header">')
-        print(f'''
-<h3>Wordsearch</h3>
-<ul>
-  <li>Number of words {len(self._words)}.</li>
-  <li>top {self._top} left {self._left} bottom {self._bottom} right {self._right}</li>
-        ''')
-        for s in sorted(self._stat_map.keys()):
-            print(f'<li>{s}={self._stat_map.get(s)}</li>')
-        print('</ul></div>')
-        
-        # print body including wordsearch grid and list of words
-        print('<div id="main">')
+        if output_file_name is None:
+            write_grid(self, sys.stdout, output_format)
+        else:
+            with open(output_file_name, mode='w', encoding='utf-8') as f:
+                write_grid(self, f, output_format)
         
-        # wordsearch grid
-        print('<div id="wordsearch">')
-        print('<table border="1">') 
-        for i in range(self._top, self._bottom+1):
-            print('<tr>')
-            for j in range(self._left, self._right+1):
-                sq = (i, j)
-                if self._grid.get(sq) is not None:
-                    print(f'<td align="center">{self._grid.get(sq)}</td>')
-                else:
-                    print('<td>.</td>')
-            print('</tr>')
-        print('</table></div>')
+    def dump_html(self, output_file_name=None):
+        '''Print out the wordsearch as HTML including the grid extents and
+        layout statistics.
         
-        # print the wordlist
-        print('''
-<div id="wordlist">
-<h3>Words to find</h3>
-<ul>''')
-        for w in sorted(self._words):
-            print(f'<li>{w}</li>')
-        print('</ul></div>')
+        Parameters
         
-        # print the footer
-        print('''
-</div>
-</div>
-</body>
-</html>
-        ''')
+        output_file_name - a file name to output the dump to, or None for
+                           standard output
+        '''
+        if output_file_name is None:
+            write_grid(self, sys.stdout, 'html', header=True)
+        else:
+            with open(output_file_name, mode='w', encoding='utf-8') as f:
+                write_grid(self, f, 'html', header=True)
 
     def fill_empty(self, filler_chars):
         '''Fill the empty slots with random characters from the input list
         of filler characters.
         '''
     
+def ref_to_range(ref):
+    '''Convert a parsed reference to a range as accepted by iter_words. The
+    end of the reference defaults to its start and omitted chapters and
+    verses widen the range to whole chapters and books.
+    '''
+    end_book = ref.st_book if ref.end_book is None else ref.end_book
+    end_ch = ref.st_ch if ref.end_ch is None else ref.end_ch
+    end_vs = ref.end_vs
+    if end_vs is None and ref.end_ch is None:
+        end_vs = ref.st_vs
+    start = tuple(x for x in (ref.st_book, ref.st_ch, ref.st_vs)
+                  if x is not None)
+    end = tuple(x for x in (end_book, end_ch, end_vs) if x is not None)
+    return (start, end)
+
+def text_corpus(text_name):
+    '''Return the corpus and the wordsearch directions for a text name.'''
+    from puzzles.core.etcbc import Corpus
+    if text_name == 'ETCBCG':
+        return Corpus.GREEK, WordSearch.LTR
+    elif text_name == 'ETCBCH':
+        return Corpus.HEBREW, WordSearch.RTL
+    raise Exception(f'unknown text {text_name}')
+
+def _layout_attempt(args):
+    '''Make one layout attempt, in a worker process for best_layout().'''
+    return WordSearch(*args)
+
+def _layout_rank(ws):
+    '''Rank layouts, fewest unplaced words first then the smallest grid.'''
+    return (len(ws.get_unplaced_words()), ws.get_rows() * ws.get_cols())
+
+def attempt_seeds(seed, attempts):
+    '''Return the seeds of each of a number of layout attempts. The first is
+    seed itself so that a single attempt is the same as WordSearch(seed=seed).
+    '''
+    rng = Random(seed)
+    return [seed] + [rng.getrandbits(64) for _ in range(attempts - 1)]
+
+# The layouts made by best_layout() keyed by its arguments, least recently
+# used first
+LAYOUT_CACHE_SIZE = 128
+_layouts = OrderedDict()
+
+def best_layout(words, rows, cols, directions, bounded=False,
+                time_budget=WordSearch.DEFAULT_TIME_BUDGET, seed=None,
+                attempts=1, processes=None, filler=None):
+    '''Lay out the words several times from different seeds and return the
+    best of the wordsearches, the one with the fewest unplaced words and then
+    the fewest squares, get_rows() * get_cols(). The first best attempt wins
+    ties.
+    
+    The result for a given seed is cached, so repeating a request costs only
+    a copy of the wordsearch.
+    
+    Parameters
+    
+    words, rows, cols, directions, bounded, time_budget, filler - as for
+        WordSearch
+    seed - the seed from which the seeds of each attempt are derived, chosen
+           at random if not given
+    attempts - the number of layouts to try
+    processes - the number of processes to make the attempts in, by default
+                one per core. With 1 they are made in this process, which
+                must be the case in daemonic processes such as
+                multiprocessing.Pool workers.
+    '''
+    if seed is None:
+        seed = getrandbits(64)
+    key = (frozenset(words), rows, cols, directions, bounded, time_budget,
+           seed, attempts, filler)
+    ws = _layouts.get(key)
+    if ws is None:
+        jobs = [(words, rows, cols, directions, bounded, time_budget, s,
+                 filler)
+                for s in attempt_seeds(seed, attempts)]
+        if attempts == 1 or processes == 1:
+            candidates = map(_layout_attempt, jobs)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(min(processes or os.cpu_count(),
+                                         attempts)) as pool:
+                candidates = list(pool.map(_layout_attempt, jobs))
+        ws = min(candidates, key=_layout_rank)
+        _layouts[key] = ws
+        if len(_layouts) > LAYOUT_CACHE_SIZE:
+            _layouts.popitem(last=False)
+    else:
+        _layouts.move_to_end(key)
+    # the caller may modify the wordsearch so never hand out the cached one
+    return deepcopy(ws)
+
+def make_wordsearch(text_name, verses, rows=None, cols=None,
+                    time_budget=WordSearch.DEFAULT_TIME_BUDGET, seed=None,
+                    attempts=1, processes=None, form=POINTED):
+    '''Build a wordsearch from the words of a passage.
+    
+    Parameters
+    
+    text_name - ETCBCH or ETCBCG
+    verses - the verse specification, as for the generate command
+    rows, cols - if both are given the words are packed into a grid of
+                 exactly this size, otherwise the grid grows to fit
+    time_budget - seconds to spend fitting words into a bounded grid
+    seed, attempts, processes - as for best_layout()
+    form - the form of the words, one of puzzles.core.normalize.FORMS. Words
+           which are the same in this form are used once.
+
+    The empty squares are filled in proportion to the frequency of each
+    grapheme of this form in the whole corpus.
+    '''
+    from bibleutils.versification import parse_refs, convert_refs, \
+        ReferenceFormID
+    from puzzles.core.etcbc import Corpus
+    from puzzles.core.frequency import grapheme_frequencies
+    from puzzles.core.providers import get_provider
+    corpus, directions = text_corpus(text_name)
+
+    # parse the verse specification to suit ETCBC
+    ref_form = ReferenceFormID.ETCBCG if corpus == Corpus.GREEK \
+        else ReferenceFormID.ETCBCH
+    refs = convert_refs(parse_refs(verses, form=text_name), ref_form)
+
+    # Get the list of words from TF. Each reference is passed as a range
+    # rather than expanded to its verses so that whole chapters are fetched
+    # in one step. Other forms are looked up in the precomputed forms of the
+    # corpus and the repeats removed in that form.
+    word_list = get_provider(text_name).get_words(
+        tuple(ref_to_range(r) for r in refs), form)
+
+    return best_layout(set(word_list), rows, cols, directions,
+                       bounded=rows is not None and cols is not None,
+                       time_budget=time_budget, seed=seed, attempts=attempts,
+                       processes=processes,
+                       filler=grapheme_frequencies(corpus, form))
+
+def profile(f, args, file_name):
+    '''Call f(*args) under cProfile and write the profile to file_name,
+    the raw data if the name ends in .prof and a text report sorted by
+    cumulative time otherwise. Returns the result of f.
+    '''
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    rv = profiler.runcall(f, *args)
+    if file_name.endswith('.prof'):
+        profiler.dump_stats(file_name)
+    else:
+        with open(file_name, mode='w', encoding='utf-8') as stream:
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.strip_dirs().sort_stats('cumulative').print_stats()
+    return rv
+
 def main(argv=None): # IGNORE:C0111
     if argv is None:
         argv = sys.argv
@@ -656,6 +1364,25 @@ def main(argv=None): # IGNORE:C0111
 
     args = parse_command_line(argv[1:])
     command = args.command
+
+    # Generate many wordsearches in parallel
+    if command == 'batch':
+        from puzzles.wordsearch.batch import main_batch
+        return main_batch(args)
+
+    # Serve wordsearches until interrupted
+    if command == 'serve':
+        from puzzles.wordsearch.service import main_serve
+        return main_serve(args)
+
+    # List the books of a text
+    if command == 'info':
+        if args.books:
+            from puzzles.core.etcbc import get_books
+            for book in get_books(text_corpus(args.text)[0]):
+                print(book)
+        return 0
+
     text_name = args.text
     verses = args.verses
     cols = args.cols
@@ -663,30 +1390,26 @@ def main(argv=None): # IGNORE:C0111
     output_format = args.format
 
     # Check for incompatible options
+    if (rows is None) != (cols is None):
+        raise CLIError('--rows and --columns must be given together')
         
     # Generate a wordsearch
     if command == 'generate':
         
-        # parse the verse specification to suit ETCBC
-        if text_name == 'ETCBCG':
-            refs = expand_refs(convert_refs(parse_refs(verses, form='ETCBCG'),
-                                            ReferenceFormID.ETCBCG))
-            corpus = Corpus.GREEK
-            directions = WordSearch.LTR
-        elif text_name == 'ETCBCH':
-            refs = expand_refs(convert_refs(parse_refs(verses, form='ETCBCH'),
-                                            ReferenceFormID.ETCBCH))
-            #refs = expand_refs(parse_refs(verses, form='ETCBCH'))
-            corpus = Corpus.HEBREW
-            directions = WordSearch.RTL
-
-        # Get the list of words from TF
-        sections = []
-        [sections.append((r.st_book, r.st_ch, r.st_vs)) for r in refs ]
-        word_list = get_words(*sections, work=corpus)
-
-        ws = WordSearch(set(word_list), rows, cols, directions)
-        ws.dump(output_format)
+        gen_args = (text_name, verses, rows, cols, args.time_budget,
+                    args.seed, args.attempts, None, args.form)
+        if args.profile:
+            ws = profile(make_wordsearch, gen_args, args.profile)
+        else:
+            ws = make_wordsearch(*gen_args)
+        if args.stats:
+            with open(args.stats, mode='w', encoding='utf-8') as f:
+                f.write(ws.get_stats().to_json(indent=1))
+        unplaced = ws.get_unplaced_words()
+        if unplaced:
+            sys.stderr.write(f'{len(unplaced)} words did not fit in the '
+                             f'{rows}x{cols} grid: {" ".join(unplaced)}\n')
+        ws.dump(output_format or 'html')
         
 if __name__ == "__main__":
     if DEBUG:
@@ -696,15 +1419,4 @@ if __name__ == "__main__":
     if TESTRUN:
         import doctest
         doctest.testmod()
-    if PROFILE:
-        import cProfile
-        import pstats
-        profile_filename = 'puzzleapi.wordsearch.wordsearch_profile.txt'
-        cProfile.run('main()', profile_filename)
-        statsfile = open("profile_stats.txt", "wb")
-        p = pstats.Stats(profile_filename, stream=statsfile)
-        stats = p.strip_dirs().sort_stats('cumulative')
-        stats.print_stats()
-        statsfile.close()
-        sys.exit(0)
     sys.exit(main())
\ No newline at end of file